@@ -0,0 +1,38 @@
+"""Add content and generator hashes to document_versions
+
+Revision ID: 20261017_0900
+Revises: 20251010_1435
+Create Date: 2026-10-17 09:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261017_0900'
+down_revision = '20251010_1435'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add hashes used to skip re-ingesting identical uploads."""
+    op.execute("""
+        ALTER TABLE document_versions
+            ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64),
+            ADD COLUMN IF NOT EXISTS generator_hash VARCHAR(64);
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_versions_content_hash
+        ON document_versions(document_id, content_hash);
+    """)
+
+
+def downgrade() -> None:
+    """Drop content hash columns."""
+    op.execute("DROP INDEX IF EXISTS idx_versions_content_hash;")
+    op.execute("""
+        ALTER TABLE document_versions
+            DROP COLUMN IF EXISTS generator_hash,
+            DROP COLUMN IF EXISTS content_hash;
+    """)
@@ -0,0 +1,55 @@
+"""Add ingestion_jobs table for the durable processing queue
+
+Revision ID: 20261017_1000
+Revises: 20261017_0900
+Create Date: 2026-10-17 10:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1000'
+down_revision = '20261017_0900'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create ingestion_jobs table."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS ingestion_jobs (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+            version VARCHAR(50) NOT NULL,
+            file_type VARCHAR(20) NOT NULL,
+            temp_path VARCHAR(500) NOT NULL,
+            content_hash VARCHAR(64),
+            status VARCHAR(20) NOT NULL DEFAULT 'queued'
+                CONSTRAINT ck_ingestion_job_status
+                CHECK (status IN ('queued', 'running', 'completed', 'failed')),
+            stage VARCHAR(20),
+            progress INTEGER NOT NULL DEFAULT 0,
+            stage_timings JSONB NOT NULL DEFAULT '{}'::jsonb,
+            error_message TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
+        );
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_document_id
+        ON ingestion_jobs(document_id);
+    """)
+
+    # Queue scans: oldest queued job first
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_status
+        ON ingestion_jobs(status, created_at);
+    """)
+
+
+def downgrade() -> None:
+    """Drop ingestion_jobs table and indexes."""
+    op.execute("DROP TABLE IF EXISTS ingestion_jobs CASCADE;")
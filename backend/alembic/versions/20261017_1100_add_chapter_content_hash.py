@@ -0,0 +1,27 @@
+"""Add content_hash to chapters for incremental re-ingestion
+
+Revision ID: 20261017_1100
+Revises: 20261017_1000
+Create Date: 2026-10-17 11:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1100'
+down_revision = '20261017_1000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add content_hash column."""
+    op.execute("""
+        ALTER TABLE chapters
+            ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+    """)
+
+
+def downgrade() -> None:
+    """Drop content_hash column."""
+    op.execute("ALTER TABLE chapters DROP COLUMN IF EXISTS content_hash;")
@@ -0,0 +1,27 @@
+"""Add checkpoint to ingestion_jobs for resumable ingestion
+
+Revision ID: 20261017_1200
+Revises: 20261017_1100
+Create Date: 2026-10-17 12:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1200'
+down_revision = '20261017_1100'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add checkpoint column."""
+    op.execute("""
+        ALTER TABLE ingestion_jobs
+            ADD COLUMN IF NOT EXISTS checkpoint JSONB NOT NULL DEFAULT '{}'::jsonb;
+    """)
+
+
+def downgrade() -> None:
+    """Drop checkpoint column."""
+    op.execute("ALTER TABLE ingestion_jobs DROP COLUMN IF EXISTS checkpoint;")
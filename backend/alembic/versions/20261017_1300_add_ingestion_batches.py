@@ -0,0 +1,45 @@
+"""Add ingestion_batches for batch uploads with a parallelism cap
+
+Revision ID: 20261017_1300
+Revises: 20261017_1200
+Create Date: 2026-10-17 13:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1300'
+down_revision = '20261017_1200'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create ingestion_batches and link jobs to their batch."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS ingestion_batches (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            max_parallel INTEGER NOT NULL DEFAULT 2
+                CONSTRAINT ck_ingestion_batch_max_parallel CHECK (max_parallel >= 1),
+            created_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """)
+
+    op.execute("""
+        ALTER TABLE ingestion_jobs
+            ADD COLUMN IF NOT EXISTS batch_id UUID
+                REFERENCES ingestion_batches(id) ON DELETE SET NULL;
+    """)
+
+    # Batch progress and the per-batch running count when claiming jobs
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_batch_id
+        ON ingestion_jobs(batch_id, status);
+    """)
+
+
+def downgrade() -> None:
+    """Drop batch support."""
+    op.execute("DROP INDEX IF EXISTS idx_ingestion_jobs_batch_id;")
+    op.execute("ALTER TABLE ingestion_jobs DROP COLUMN IF EXISTS batch_id;")
+    op.execute("DROP TABLE IF EXISTS ingestion_batches;")
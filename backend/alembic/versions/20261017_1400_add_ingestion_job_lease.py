@@ -0,0 +1,32 @@
+"""Add claimed_by and heartbeat_at to ingestion_jobs for job leases
+
+Revision ID: 20261017_1400
+Revises: 20261017_1300
+Create Date: 2026-10-17 14:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261017_1400'
+down_revision = '20261017_1300'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add lease columns."""
+    op.execute("""
+        ALTER TABLE ingestion_jobs
+            ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP;
+    """)
+
+
+def downgrade() -> None:
+    """Drop lease columns."""
+    op.execute("""
+        ALTER TABLE ingestion_jobs
+            DROP COLUMN IF EXISTS heartbeat_at,
+            DROP COLUMN IF EXISTS claimed_by;
+    """)
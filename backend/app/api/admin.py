@@ -0,0 +1,79 @@
+"""
+Administrative API endpoints.
+
+Regenerates chapter markdown from the element caches written during
+ingestion, so generator rule changes can be applied without re-uploading.
+"""
+import logging
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.schemas.admin import BulkRegenerationReport, ChapterCacheStats, RegenerationResult
+from app.services.bulk_regeneration import BulkRegenerationService
+from app.services.chapter_cache import get_chapter_cache
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post(
+    "/documents/{document_id}/versions/{version}/regenerate",
+    response_model=RegenerationResult,
+    summary="Regenerate one version from its element cache",
+)
+async def regenerate_version(
+    document_id: UUID,
+    version: str,
+) -> RegenerationResult:
+    """
+    Re-run markdown generation for a version without re-parsing its upload.
+
+    Uses the element cache saved during ingestion and the current generator
+    rules. Manually edited chapters are kept.
+    """
+    result = await BulkRegenerationService().regenerate_one(document_id, version)
+    if result.status == "failed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=result.error_message,
+        )
+    return result
+
+
+@router.post(
+    "/regenerate",
+    response_model=BulkRegenerationReport,
+    summary="Regenerate all versions from their element caches",
+)
+async def regenerate_all(
+    document_id: Optional[UUID] = Query(None, description="Limit to one document"),
+    concurrency: Optional[int] = Query(
+        None, ge=1, le=32, description="Versions regenerated at once"
+    ),
+) -> BulkRegenerationReport:
+    """
+    Regenerate every version that has an element cache.
+
+    Versions are rebuilt with bounded concurrency, each in its own
+    transaction; a failing version is reported in the results and does not
+    stop the others. For large stores prefer the CLI
+    (``python -m app.cli regenerate``), which is not bound by HTTP timeouts.
+    """
+    return await BulkRegenerationService().regenerate_all(document_id, concurrency)
+
+
+@router.get(
+    "/chapter-cache",
+    response_model=ChapterCacheStats,
+    summary="Chapter content cache statistics",
+)
+async def get_chapter_cache_stats() -> ChapterCacheStats:
+    """
+    Report the chapter cache of this API process.
+
+    Counters are per process and reset on restart.
+    """
+    return ChapterCacheStats(**get_chapter_cache().stats())
@@ -4,29 +4,70 @@ API endpoints for document management (file-based storage version).
 This version reads chapter content from files instead of database.
 """
 import logging
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Response,
+    UploadFile,
+    status,
+)
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_db
 from app.models import Document, DocumentVersion, Chapter
 from app.schemas.document import (
+    BatchStatus,
+    BatchUploadResponse,
+    ChapterPartInfo,
+    ChapterPartResponse,
+    ChapterSkeleton,
     DocumentList,
     DocumentResponse,
     ProcessingStatus,
     TableOfContents,
     TOCEntry,
 )
-from app.services.file_storage import FileStorageService, FileStorageError
-from app.services.document_processor_v2 import DocumentProcessor, DocumentProcessingError
+from app.services.async_file_storage import AsyncFileStorage
+from app.services.batch_upload import BatchFile, BatchUploadError, BatchUploadService
+from app.services.compressed_input import JSON_UPLOAD_EXTENSIONS
+from app.services.chapter_parts import INTRO_ANCHOR, split_chapter
+from app.services.file_storage import ChapterPartNotFoundError, FileStorageError
+from app.services.ingestion_queue import IngestionQueue, IngestionQueueError
+from app.services.document_processor_v2 import (
+    DocumentProcessingError,
+    DocumentProcessor,
+    UploadTooLargeError,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Accepted file extensions per file_type
+UPLOAD_EXTENSIONS = {
+    "json": JSON_UPLOAD_EXTENSIONS,
+    "markdown": [".md", ".markdown"],
+    "pdf": [".pdf"],
+}
+
+
+def _file_type_for(filename: str) -> Optional[str]:
+    """Infer file_type from a file name (None if the extension is not accepted)."""
+    filename = filename.lower()
+    for file_type, extensions in UPLOAD_EXTENSIONS.items():
+        if any(filename.endswith(ext) for ext in extensions):
+            return file_type
+    return None
+
 
 @router.post(
     "/upload",
@@ -35,7 +76,6 @@ router = APIRouter()
     summary="Upload document (JSON, Markdown, or PDF)",
 )
 async def upload_document(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="Document file"),
     file_type: str = Form(..., description="File type: 'json', 'markdown', or 'pdf'"),
     title: str = Form(..., description="Document title"),
@@ -46,17 +86,20 @@ async def upload_document(
     Upload document for processing with file-based storage.
 
     **File Types:**
-    - **json**: Docling JSON (generates chapter-based structure)
+    - **json**: Docling JSON (generates chapter-based structure); may be
+      uploaded gzip- or zstd-compressed as `.json.gz` / `.json.zst`
     - **markdown**: Pre-processed markdown
     - **pdf**: PDF with companion Docling files
 
     **Processing Flow:**
     1. Creates document record
     2. Saves temp file
-    3. Queues background processing
-    4. Returns immediately
+    3. If this version was already processed from an identical file,
+       activates it and returns without processing
+    4. Queues an ingestion job (durable across restarts)
+    5. Returns immediately
 
-    Background processing:
+    Ingestion job (poll `/{document_id}/status` for stage progress):
     - Parses file into chapters
     - Saves chapters to files
     - Creates chapter metadata in DB
@@ -72,13 +115,8 @@ async def upload_document(
 
     # Validate file extension
     filename = file.filename or ""
-    extension_map = {
-        "json": [".json"],
-        "markdown": [".md", ".markdown"],
-        "pdf": [".pdf"],
-    }
-    expected_extensions = extension_map.get(file_type, [])
-    if not any(filename.endswith(ext) for ext in expected_extensions):
+    expected_extensions = UPLOAD_EXTENSIONS.get(file_type, [])
+    if not any(filename.lower().endswith(ext) for ext in expected_extensions):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File extension doesn't match file_type '{file_type}'"
@@ -88,7 +126,7 @@ async def upload_document(
         processor = DocumentProcessor(db)
 
         # Create document record and save temp file
-        document = await processor.create_document_record(
+        document, upload = await processor.create_document_record(
             file,
             title,
             version,
@@ -96,27 +134,43 @@ async def upload_document(
             file_type=file_type,  # type: ignore
         )
 
-        # Get temp file path (saved in create_document_record)
-        from pathlib import Path
-        from app.core.config import settings
-        slug = processor._slugify(title)
-        extension = {
-            "json": ".json",
-            "markdown": ".md",
-            "pdf": ".pdf"
-        }.get(file_type, ".dat")
-        temp_path = settings.upload_dir / f"{slug}-{version}{extension}"
-
-        # Queue background processing
-        background_tasks.add_task(
-            processor.process_document_async,
+        # This version was already processed from an identical upload
+        existing = await processor.find_existing_version(
+            document.id, version, upload.sha256, file_type
+        )
+        if existing:
+            upload.path.unlink(missing_ok=True)
+            activated = await processor.activate_version(document.id, existing.version)
+            await db.commit()
+            if activated:
+                await processor.write_active_version(activated, existing.version)
+            logger.info(
+                f"Upload for document {document.id} version {version} is unchanged; "
+                f"skipping processing"
+            )
+            return DocumentResponse(
+                id=document.id,
+                title=document.title,
+                version=existing.version,
+                upload_date=existing.upload_date,
+                file_path=document.storage_path,
+                page_count=None,
+                processing_status="completed",
+                metadata={"file_type": file_type, "deduplicated": True},
+                created_at=document.created_at,
+                updated_at=document.updated_at,
+            )
+
+        # Queue processing
+        job = await IngestionQueue(db).enqueue(
             document.id,
-            str(temp_path),
             version,
             file_type,
+            str(upload.path),
+            upload.sha256,
         )
 
-        logger.info(f"Document {document.id} queued for processing")
+        logger.info(f"Document {document.id} queued for processing (job {job.id})")
 
         return DocumentResponse(
             id=document.id,
@@ -125,12 +179,17 @@ async def upload_document(
             upload_date=document.created_at,
             file_path=document.storage_path,
             page_count=None,
-            processing_status="processing",
-            metadata={"file_type": file_type},
+            processing_status="pending",
+            metadata={"file_type": file_type, "job_id": str(job.id)},
             created_at=document.created_at,
             updated_at=document.updated_at,
         )
 
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
     except DocumentProcessingError as e:
         logger.error(f"Document upload failed: {e}")
         raise HTTPException(
@@ -139,6 +198,84 @@ async def upload_document(
         )
 
 
+@router.post(
+    "/batch",
+    response_model=BatchUploadResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Upload several documents at once",
+)
+async def upload_batch(
+    files: List[UploadFile] = File(..., description="Document files"),
+    titles: List[str] = Form(..., description="Document title per file, in file order"),
+    versions: List[str] = Form(..., description="Document version per file, in file order"),
+    max_parallel: Optional[int] = Form(
+        None, ge=1, le=32, description="Files of this batch processed at once"
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> BatchUploadResponse:
+    """
+    Upload many documents in one request.
+
+    Each file needs a title and version, passed as repeated `titles` and
+    `versions` fields in the same order as `files`. The file type comes
+    from the extension (see `/upload`).
+
+    All document records and ingestion jobs are created in one transaction.
+    At most `max_parallel` files of the batch are processed at once; poll
+    `/batches/{batch_id}` for aggregate progress.
+    """
+    if not len(files) == len(titles) == len(versions):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Got {len(files)} files, {len(titles)} titles and "
+                f"{len(versions)} versions; need one title and version per file"
+            ),
+        )
+
+    batch_files = []
+    for file, title, version in zip(files, titles, versions):
+        file_type = _file_type_for(file.filename or "")
+        if file_type is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported file extension: '{file.filename}'",
+            )
+        batch_files.append(BatchFile(file=file, title=title, version=version, file_type=file_type))
+
+    try:
+        return await BatchUploadService(db).upload(batch_files, max_parallel)
+    except BatchUploadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
+
+
+@router.get(
+    "/batches/{batch_id}",
+    response_model=BatchStatus,
+    summary="Get batch upload progress",
+)
+async def get_batch_status(
+    batch_id: UUID,
+    db: AsyncSession = Depends(get_db),
+) -> BatchStatus:
+    """Aggregate processing status of a batch upload and each of its files."""
+    try:
+        return await BatchUploadService(db).get_status(batch_id)
+    except BatchUploadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+
+
 @router.get(
     "",
     response_model=DocumentList,
@@ -283,6 +420,40 @@ async def get_document_status(
         )
 
 
+@router.post(
+    "/{document_id}/retry",
+    response_model=ProcessingStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Retry failed processing",
+)
+async def retry_document_processing(
+    document_id: UUID,
+    db: AsyncSession = Depends(get_db),
+) -> ProcessingStatus:
+    """
+    Queue the document's failed ingestion job again.
+
+    The retry resumes where the failed attempt stopped: generated chapters
+    are reused and chapters already saved are skipped.
+    """
+    document = await db.get(Document, document_id)
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document not found: {document_id}",
+        )
+
+    try:
+        await IngestionQueue(db).retry(document_id)
+    except IngestionQueueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
+
+    return await DocumentProcessor(db).get_processing_status(document_id)
+
+
 @router.get(
     "/{document_id}/toc",
     response_model=TableOfContents,
@@ -387,18 +558,20 @@ async def get_section(
     if chapter_doc_id != document_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Chapter not found in this document",
+            detail="Chapter not found in this document",
         )
 
     # Use ChapterRenderService if backlinks or link resolution requested
     if include_backlinks or resolve_links:
         from app.services.chapter_render_service import ChapterRenderService
 
-        render_service = ChapterRenderService()
+        storage = AsyncFileStorage()
+        render_service = ChapterRenderService(file_storage=storage.sync)
         doc_path = f"storage/documents/{document.slug}/versions/{document.active_version}"
 
         try:
-            rendered = render_service.render_chapter(
+            rendered = await storage.run(
+                render_service.render_chapter,
                 chapter_file_path=chapter.file_path,
                 doc_path=doc_path,
                 include_backlinks=include_backlinks,
@@ -413,16 +586,14 @@ async def get_section(
         except Exception as e:
             logger.error(f"Failed to render chapter with links: {e}")
             # Fallback to basic read
-            file_storage = FileStorageService()
-            content = file_storage.read_chapter(chapter.file_path)
+            content = await storage.read_chapter(chapter.file_path)
             backlinks = []
             outline = []
             metadata = {}
     else:
         # Basic read without link processing
-        file_storage = FileStorageService()
         try:
-            content = file_storage.read_chapter(chapter.file_path)
+            content = await AsyncFileStorage().read_chapter(chapter.file_path)
         except FileStorageError as e:
             logger.error(f"Failed to read chapter content: {e}")
             raise HTTPException(
@@ -465,6 +636,215 @@ async def get_section(
     return response
 
 
+async def _get_document_chapter(
+    db: AsyncSession, document_id: UUID, section_id: UUID
+) -> tuple[Document, Chapter]:
+    """Load a document and one of its chapters, raising 404 if either is missing."""
+    document = await db.get(Document, document_id)
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document not found: {document_id}",
+        )
+
+    chapter = await db.get(Chapter, section_id)
+    if not chapter:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Chapter not found: {section_id}",
+        )
+
+    result = await db.execute(
+        select(DocumentVersion.document_id).where(
+            DocumentVersion.id == chapter.version_id
+        )
+    )
+    if result.scalar_one_or_none() != document_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chapter not found in this document",
+        )
+    return document, chapter
+
+
+@router.get(
+    "/{document_id}/sections/{section_id}/skeleton",
+    response_model=ChapterSkeleton,
+    summary="Get a chapter's parts for lazy loading",
+)
+async def get_section_skeleton(
+    document_id: UUID,
+    section_id: UUID,
+    db: AsyncSession = Depends(get_db),
+) -> ChapterSkeleton:
+    """
+    Get the part list of a chapter, split at level-2 headings.
+
+    Chapters above the split threshold are returned without their sections'
+    content; clients fetch each part from the parts endpoint when it scrolls
+    into view. Smaller chapters (and chapters whose parts are not current,
+    e.g. after an edit outside the service) are returned in full.
+
+    Args:
+        document_id: Document UUID
+        section_id: Chapter UUID
+
+    Returns:
+        Chapter skeleton with part anchors, titles and sizes
+    """
+    document, chapter = await _get_document_chapter(db, document_id, section_id)
+
+    storage = AsyncFileStorage()
+    try:
+        manifest = await storage.read_chapter_manifest(chapter.file_path)
+        if manifest is None:
+            content = await storage.read_chapter(chapter.file_path)
+            parts = [
+                ChapterPartInfo(
+                    index=part.index,
+                    anchor=part.anchor,
+                    title=part.title,
+                    size=len(part.content.encode("utf-8")),
+                )
+                for part in split_chapter(content)
+            ]
+            size = sum(part.size for part in parts)
+        else:
+            parts = [ChapterPartInfo(**entry) for entry in manifest["parts"]]
+            size = manifest["size"]
+            content = ""
+            if parts and parts[0].anchor == INTRO_ANCHOR:
+                _, content = await storage.read_chapter_part(chapter.file_path, INTRO_ANCHOR)
+    except FileStorageError as e:
+        logger.error(f"Failed to read chapter parts: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to read chapter content",
+        )
+
+    page_number = None
+    if chapter.page_range:
+        try:
+            page_number = int(chapter.page_range.split('-')[0])
+        except ValueError:
+            pass
+
+    return ChapterSkeleton(
+        id=chapter.id,
+        document_id=document_id,
+        title=chapter.title,
+        order_index=chapter.chapter_number,
+        page_number=page_number,
+        split=manifest is not None,
+        size=size,
+        parts=parts,
+        content=content,
+    )
+
+
+@router.get(
+    "/{document_id}/sections/{section_id}/parts/{anchor}",
+    response_model=ChapterPartResponse,
+    summary="Get one part of a chapter",
+)
+async def get_section_part(
+    document_id: UUID,
+    section_id: UUID,
+    anchor: str,
+    resolve_links: bool = True,
+    db: AsyncSession = Depends(get_db),
+) -> ChapterPartResponse:
+    """
+    Get the content of one chapter part.
+
+    Args:
+        document_id: Document UUID
+        section_id: Chapter UUID
+        anchor: Part anchor from the chapter skeleton
+        resolve_links: Resolve [[wikilinks]] to URLs
+
+    Returns:
+        Part markdown
+    """
+    document, chapter = await _get_document_chapter(db, document_id, section_id)
+
+    storage = AsyncFileStorage()
+    try:
+        entry, content = await storage.read_chapter_part(chapter.file_path, anchor)
+    except ChapterPartNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Chapter part not found: {anchor}",
+        )
+    except FileStorageError as e:
+        logger.error(f"Failed to read chapter part: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to read chapter content",
+        )
+
+    if resolve_links:
+        from app.services.chapter_render_service import ChapterRenderService
+
+        doc_path = f"storage/documents/{document.slug}/versions/{document.active_version}"
+        render_service = ChapterRenderService(file_storage=storage.sync)
+        content = await storage.run(render_service.resolve_links, content, doc_path)
+
+    return ChapterPartResponse(
+        id=chapter.id,
+        index=entry["index"],
+        anchor=entry["anchor"],
+        title=entry["title"],
+        content=content,
+    )
+
+
+@router.get(
+    "/{document_id}/sections/{section_id}/raw",
+    response_class=Response,
+    summary="Get a chapter's markdown",
+    responses={200: {"content": {"text/markdown": {}}}},
+)
+async def get_section_markdown(
+    document_id: UUID,
+    section_id: UUID,
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Get a chapter's stored markdown (frontmatter stripped, wikilinks unresolved).
+
+    With chapter pre-compression enabled, clients accepting the configured
+    encoding get the compressed variant written with the chapter, sent as
+    stored with a Content-Encoding header.
+
+    Args:
+        document_id: Document UUID
+        section_id: Chapter UUID
+        accept_encoding: Accept-Encoding request header
+
+    Returns:
+        Markdown body
+    """
+    _, chapter = await _get_document_chapter(db, document_id, section_id)
+
+    try:
+        body, encoding = await AsyncFileStorage().read_chapter_encoded(
+            chapter.file_path, accept_encoding
+        )
+    except FileStorageError as e:
+        logger.error(f"Failed to read chapter content: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to read chapter content",
+        )
+
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="text/markdown; charset=utf-8", headers=headers)
+
+
 @router.put(
     "/{document_id}/sections/{section_id}",
     response_model=dict,
@@ -504,17 +884,10 @@ async def update_section_content(
         )
 
     # Write content to file
-    file_storage = FileStorageService()
+    storage = AsyncFileStorage()
     try:
-        # Read file path to extract info for re-saving
-        from pathlib import Path
-        path_parts = Path(chapter.file_path).parts
-        # Reconstruct save call
-        # file_path format: {doc-slug}/versions/{version}/chapters/chapter-XX-slug.md
-
         # Update content in file
-        with open(file_storage._base_path / chapter.file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        await storage.update_chapter(chapter.file_path, content)
 
         # Update word count
         chapter.word_count = len(content.split())
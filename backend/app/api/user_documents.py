@@ -1,5 +1,6 @@
 """API endpoints for user-created documents (notes and references) and wikilinks."""
 import logging
+from pathlib import Path
 from typing import List, Optional
 from uuid import UUID
 
@@ -11,7 +12,7 @@ from app.api.dependencies import get_db
 from app.models import Document, UserDocument
 from app.services.user_document_service import UserDocumentService, UserDocumentError
 from app.services.wikilink_service import WikiLinkService
-from app.services.file_storage import FileStorageService
+from app.services.async_file_storage import AsyncFileStorage, run_in_storage_executor
 
 logger = logging.getLogger(__name__)
 
@@ -273,7 +274,8 @@ async def get_note(
         # Get backlinks
         wikilink_service = WikiLinkService()
         doc_path = f"storage/documents/{doc_slug}/versions/{version}"
-        backlinks_data = wikilink_service.get_backlinks(
+        backlinks_data = await run_in_storage_executor(
+            wikilink_service.get_backlinks,
             target_file=user_doc.file_path,
             doc_path=doc_path
         )
@@ -511,7 +513,8 @@ async def get_backlinks(
         backlinks = []
         for path in possible_paths:
             try:
-                backlinks_data = wikilink_service.get_backlinks(
+                backlinks_data = await run_in_storage_executor(
+                    wikilink_service.get_backlinks,
                     target_file=path,
                     doc_path=doc_path
                 )
@@ -559,7 +562,7 @@ async def get_link_graph(
         wikilink_service = WikiLinkService()
         doc_path = f"storage/documents/{doc_slug}/versions/{version}"
 
-        graph = wikilink_service.build_link_graph(doc_path)
+        graph = await run_in_storage_executor(wikilink_service.build_link_graph, doc_path)
 
         # Convert to nodes and edges format
         nodes = []
@@ -592,6 +595,53 @@ async def get_link_graph(
         )
 
 
+def _scan_linkable_documents(base_path: Path) -> List[LinkableDocumentResponse]:
+    """Title and type of every chapter, note and reference file of a version."""
+    linkable = []
+
+    # Get all markdown files
+    for md_file in base_path.rglob("*.md"):
+        try:
+            rel_path = md_file.relative_to(base_path)
+            filename = md_file.stem
+
+            # Determine file type
+            if str(rel_path).startswith("chapters"):
+                file_type = "chapter"
+            elif str(rel_path).startswith("notes"):
+                file_type = "note"
+            elif str(rel_path).startswith("references"):
+                file_type = "reference"
+            else:
+                continue
+
+            # Extract title from file
+            content = md_file.read_text(encoding="utf-8")
+            title = filename.replace('-', ' ').title()
+
+            # Try to get better title from frontmatter or H1
+            import re
+            frontmatter_match = re.search(r'^---\s*\n.*?title:\s*["\']?(.+?)["\']?\s*\n.*?\n---', content, re.DOTALL)
+            if frontmatter_match:
+                title = frontmatter_match.group(1).strip()
+            else:
+                h1_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+                if h1_match:
+                    title = h1_match.group(1).strip()
+
+            linkable.append(LinkableDocumentResponse(
+                filename=filename,
+                title=title,
+                file_type=file_type
+            ))
+
+        except Exception as e:
+            logger.warning(f"Error processing file {md_file}: {e}")
+            continue
+
+    return linkable
+
+
 @router.get(
     "/{document_id}/versions/{version}/search-linkable",
     response_model=List[LinkableDocumentResponse],
@@ -610,51 +660,11 @@ async def get_linkable_documents(
     try:
         document, doc_slug = await get_document_and_validate(document_id, version, db)
 
-        file_storage = FileStorageService()
-        doc_path = f"storage/documents/{doc_slug}/versions/{version}"
-        base_path = file_storage._base_path / doc_slug / "versions" / version
-
-        linkable = []
+        storage = AsyncFileStorage()
+        base_path = storage.sync._base_path / doc_slug / "versions" / version
 
-        # Get all markdown files
-        for md_file in base_path.rglob("*.md"):
-            try:
-                rel_path = md_file.relative_to(base_path)
-                filename = md_file.stem
-
-                # Determine file type
-                if str(rel_path).startswith("chapters"):
-                    file_type = "chapter"
-                elif str(rel_path).startswith("notes"):
-                    file_type = "note"
-                elif str(rel_path).startswith("references"):
-                    file_type = "reference"
-                else:
-                    continue
-
-                # Extract title from file
-                content = md_file.read_text(encoding="utf-8")
-                title = filename.replace('-', ' ').title()
-
-                # Try to get better title from frontmatter or H1
-                import re
-                frontmatter_match = re.search(r'^---\s*\n.*?title:\s*["\']?(.+?)["\']?\s*\n.*?\n---', content, re.DOTALL)
-                if frontmatter_match:
-                    title = frontmatter_match.group(1).strip()
-                else:
-                    h1_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-                    if h1_match:
-                        title = h1_match.group(1).strip()
-
-                linkable.append(LinkableDocumentResponse(
-                    filename=filename,
-                    title=title,
-                    file_type=file_type
-                ))
-
-            except Exception as e:
-                logger.warning(f"Error processing file {md_file}: {e}")
-                continue
+        # Reads every markdown file of the version: keep it off the event loop
+        linkable = await storage.run(_scan_linkable_documents, base_path)
 
         # Sort by filename
         linkable.sort(key=lambda x: x.filename)
@@ -0,0 +1,247 @@
+"""
+Command-line maintenance tasks.
+
+Usage (from backend/):
+    python -m app.cli regenerate [--document-id UUID] [--concurrency N]
+    python -m app.cli ingest DIR [--version V] [--state FILE] [--workers N] [--concurrency N]
+    python -m app.cli pack [SLUG ...]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.database import engine
+from app.schemas.admin import BulkRegenerationReport
+from app.services.bulk_ingest import (
+    BulkIngestError,
+    BulkIngestReport,
+    BulkIngestService,
+    IngestFileResult,
+    IngestState,
+    discover_files,
+)
+from app.services.bulk_regeneration import BulkRegenerationService
+from app.services.file_storage import FileStorageError, FileStorageService
+from app.services.ingestion_executor import shutdown_ingestion_executor
+
+logger = logging.getLogger(__name__)
+
+
+def _print_report(report: BulkRegenerationReport) -> None:
+    """Print a bulk regeneration summary followed by any failures."""
+    print(
+        f"Regenerated {report.completed}/{report.total} versions "
+        f"({report.failed} failed, {report.skipped} without element cache) "
+        f"in {report.elapsed_seconds:.1f}s"
+    )
+    print(
+        f"Throughput: {report.versions_per_second:.2f} versions/s, "
+        f"{report.chapters_per_second:.1f} chapters/s ({report.chapters} chapters)"
+    )
+    for result in report.results:
+        if result.status == "failed":
+            print(f"  FAILED {result.document_id}/{result.version}: {result.error_message}")
+
+
+async def _regenerate(document_id: Optional[UUID], concurrency: Optional[int]) -> int:
+    """Run bulk regeneration and return the process exit code."""
+    try:
+        report = await BulkRegenerationService().regenerate_all(document_id, concurrency)
+    finally:
+        shutdown_ingestion_executor()
+        await engine.dispose()
+
+    _print_report(report)
+    return 1 if report.failed else 0
+
+
+def _print_ingest_result(result: IngestFileResult) -> None:
+    """Print one file's outcome with its throughput."""
+    name = f"{result.path} ({result.title} {result.version})"
+    if result.status == "completed":
+        print(
+            f"  OK {name}: {result.chapters} chapters, {result.size / 1e6:.1f} MB "
+            f"in {result.elapsed_seconds:.1f}s ({result.megabytes_per_second:.1f} MB/s, "
+            f"{result.chapters_per_second:.1f} chapters/s)",
+            flush=True,
+        )
+    elif result.status == "failed":
+        print(f"  FAILED {name}: {result.error_message}", flush=True)
+    else:
+        print(f"  {result.status.upper()} {name}", flush=True)
+
+
+def _print_ingest_report(report: BulkIngestReport) -> None:
+    """Print a bulk ingestion summary."""
+    elapsed = report.elapsed_seconds
+    print(
+        f"Ingested {report.count('completed')}/{len(report.results)} files "
+        f"({report.count('skipped')} already done, "
+        f"{report.count('deduplicated')} unchanged, "
+        f"{report.count('failed')} failed) in {elapsed:.1f}s"
+    )
+    if elapsed:
+        print(
+            f"Throughput: {report.processed_bytes / 1e6 / elapsed:.1f} MB/s, "
+            f"{report.chapters / elapsed:.1f} chapters/s ({report.chapters} chapters)"
+        )
+
+
+async def _ingest(
+    root: Path,
+    version: Optional[str],
+    state_path: Path,
+    concurrency: int,
+) -> int:
+    """Run bulk ingestion of a directory and return the process exit code."""
+    try:
+        files = discover_files(root, version)
+        state = IngestState(state_path)
+    except BulkIngestError as e:
+        print(f"error: {e}", file=sys.stderr)
+        await engine.dispose()
+        return 2
+
+    print(
+        f"Ingesting {len(files)} files from {root} with {settings.ingest_workers} "
+        f"workers, {concurrency} files at a time (state: {state_path})",
+        flush=True,
+    )
+    try:
+        report = await BulkIngestService(state).ingest(
+            files, concurrency, on_result=_print_ingest_result
+        )
+    finally:
+        shutdown_ingestion_executor()
+        await engine.dispose()
+
+    _print_ingest_report(report)
+    return 1 if report.count("failed") else 0
+
+
+def _pack(slugs: List[str]) -> int:
+    """Pack the active version of documents and return the process exit code."""
+    storage = FileStorageService()
+    try:
+        slugs = slugs or storage.list_documents()
+    except FileStorageError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    failed = 0
+    for slug in slugs:
+        version = storage.get_active_version(slug)
+        if version is None:
+            print(f"  {slug}: no active version", file=sys.stderr)
+            failed += 1
+            continue
+        try:
+            files = storage.pack_version(slug, version)
+        except FileStorageError as e:
+            print(f"  {slug}/{version}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        print(f"  {slug}/{version}: {files} files packed")
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point for ``python -m app.cli``.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    regenerate = subparsers.add_parser(
+        "regenerate",
+        help="Regenerate chapters of stored versions from their element caches",
+    )
+    regenerate.add_argument("--document-id", type=UUID, help="Limit to one document")
+    regenerate.add_argument(
+        "--concurrency",
+        type=int,
+        help="Versions regenerated at once (default: REGENERATION_CONCURRENCY)",
+    )
+
+    ingest = subparsers.add_parser(
+        "ingest",
+        help="Ingest a directory tree of Docling JSON files (.json, .json.gz, .json.zst)",
+    )
+    ingest.add_argument(
+        "directory",
+        type=Path,
+        help="Root directory laid out as <title>/<version>.json",
+    )
+    ingest.add_argument(
+        "--version",
+        help="Ingest every file as this version, titled by its file name",
+    )
+    ingest.add_argument(
+        "--state",
+        type=Path,
+        help="Resume state file (default: bulk-ingest-state.json in UPLOAD_DIR)",
+    )
+    ingest.add_argument(
+        "--workers",
+        type=int,
+        help="Generation worker processes (default: one per CPU)",
+    )
+    ingest.add_argument(
+        "--concurrency",
+        type=int,
+        help="Files in flight at once, one per document (default: workers + 1)",
+    )
+
+    pack = subparsers.add_parser(
+        "pack",
+        help="Write pack files of active versions (see VERSION_PACK)",
+    )
+    pack.add_argument("slugs", nargs="*", metavar="SLUG", help="Documents (default: all)")
+
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    if args.command == "regenerate":
+        if args.concurrency is not None and args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        return asyncio.run(_regenerate(args.document_id, args.concurrency))
+
+    if args.command == "ingest":
+        workers = args.workers if args.workers is not None else os.cpu_count() or 1
+        if workers < 1:
+            parser.error("--workers must be at least 1")
+        if args.concurrency is not None and args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        # The process pool is created on first use, sized from settings
+        settings.ingest_workers = workers
+        return asyncio.run(_ingest(
+            args.directory,
+            args.version,
+            args.state or settings.upload_dir / "bulk-ingest-state.json",
+            args.concurrency or workers + 1,
+        ))
+
+    if args.command == "pack":
+        return _pack(args.slugs)
+
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 """Application configuration using Pydantic Settings."""
 from pathlib import Path
-from typing import List
+from typing import List, Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -30,6 +30,147 @@ class Settings(BaseSettings):
         default=52428800,  # 50MB
         description="Maximum upload file size in bytes",
     )
+    max_decompressed_upload_size: int = Field(
+        default=1073741824,  # 1GB
+        description="Maximum decompressed size in bytes of a .json.gz/.json.zst upload",
+    )
+
+    # Ingestion
+    streaming_ingest_threshold: int = Field(
+        default=20971520,  # 20MB
+        description=(
+            "Docling JSON files at or above this size (bytes) are ingested with "
+            "the streaming parser; 0 streams every file"
+        ),
+    )
+    ingest_workers: int = Field(
+        default=2,
+        description=(
+            "Worker processes for markdown generation; 0 runs generation in a "
+            "thread of the API process"
+        ),
+    )
+    ingest_chapter_workers: int = Field(
+        default=0,
+        description=(
+            "Processes used by each generation to render chapters in parallel, "
+            "capped at the CPU count divided by ingest_workers; below 2 renders "
+            "chapters sequentially"
+        ),
+    )
+    docling_typed_decode: bool = Field(
+        default=False,
+        description=(
+            "Decode non-streamed Docling JSON into typed structs (requires msgspec; "
+            "falls back to plain dicts when it is not installed)"
+        ),
+    )
+    incremental_ingest: bool = Field(
+        default=True,
+        description=(
+            "Reuse unchanged chapter files and search vectors from the previous "
+            "version instead of rewriting them"
+        ),
+    )
+    regeneration_concurrency: int = Field(
+        default=2,
+        ge=1,
+        description="Versions regenerated at once by bulk regeneration",
+    )
+    boilerplate_rule_set: Literal["nse", "bse", "mcx"] = Field(
+        default="nse",
+        description="Exchange-specific page header/footer rules removed from Docling output",
+    )
+    boilerplate_repeat_fraction: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description=(
+            "Text lines repeated on at least this share of a document's pages are "
+            "removed as page furniture; 0 disables repeated-line detection"
+        ),
+    )
+    chapter_split_threshold: int = Field(
+        default=1048576,  # 1MB
+        ge=0,
+        description=(
+            "Chapters larger than this (bytes) are also stored as parts split at "
+            "level-2 headings and loaded part by part; 0 disables splitting"
+        ),
+    )
+    chapter_cache_bytes: int = Field(
+        default=67108864,  # 64MB
+        ge=0,
+        description=(
+            "Memory budget (bytes) of the in-process chapter content cache; "
+            "0 disables caching"
+        ),
+    )
+    chapter_precompression: Literal["none", "gzip", "zstd"] = Field(
+        default="none",
+        description=(
+            "Write a compressed variant of each chapter when it is saved and serve "
+            "it as-is to clients accepting the encoding (zstd requires zstandard; "
+            "falls back to gzip when it is not installed)"
+        ),
+    )
+    version_clone: bool = Field(
+        default=True,
+        description=(
+            "Create draft versions by reflinking or hardlinking the source version's "
+            "files instead of copying them"
+        ),
+    )
+    version_pack: bool = Field(
+        default=False,
+        description=(
+            "Write a pack file of each version's chapters when it is activated; "
+            "chapters are then read from a memory map of the pack"
+        ),
+    )
+    storage_io_threads: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Threads running file reads and writes for API requests (default: "
+            "number of CPUs; more threads contend with the event loop for the GIL)"
+        ),
+    )
+    ingest_max_concurrent_jobs: int = Field(
+        default=1,
+        ge=1,
+        description="Maximum ingestion jobs processed at once per API process",
+    )
+    batch_upload_max_files: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum files accepted by one batch upload",
+    )
+    batch_max_parallel: int = Field(
+        default=2,
+        ge=1,
+        description="Default number of a batch's jobs processed at once",
+    )
+    ingest_poll_interval: float = Field(
+        default=2.0,
+        description="Seconds between ingestion queue polls when idle",
+    )
+    ingest_job_lease_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description=(
+            "Seconds a running ingestion job stays claimed without a heartbeat "
+            "from its worker before another worker queues it again"
+        ),
+    )
+    ingest_failed_retention_hours: float = Field(
+        default=72.0,
+        gt=0,
+        description=(
+            "Hours the upload and checkpoint files of a failed ingestion job "
+            "are kept for a retry before they are deleted"
+        ),
+    )
 
     # CORS
     cors_origins: List[str] = Field(
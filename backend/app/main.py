@@ -8,6 +8,9 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.database import engine, init_db
+from app.services.async_file_storage import shutdown_storage_executor
+from app.services.ingestion_executor import shutdown_ingestion_executor
+from app.services.ingestion_queue import ingestion_worker
 
 # Configure logging
 logging.basicConfig(
@@ -23,9 +26,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
     logger.info("Starting Exchange Documentation Manager API")
     await init_db()
+    ingestion_worker.start()
     yield
     # Shutdown
     logger.info("Shutting down Exchange Documentation Manager API")
+    await ingestion_worker.stop()
+    shutdown_ingestion_executor()
+    shutdown_storage_executor()
     await engine.dispose()
 
 
@@ -64,8 +71,9 @@ async def root() -> dict[str, str]:
 
 # Import and include routers
 # Use v2 API with file-based storage
-from app.api import documents_v2, search, user_documents
+from app.api import admin, documents_v2, search, user_documents
 
 app.include_router(documents_v2.router, prefix="/api/documents", tags=["documents"])
 app.include_router(user_documents.router, prefix="/api/documents", tags=["user-documents"])
 app.include_router(search.router, prefix="/api", tags=["search"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
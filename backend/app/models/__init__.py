@@ -7,6 +7,7 @@ from app.models.document_v2 import Document
 from app.models.version import DocumentVersion
 from app.models.chapter import Chapter
 from app.models.user_document import UserDocument
+from app.models.ingestion_job import IngestionBatch, IngestionJob
 
 # Old models kept for reference during migration
 # from app.models.document import Document as DocumentV1
@@ -18,4 +19,6 @@ __all__ = [
     "DocumentVersion",
     "Chapter",
     "UserDocument",
+    "IngestionBatch",
+    "IngestionJob",
 ]
@@ -48,6 +48,7 @@ class Chapter(Base):
     has_manual_content = Column(Boolean, server_default=text("false"), nullable=False)
     has_linked_docs = Column(Boolean, server_default=text("false"), nullable=False)
     search_vector = Column(TSVECTOR, nullable=True)  # For full-text search
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of generated markdown
     created_at = Column(
         TIMESTAMP,
         server_default=text("NOW()"),
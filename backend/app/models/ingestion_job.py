@@ -0,0 +1,114 @@
+"""
+IngestionJob model.
+
+Persistent queue of document ingestion work, so queued and interrupted
+uploads survive API restarts and report stage-level progress. Jobs uploaded
+together belong to an IngestionBatch.
+"""
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    TIMESTAMP,
+    CheckConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
+
+from app.core.database import Base
+
+
+class IngestionBatch(Base):
+    """
+    Jobs uploaded together through the batch upload endpoint.
+
+    At most ``max_parallel`` of the batch's jobs run at once.
+    """
+
+    __tablename__ = "ingestion_batches"
+
+    id = Column(
+        PGUUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+        nullable=False,
+    )
+    max_parallel = Column(Integer, server_default=text("2"), nullable=False)
+    created_at = Column(
+        TIMESTAMP,
+        server_default=text("NOW()"),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        CheckConstraint("max_parallel >= 1", name="ck_ingestion_batch_max_parallel"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<IngestionBatch(id={self.id}, max_parallel={self.max_parallel})>"
+
+
+class IngestionJob(Base):
+    """
+    One queued upload waiting for (or undergoing) processing.
+
+    Stages run in order: parse, generate, write, index, activate.
+    Per-stage durations (seconds) are kept in ``stage_timings``. A running
+    job is leased to the worker in ``claimed_by``, which renews
+    ``heartbeat_at`` while it runs.
+    """
+
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(
+        PGUUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+        nullable=False,
+    )
+    document_id = Column(
+        PGUUID(as_uuid=True),
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    batch_id = Column(
+        PGUUID(as_uuid=True),
+        ForeignKey("ingestion_batches.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    version = Column(String(50), nullable=False)
+    file_type = Column(String(20), nullable=False)
+    temp_path = Column(String(500), nullable=False)  # Uploaded file awaiting processing
+    content_hash = Column(String(64), nullable=True)
+    status = Column(String(20), nullable=False, server_default=text("'queued'"), index=True)
+    stage = Column(String(20), nullable=True)
+    progress = Column(Integer, server_default=text("0"), nullable=False)
+    stage_timings = Column(JSONB, server_default=text("'{}'::jsonb"), nullable=False)
+    # Chapters already committed, so a retry resumes (see ingestion_checkpoint)
+    checkpoint = Column(JSONB, server_default=text("'{}'::jsonb"), nullable=False)
+    error_message = Column(Text, nullable=True)
+    attempts = Column(Integer, server_default=text("0"), nullable=False)
+    # Lease of a running job: the worker running it and when it last said so
+    claimed_by = Column(String(100), nullable=True)
+    heartbeat_at = Column(TIMESTAMP, nullable=True)
+    created_at = Column(
+        TIMESTAMP,
+        server_default=text("NOW()"),
+        nullable=False,
+    )
+    started_at = Column(TIMESTAMP, nullable=True)
+    finished_at = Column(TIMESTAMP, nullable=True)
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('queued', 'running', 'completed', 'failed')",
+            name="ck_ingestion_job_status",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<IngestionJob(id={self.id}, version='{self.version}', status='{self.status}')>"
@@ -48,6 +48,8 @@ class DocumentVersion(Base):
     )
     approved_by = Column(String(255), nullable=True)
     approved_at = Column(TIMESTAMP, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the uploaded file
+    generator_hash = Column(String(64), nullable=True)  # Generator config fingerprint
 
     # Constraints
     __table_args__ = (
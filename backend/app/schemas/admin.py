@@ -0,0 +1,43 @@
+"""Pydantic schemas for administrative operations."""
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class RegenerationResult(BaseModel):
+    """Outcome of regenerating one version from its element cache."""
+
+    document_id: UUID
+    version: str
+    status: str = Field(..., description="Regeneration status: completed or failed")
+    chapter_count: Optional[int] = Field(None, description="Chapters generated")
+    error_message: Optional[str] = Field(None, description="Error message if failed")
+    stage_timings: dict[str, float] = Field(
+        default_factory=dict, description="Seconds spent in each stage"
+    )
+
+
+class BulkRegenerationReport(BaseModel):
+    """Outcome and throughput of a bulk regeneration run."""
+
+    results: list[RegenerationResult]
+    total: int = Field(..., description="Versions regenerated or attempted")
+    completed: int
+    failed: int
+    skipped: int = Field(..., description="Versions without an element cache")
+    chapters: int = Field(..., description="Chapters generated across completed versions")
+    elapsed_seconds: float
+    versions_per_second: float
+    chapters_per_second: float
+
+
+class ChapterCacheStats(BaseModel):
+    """Counters of the in-process chapter content cache."""
+
+    entries: int
+    bytes: int = Field(..., description="Content bytes currently cached")
+    max_bytes: int = Field(..., description="Memory budget (0: caching disabled)")
+    hits: int
+    misses: int
+    evictions: int
@@ -83,7 +83,16 @@ class ProcessingStatus(BaseModel):
     document_id: UUID
     status: str = Field(..., description="Processing status: pending, processing, completed, failed")
     progress: Optional[int] = Field(None, ge=0, le=100, description="Processing progress percentage")
+    message: Optional[str] = Field(None, description="Human-readable status message")
     error_message: Optional[str] = Field(None, description="Error message if failed")
+    job_id: Optional[UUID] = Field(None, description="Ingestion job ID")
+    stage: Optional[str] = Field(
+        None, description="Current stage: parse, generate, write, index, activate"
+    )
+    queue_position: Optional[int] = Field(None, ge=1, description="Position in queue if pending")
+    stage_timings: dict[str, float] = Field(
+        default_factory=dict, description="Seconds spent in each completed stage"
+    )
 
 
 class TOCEntry(BaseModel):
@@ -101,3 +110,91 @@ class TableOfContents(BaseModel):
 
     document_id: UUID
     entries: list[TOCEntry]
+
+
+class ChapterPartInfo(BaseModel):
+    """One part of a chapter, split at a level-2 heading."""
+
+    index: int
+    anchor: str = Field(..., description="Part id used to fetch its content")
+    title: str = Field(..., description="Level-2 heading text (empty for the intro)")
+    size: int = Field(..., description="Part size in bytes")
+
+
+class ChapterSkeleton(BaseModel):
+    """Chapter outline for loading a large chapter part by part."""
+
+    id: UUID
+    document_id: UUID
+    title: str
+    order_index: int
+    page_number: Optional[int] = None
+    split: bool = Field(..., description="Chapter is stored as parts")
+    size: int = Field(..., description="Chapter size in bytes (without frontmatter)")
+    parts: list[ChapterPartInfo]
+    content: str = Field(
+        ..., description="Full chapter if not split, otherwise its intro part (if any)"
+    )
+
+
+class ChapterPartResponse(BaseModel):
+    """Content of one chapter part."""
+
+    id: UUID = Field(..., description="Chapter ID")
+    index: int
+    anchor: str
+    title: str
+    content: str
+
+
+class BatchUploadItem(BaseModel):
+    """One file of a batch upload."""
+
+    filename: str
+    document_id: UUID
+    title: str
+    version: str
+    file_type: str
+    job_id: Optional[UUID] = Field(None, description="Ingestion job (None if deduplicated)")
+    deduplicated: bool = Field(
+        False,
+        description=(
+            "This version was already processed from an identical upload; "
+            "no job was queued"
+        ),
+    )
+
+
+class BatchUploadResponse(BaseModel):
+    """Schema for a batch upload."""
+
+    batch_id: UUID
+    max_parallel: int = Field(..., description="Jobs of this batch processed at once")
+    items: list[BatchUploadItem]
+
+
+class BatchJobStatus(BaseModel):
+    """Processing status of one job in a batch."""
+
+    job_id: UUID
+    document_id: UUID
+    title: str
+    version: str
+    status: str = Field(..., description="pending, processing, completed or failed")
+    stage: Optional[str] = None
+    progress: int = Field(..., ge=0, le=100)
+    error_message: Optional[str] = None
+
+
+class BatchStatus(BaseModel):
+    """Aggregate processing status of a batch upload."""
+
+    batch_id: UUID
+    max_parallel: int
+    total: int
+    pending: int
+    processing: int
+    completed: int
+    failed: int
+    progress: int = Field(..., ge=0, le=100, description="Mean progress of the batch's jobs")
+    jobs: list[BatchJobStatus]
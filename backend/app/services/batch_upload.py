@@ -0,0 +1,279 @@
+"""
+Batch uploads: many documents queued for ingestion in one request.
+
+All uploads are saved first; the Document records, the IngestionBatch and
+its jobs are then created in a single transaction. The ingestion worker runs
+at most ``max_parallel`` jobs of a batch at once (see IngestionWorker).
+"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Document, IngestionBatch, IngestionJob
+from app.schemas.document import (
+    BatchJobStatus,
+    BatchStatus,
+    BatchUploadItem,
+    BatchUploadResponse,
+)
+from app.services.document_processor_v2 import (
+    JOB_STATUS_MAP,
+    DocumentProcessor,
+    StoredUpload,
+)
+from app.services.file_storage import FileStorageService
+from app.services.ingestion_queue import ingestion_worker
+
+logger = logging.getLogger(__name__)
+
+
+class BatchUploadError(Exception):
+    """Raised when a batch upload is invalid or a batch is not found."""
+    pass
+
+
+@dataclass
+class BatchFile:
+    """One file of a batch upload with its document title and version."""
+
+    file: UploadFile
+    title: str
+    version: str
+    file_type: str
+
+
+class BatchUploadService:
+    """Create and report on batch uploads."""
+
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        file_storage: Optional[FileStorageService] = None,
+    ) -> None:
+        """
+        Initialize service.
+
+        Args:
+            db_session: Database session
+            file_storage: File storage service (defaults to standard location)
+        """
+        self._db = db_session
+        self._processor = DocumentProcessor(db_session, file_storage)
+
+    async def upload(
+        self,
+        files: List[BatchFile],
+        max_parallel: Optional[int] = None,
+    ) -> BatchUploadResponse:
+        """
+        Save a batch of uploads and queue them for ingestion.
+
+        Uploads identical to what their version was already processed from
+        are not queued (reported as deduplicated, and their version is
+        activated), as with single uploads.
+
+        Args:
+            files: Files with their titles and versions
+            max_parallel: Jobs of the batch processed at once
+                (defaults to ``settings.batch_max_parallel``)
+
+        Returns:
+            BatchUploadResponse with the batch ID and one item per file
+
+        Raises:
+            BatchUploadError: If the batch is empty, too large or names the
+                same document version twice
+            UploadTooLargeError: If a file exceeds settings.max_upload_size
+        """
+        if not files:
+            raise BatchUploadError("Batch contains no files")
+        if len(files) > settings.batch_upload_max_files:
+            raise BatchUploadError(
+                f"Batch has {len(files)} files; limit is {settings.batch_upload_max_files}"
+            )
+
+        slugs = [self._processor._slugify(f.title) for f in files]
+        seen = set()
+        for batch_file, slug in zip(files, slugs):
+            if (slug, batch_file.version) in seen:
+                raise BatchUploadError(
+                    f"'{batch_file.title}' version {batch_file.version} appears twice in the batch"
+                )
+            seen.add((slug, batch_file.version))
+
+        uploads: List[StoredUpload] = []
+        try:
+            for batch_file, slug in zip(files, slugs):
+                uploads.append(await self._processor._save_temp_file(
+                    batch_file.file, slug, batch_file.version, batch_file.file_type
+                ))
+
+            batch = IngestionBatch(max_parallel=max_parallel or settings.batch_max_parallel)
+            self._db.add(batch)
+            documents = await self._get_or_create_documents(files, slugs)
+            await self._db.flush()
+
+            items = []
+            activated: List[Tuple[str, str]] = []
+            for batch_file, slug, upload in zip(files, slugs, uploads):
+                items.append(
+                    await self._queue(batch, documents[slug], batch_file, upload, activated)
+                )
+
+            await self._db.commit()
+        except BaseException:
+            await self._db.rollback()
+            for upload in uploads:
+                upload.path.unlink(missing_ok=True)
+            raise
+
+        # Files follow the committed activations only
+        for slug, version in activated:
+            await self._processor.write_active_version(slug, version)
+
+        queued = sum(1 for item in items if item.job_id is not None)
+        logger.info(
+            f"Batch {batch.id}: queued {queued} of {len(items)} uploads "
+            f"(max {batch.max_parallel} in parallel)"
+        )
+        if queued:
+            ingestion_worker.notify()
+
+        return BatchUploadResponse(
+            batch_id=batch.id,
+            max_parallel=batch.max_parallel,
+            items=items,
+        )
+
+    async def _get_or_create_documents(
+        self,
+        files: List[BatchFile],
+        slugs: List[str],
+    ) -> Dict[str, Document]:
+        """Load the batch's documents by slug, adding the missing ones (not flushed)."""
+        result = await self._db.execute(
+            select(Document).where(Document.slug.in_(set(slugs)))
+        )
+        documents = {doc.slug: doc for doc in result.scalars()}
+
+        for batch_file, slug in zip(files, slugs):
+            if slug not in documents:
+                documents[slug] = Document(
+                    slug=slug,
+                    title=batch_file.title,
+                    active_version=None,  # Will be set after processing
+                    storage_path=slug,
+                )
+                self._db.add(documents[slug])
+        return documents
+
+    async def _queue(
+        self,
+        batch: IngestionBatch,
+        document: Document,
+        batch_file: BatchFile,
+        upload: StoredUpload,
+        activated: List[Tuple[str, str]],
+    ) -> BatchUploadItem:
+        """
+        Add one upload's job to the batch, unless it is a duplicate.
+
+        A duplicate activates its version in the batch's transaction; the
+        (slug, version) is appended to ``activated`` for the caller to
+        write to disk after committing.
+        """
+        item = BatchUploadItem(
+            filename=batch_file.file.filename or "",
+            document_id=document.id,
+            title=document.title,
+            version=batch_file.version,
+            file_type=batch_file.file_type,
+        )
+
+        existing = await self._processor.find_existing_version(
+            document.id, batch_file.version, upload.sha256, batch_file.file_type
+        )
+        if existing:
+            upload.path.unlink(missing_ok=True)
+            slug = await self._processor.activate_version(document.id, existing.version)
+            if slug is not None:
+                activated.append((slug, existing.version))
+            item.deduplicated = True
+            return item
+
+        job = IngestionJob(
+            document_id=document.id,
+            batch_id=batch.id,
+            version=batch_file.version,
+            file_type=batch_file.file_type,
+            temp_path=str(upload.path),
+            content_hash=upload.sha256,
+            status="queued",
+            stage_timings={},
+        )
+        self._db.add(job)
+        await self._db.flush()
+        item.job_id = job.id
+        return item
+
+    async def get_status(self, batch_id: UUID) -> BatchStatus:
+        """
+        Aggregate progress of a batch's jobs.
+
+        Args:
+            batch_id: IngestionBatch ID
+
+        Returns:
+            BatchStatus with per-status counts and per-job status
+
+        Raises:
+            BatchUploadError: If the batch does not exist
+        """
+        batch = await self._db.get(IngestionBatch, batch_id)
+        if batch is None:
+            raise BatchUploadError(f"Batch not found: {batch_id}")
+
+        result = await self._db.execute(
+            select(IngestionJob, Document.title)
+            .join(Document, Document.id == IngestionJob.document_id)
+            .where(IngestionJob.batch_id == batch_id)
+            .order_by(IngestionJob.created_at)
+        )
+        jobs = [
+            BatchJobStatus(
+                job_id=job.id,
+                document_id=job.document_id,
+                title=title,
+                version=job.version,
+                status=JOB_STATUS_MAP[job.status],
+                stage=job.stage,
+                progress=job.progress,
+                error_message=job.error_message,
+            )
+            for job, title in result
+        ]
+
+        counts = {status: 0 for status in JOB_STATUS_MAP.values()}
+        for job in jobs:
+            counts[job.status] += 1
+
+        return BatchStatus(
+            batch_id=batch.id,
+            max_parallel=batch.max_parallel,
+            total=len(jobs),
+            pending=counts["pending"],
+            processing=counts["processing"],
+            completed=counts["completed"],
+            failed=counts["failed"],
+            # Failed jobs are finished: count them as done, not stuck
+            progress=round(
+                sum(100 if job.status == "failed" else job.progress for job in jobs) / len(jobs)
+            ) if jobs else 100,
+            jobs=jobs,
+        )
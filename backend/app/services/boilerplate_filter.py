@@ -0,0 +1,306 @@
+"""Boilerplate filtering for Docling text elements.
+
+Exchange specifications repeat the same page furniture on every page:
+confidentiality markings, page numbers and running document titles. These
+lines are removed before chapters are rendered.
+
+Rules are grouped into rule sets per exchange (NSE, BSE and MCX footers
+differ). Each rule set is compiled once into a single alternation of named
+groups, so classifying a line is one ``fullmatch`` regardless of how many
+rules the set has; ``match.lastgroup`` identifies the rule that fired and
+drives per-rule hit counters used to tune the rules.
+
+Exchanges without a rule set (and running titles the rules do not know)
+are covered by statistical detection: ``detect_repeated_lines`` makes one
+pass over the document, counting on how many pages each text line occurs.
+Lines that occur on most pages are page furniture, and the filter drops them
+as well (counted under ``REPEATED_LINE``).
+"""
+
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Counter key for page_header / page_footer elements labelled by Docling itself
+DOCLING_FURNITURE = "docling_page_furniture"
+# Counter key for lines dropped by statistical repeated-line detection
+REPEATED_LINE = "repeated_line"
+
+# Documents with fewer pages are too short to tell furniture from content
+MIN_DETECTION_PAGES = 10
+
+# Furniture appears once or twice per page (header and footer); lines seen
+# more often per page are repeated content, e.g. templated paragraphs
+MAX_REPEATS_PER_PAGE = 2
+
+# Labels Docling assigns to page furniture; always dropped
+_FURNITURE_LABELS = frozenset({"page_footer", "page_header"})
+# Text elements checked against the rule set (everything else is kept)
+_TEXT_LABELS = frozenset({"text", "section_header"})
+
+
+@dataclass(frozen=True)
+class BoilerplateRule:
+    """A named pattern that must match a whole (stripped) line, case-insensitively."""
+
+    name: str
+    pattern: str
+
+
+class BoilerplateFilterError(Exception):
+    """Raised when a boilerplate rule set is unknown or invalid."""
+    pass
+
+
+_COMMON_RULES: Tuple[BoilerplateRule, ...] = (
+    BoilerplateRule("non_confidential", r"Non-Confidential\s*"),
+    BoilerplateRule("confidential", r"Confidential\s*"),
+    BoilerplateRule("page_number", r"\d+\s*"),
+)
+
+RULE_SETS: Dict[str, Tuple[BoilerplateRule, ...]] = {
+    "nse": _COMMON_RULES + (
+        BoilerplateRule("nse_cm_protocol_title", r"Capital Market Trading System.*Protocol.*"),
+        BoilerplateRule("nse_protocol_title", r"Trading System.*Protocol.*"),
+        BoilerplateRule("page_label", r"Page\s+\d+\s*"),
+    ),
+    "bse": _COMMON_RULES + (
+        BoilerplateRule("page_label", r"Page\s+\d+(?:\s+of\s+\d+)?\s*"),
+        BoilerplateRule("bse_classification", r"BSE\s*-\s*(?:Public|Internal|Confidential)\s*"),
+        BoilerplateRule("bse_company", r"BSE\s+(?:Ltd|Limited)\.?\s*"),
+        BoilerplateRule("bse_manual_title", r"BOLT\s*PLUS.*(?:Manual|Specification).*"),
+    ),
+    "mcx": _COMMON_RULES + (
+        BoilerplateRule("page_label", r"Page\s+\d+(?:\s+of\s+\d+)?\s*"),
+        BoilerplateRule("mcx_classification", r"MCX\s*-\s*(?:Public|Internal|Restricted)\s*"),
+        BoilerplateRule(
+            "mcx_company", r"Multi\s+Commodity\s+Exchange\s+of\s+India\s+(?:Ltd|Limited)\.?\s*"
+        ),
+        BoilerplateRule("mcx_api_title", r"MCX.*(?:API|Interface).*(?:Specification|Document).*"),
+    ),
+}
+
+DEFAULT_RULE_SET = "nse"
+
+
+def _compile(rules: Iterable[BoilerplateRule]) -> "re.Pattern[str]":
+    """Combine rules into one case-insensitive alternation of named groups."""
+    alternatives = []
+    for rule in rules:
+        try:
+            re.compile(rule.pattern)
+        except re.error as e:
+            raise BoilerplateFilterError(f"Invalid pattern for rule '{rule.name}': {e}") from e
+        alternatives.append(f"(?P<{rule.name}>{rule.pattern})")
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+
+def _normalize_line(text: str) -> str:
+    """Normalise a line for repeat counting: lower case, single spaces.
+
+    Digits are kept: numbered content ("3.2 Order Entry") must not collapse
+    into one line. Page numbers are matched by the rule sets instead.
+    """
+    return " ".join(text.lower().split())
+
+
+def element_lines(elements: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, str, int]]:
+    """
+    (label, text, page) of Docling element dicts, for ``detect_repeated_lines``.
+
+    Args:
+        elements: Docling elements (body order)
+
+    Yields:
+        Tuple of (label, text, page number); page is 0 without provenance
+    """
+    for element in elements:
+        prov = element.get("prov")
+        yield (
+            element.get("label", ""),
+            element.get("text", ""),
+            prov[0].get("page_no", 0) if prov else 0,
+        )
+
+
+def detect_repeated_lines(
+    lines: Iterable[Tuple[str, str, int]],
+    min_page_fraction: float,
+) -> FrozenSet[str]:
+    """
+    Find text lines that repeat on most pages of a document (one pass).
+
+    Lines are compared case- and whitespace-insensitively. A line is reported
+    when it appears on at least ``min_page_fraction`` of the document's pages,
+    unless it occurs more than MAX_REPEATS_PER_PAGE times per page on
+    average: page furniture is not repeated within a page.
+
+    Args:
+        lines: (label, text, page) per element, e.g. from ``element_lines``
+        min_page_fraction: Share of pages a line must appear on (0-1]
+
+    Returns:
+        Stripped texts of every variant of the repeated lines, as passed to
+        ``BoilerplateFilter.match``; empty for documents with fewer than
+        MIN_DETECTION_PAGES pages
+    """
+    pages: Set[int] = set()
+    # Raw text -> page of its first occurrence, and the pages of texts seen
+    # again. Containers are only allocated for repeats: allocating one per
+    # line would trigger garbage collection over the whole parsed document
+    first_page: Dict[str, int] = {}
+    text_pages: Dict[str, List[int]] = {}
+
+    for label, text, page in lines:
+        if not page:
+            continue
+        pages.add(page)
+        if label not in _TEXT_LABELS or not text:
+            continue
+        if text not in first_page:
+            first_page[text] = page
+        elif text in text_pages:
+            text_pages[text].append(page)
+        else:
+            text_pages[text] = [first_page[text], page]
+
+    if len(pages) < MIN_DETECTION_PAGES:
+        return frozenset()
+
+    # Merge variants of a line (case, spacing)
+    variants: Dict[str, List[str]] = {}
+    line_pages: Dict[str, List[int]] = {}
+    for text, seen_on in text_pages.items():
+        stripped = text.strip()
+        if not stripped:
+            continue
+        line = _normalize_line(stripped)
+        variants.setdefault(line, []).append(stripped)
+        line_pages.setdefault(line, []).extend(seen_on)
+
+    threshold = min_page_fraction * len(pages)
+    repeated = set()
+    for line, seen_on in line_pages.items():
+        distinct_pages = len(set(seen_on))
+        if distinct_pages >= threshold and len(seen_on) <= MAX_REPEATS_PER_PAGE * distinct_pages:
+            repeated.update(variants[line])
+    return frozenset(repeated)
+
+
+class BoilerplateFilter:
+    """Drops page furniture from a stream of Docling elements, counting hits per rule."""
+
+    _compiled: Dict[str, "re.Pattern[str]"] = {}
+
+    def __init__(
+        self,
+        rule_set: str = DEFAULT_RULE_SET,
+        repeated_lines: Iterable[str] = (),
+    ) -> None:
+        """
+        Initialize with a named rule set.
+
+        Args:
+            rule_set: Key of RULE_SETS
+            repeated_lines: Stripped lines detected as repeating on most
+                pages (see ``detect_repeated_lines``)
+
+        Raises:
+            BoilerplateFilterError: If the rule set is unknown
+        """
+        if rule_set not in RULE_SETS:
+            raise BoilerplateFilterError(
+                f"Unknown boilerplate rule set '{rule_set}' "
+                f"(available: {', '.join(sorted(RULE_SETS))})"
+            )
+
+        self.rule_set = rule_set
+        # Compile each rule set once per process
+        if rule_set not in self._compiled:
+            self._compiled[rule_set] = _compile(RULE_SETS[rule_set])
+        self._pattern = self._compiled[rule_set]
+        self.repeated_lines: FrozenSet[str] = frozenset(repeated_lines)
+        self.hits: Counter = Counter()
+
+    def detect_repeated(
+        self,
+        lines: Iterable[Tuple[str, str, int]],
+        min_page_fraction: float,
+    ) -> FrozenSet[str]:
+        """
+        Detect lines repeating on most pages and drop them from now on.
+
+        Args:
+            lines: (label, text, page) per element, e.g. from ``element_lines``
+            min_page_fraction: Share of pages a line must appear on; 0 disables
+
+        Returns:
+            The detected lines (stripped text)
+        """
+        if min_page_fraction > 0:
+            self.repeated_lines = detect_repeated_lines(lines, min_page_fraction)
+            if self.repeated_lines:
+                logger.info(
+                    f"Detected {len(self.repeated_lines)} repeated lines: "
+                    f"{sorted(self.repeated_lines)[:10]}"
+                )
+        return self.repeated_lines
+
+    def match(self, text: str) -> Optional[str]:
+        """
+        Classify a stripped line of text.
+
+        Args:
+            text: Line of text (already stripped)
+
+        Returns:
+            Name of the rule that matched (REPEATED_LINE for a detected
+            repeated line), or None if the line is content
+        """
+        match = self._pattern.fullmatch(text)
+        if match:
+            return match.lastgroup
+        if text in self.repeated_lines:
+            return REPEATED_LINE
+        return None
+
+    def filter(self, elements: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the elements that are not boilerplate, in order.
+
+        Docling page headers/footers and matching text lines are dropped and
+        counted; empty text elements are dropped without counting. Elements
+        with unknown labels are kept.
+
+        Args:
+            elements: Docling elements
+
+        Yields:
+            Content elements
+        """
+        hits = self.hits
+        for element in elements:
+            label = element.get("label", "")
+
+            if label in _FURNITURE_LABELS:
+                hits[DOCLING_FURNITURE] += 1
+                continue
+
+            if label in _TEXT_LABELS:
+                text = element.get("text", "").strip()
+                if not text:
+                    continue
+                rule = self.match(text)
+                if rule is not None:
+                    hits[rule] += 1
+                    continue
+
+            yield element
+
+    def stats(self) -> Dict[str, int]:
+        """Hit counts per rule (including Docling page furniture), most frequent first."""
+        return dict(self.hits.most_common())
@@ -0,0 +1,495 @@
+"""
+Headless bulk ingestion of a directory tree of Docling JSON files.
+
+Used for initial loads and disaster recovery, without the API server. Each
+file goes through the same pipeline as an upload:
+``DocumentProcessor.process_document_async``. Generation with
+``RichMarkdownGenerator`` runs in the ingestion process pool. Chapter files
+go through ``FileStorageService``. Chapter rows are written with bulk
+multi-row inserts in one transaction per version.
+
+Several documents are in flight at once, so every worker process stays busy
+while other files are written to disk and the database. The versions of one
+document are ingested one after another in version order: each activates
+its version and is the incremental-reuse base of the next, so the newest
+release ends up active. Files are never
+consumed: each one is hard-linked (or copied) into the upload directory
+first, because the processor removes its input when it succeeds.
+
+Progress is kept in a JSON state file that is rewritten atomically after
+each file. A rerun skips files that were recorded with the same size and
+modification time, so an interrupted load resumes where it stopped.
+
+Directory layouts:
+
+- ``<root>/<title>/<version>.json`` (default): the parent directory names the
+  document and the file names the version
+- ``<root>/**/<title>.json`` with a fixed ``version``: the file names the
+  document
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import Document
+from app.services.compressed_input import JSON_UPLOAD_EXTENSIONS
+from app.services.document_processor_v2 import UPLOAD_CHUNK_SIZE, DocumentProcessor
+from app.services.file_storage import FileStorageService
+from app.services.ingestion_progress import TimingProgress
+
+logger = logging.getLogger(__name__)
+
+# Bump when the state file layout changes
+STATE_FORMAT = 1
+
+
+class BulkIngestError(Exception):
+    """Raised when a bulk ingestion cannot start (bad directory or state file)."""
+    pass
+
+
+@dataclass
+class IngestFile:
+    """A source file with the document title and version it is ingested as."""
+
+    path: Path
+    title: str
+    version: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class IngestFileResult:
+    """Outcome of ingesting one file."""
+
+    path: Path
+    title: str
+    version: str
+    status: str  # completed, deduplicated, skipped or failed
+    size: int
+    chapters: int = 0
+    elapsed_seconds: float = 0.0
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    error_message: Optional[str] = None
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.size / 1e6 / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def chapters_per_second(self) -> float:
+        return self.chapters / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass
+class BulkIngestReport:
+    """Per-file results and totals of a bulk ingestion run."""
+
+    results: List[IngestFileResult]
+    elapsed_seconds: float
+
+    def count(self, status: str) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+    @property
+    def processed_bytes(self) -> int:
+        """Bytes of the files processed in this run (not skipped or deduplicated)."""
+        return sum(r.size for r in self.results if r.status in ("completed", "failed"))
+
+    @property
+    def chapters(self) -> int:
+        return sum(r.chapters for r in self.results if r.status == "completed")
+
+
+def _version_sort_key(version: str) -> Tuple:
+    """Sort key ordering versions naturally ("2.9" before "2.10")."""
+    return tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part.lower())
+        for part in re.split(r"(\d+)", version)
+        if part
+    )
+
+
+def _strip_extension(name: str) -> Optional[str]:
+    """File name without its Docling JSON extension, or None if it has none."""
+    lowered = name.lower()
+    for extension in sorted(JSON_UPLOAD_EXTENSIONS, key=len, reverse=True):
+        if lowered.endswith(extension):
+            return name[:-len(extension)]
+    return None
+
+
+def discover_files(root: Path, version: Optional[str] = None) -> List[IngestFile]:
+    """
+    Find Docling JSON files under ``root`` and name their document and version.
+
+    Args:
+        root: Directory to walk (hidden files and directories are ignored)
+        version: Version for every file; None takes the title from the parent
+            directory and the version from the file name
+
+    Returns:
+        IngestFile per file, sorted by path
+
+    Raises:
+        BulkIngestError: If ``root`` is not a directory, or a file sits
+            directly in ``root`` when the layout needs a title directory
+    """
+    if not root.is_dir():
+        raise BulkIngestError(f"Not a directory: {root}")
+
+    files = []
+    for path in sorted(root.rglob("*")):
+        relative = path.relative_to(root)
+        if any(part.startswith(".") for part in relative.parts) or not path.is_file():
+            continue
+        stem = _strip_extension(path.name)
+        if not stem:
+            continue
+
+        if version is not None:
+            title, file_version = stem, version
+        elif len(relative.parts) < 2:
+            raise BulkIngestError(
+                f"{relative} is not in a document directory; "
+                f"use <title>/<version>.json or pass a version"
+            )
+        else:
+            title, file_version = path.parent.name, stem
+
+        stat = path.stat()
+        files.append(IngestFile(
+            path=path,
+            title=title,
+            version=file_version,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        ))
+    return files
+
+
+class IngestState:
+    """Files already ingested, persisted as JSON and rewritten atomically."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Load the state file (a missing file means nothing is ingested yet).
+
+        Args:
+            path: State file
+
+        Raises:
+            BulkIngestError: If the file exists but cannot be read
+        """
+        self._path = path
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+
+        try:
+            with open(path, "rb") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            raise BulkIngestError(f"Cannot read state file {path}: {e}") from e
+
+        if not isinstance(payload, dict) or payload.get("format") != STATE_FORMAT:
+            raise BulkIngestError(f"{path} is not a bulk ingest state file")
+        self._files = payload.get("files", {})
+
+    def is_done(self, ingest_file: IngestFile) -> bool:
+        """Whether the file was ingested unchanged by an earlier run."""
+        entry = self._files.get(str(ingest_file.path.resolve()))
+        return (
+            entry is not None
+            and entry["size"] == ingest_file.size
+            and entry["mtime_ns"] == ingest_file.mtime_ns
+            and entry["version"] == ingest_file.version
+        )
+
+    async def mark_done(
+        self,
+        ingest_file: IngestFile,
+        sha256: str,
+        document_id: UUID,
+        result: IngestFileResult,
+    ) -> None:
+        """Record an ingested file and rewrite the state file."""
+        async with self._lock:
+            self._files[str(ingest_file.path.resolve())] = {
+                "size": ingest_file.size,
+                "mtime_ns": ingest_file.mtime_ns,
+                "sha256": sha256,
+                "document_id": str(document_id),
+                "version": ingest_file.version,
+                "status": result.status,
+                "chapters": result.chapters,
+            }
+            payload = {"format": STATE_FORMAT, "files": dict(self._files)}
+            await asyncio.to_thread(self._write, payload)
+
+    def _write(self, payload: Dict[str, Any]) -> None:
+        """Write the state to a temp file and rename it over the old one."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self._path.with_name(f".{self._path.name}.{uuid4().hex}.tmp")
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(temp_path, self._path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+
+def _hash_file(path: Path) -> str:
+    """SHA-256 of a file, streamed in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stage_input(source: Path, slug: str, version: str) -> Path:
+    """Hard-link (or copy, across filesystems) a source file into the upload directory."""
+    upload_dir = settings.upload_dir
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    stem = _strip_extension(source.name) or source.name
+    # Compressed files keep their suffix: they are decompressed while parsing
+    extension = source.name[len(stem):].lower()
+    target = upload_dir / f"{slug}-{version}-{uuid4().hex[:12]}{extension}"
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+    return target
+
+
+class BulkIngestService:
+    """Ingest a directory tree of Docling JSON files with bounded concurrency."""
+
+    def __init__(
+        self,
+        state: IngestState,
+        file_storage: Optional[FileStorageService] = None,
+    ) -> None:
+        """
+        Initialize service.
+
+        Args:
+            state: Resume state (updated as files complete)
+            file_storage: File storage service (defaults to standard location)
+        """
+        self._state = state
+        self._file_storage = file_storage or FileStorageService()
+
+    async def ingest(
+        self,
+        files: List[IngestFile],
+        concurrency: int,
+        on_result: Optional[Callable[[IngestFileResult], None]] = None,
+    ) -> BulkIngestReport:
+        """
+        Ingest files, skipping those the state file records as done.
+
+        Failures are reported in the results rather than raised; failed files
+        are not recorded, so a rerun retries them.
+
+        Args:
+            files: Files from ``discover_files``
+            concurrency: Files processed at once (each of a different document)
+            on_result: Called with each file's result as it finishes
+
+        Returns:
+            BulkIngestReport
+        """
+        started = time.perf_counter()
+        results: List[IngestFileResult] = []
+
+        def report(result: IngestFileResult) -> None:
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+        pending = []
+        for ingest_file in files:
+            if self._state.is_done(ingest_file):
+                report(self._result(ingest_file, "skipped"))
+            else:
+                pending.append(ingest_file)
+
+        pending, duplicates = self._split_duplicates(pending)
+        for ingest_file in duplicates:
+            report(self._result(
+                ingest_file,
+                "failed",
+                error_message=f"'{ingest_file.title}' version {ingest_file.version} "
+                              f"appears more than once",
+            ))
+
+        logger.info(
+            f"Bulk ingest: {len(pending)} files to process, {len(results)} skipped "
+            f"or rejected (concurrency {concurrency}, {settings.ingest_workers} workers)"
+        )
+        if pending:
+            documents = await self._get_or_create_documents(pending)
+            by_document: Dict[str, List[IngestFile]] = {}
+            for ingest_file in pending:
+                slug = DocumentProcessor._slugify(ingest_file.title)
+                by_document.setdefault(slug, []).append(ingest_file)
+            slots = asyncio.Semaphore(concurrency)
+
+            async def run(slug: str, document_files: List[IngestFile]) -> None:
+                # Versions of a document in order: the last one stays active
+                for ingest_file in sorted(
+                    document_files, key=lambda f: _version_sort_key(f.version)
+                ):
+                    async with slots:
+                        report(await self.ingest_one(ingest_file, documents[slug]))
+
+            await asyncio.gather(*(run(slug, fs) for slug, fs in by_document.items()))
+
+        return BulkIngestReport(
+            results=results,
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+
+    async def ingest_one(self, ingest_file: IngestFile, document: Document) -> IngestFileResult:
+        """
+        Ingest one file as a version of ``document``.
+
+        Args:
+            ingest_file: File to ingest
+            document: Its Document
+
+        Returns:
+            IngestFileResult (completed, deduplicated or failed)
+        """
+        started = time.perf_counter()
+        progress = TimingProgress()
+        staged: Optional[Path] = None
+
+        try:
+            sha256 = await asyncio.to_thread(_hash_file, ingest_file.path)
+
+            async with AsyncSessionLocal() as db:
+                processor = DocumentProcessor(db, self._file_storage)
+                existing = await processor.find_existing_version(
+                    document.id, ingest_file.version, sha256, "json"
+                )
+                if existing is not None:
+                    activated = await processor.activate_version(
+                        document.id, existing.version
+                    )
+                    await db.commit()
+                    if activated:
+                        await processor.write_active_version(activated, existing.version)
+
+            # The lookup session is closed first: processing opens its own,
+            # so a file in flight never holds two pooled connections
+            if existing is None:
+                staged = await asyncio.to_thread(
+                    _stage_input, ingest_file.path, document.slug, ingest_file.version
+                )
+                chapter_count = await processor.process_document_async(
+                    document.id,
+                    str(staged),
+                    ingest_file.version,
+                    "json",
+                    content_hash=sha256,
+                    progress=progress,
+                )
+
+            if existing is not None:
+                result = self._result(ingest_file, "deduplicated")
+            else:
+                result = self._result(
+                    ingest_file,
+                    "completed",
+                    chapters=chapter_count,
+                    elapsed_seconds=round(time.perf_counter() - started, 3),
+                    stage_timings=progress.timings,
+                )
+                logger.info(
+                    f"Ingested {ingest_file.path}: {chapter_count} chapters "
+                    f"in {result.elapsed_seconds}s"
+                )
+            await self._state.mark_done(ingest_file, sha256, document.id, result)
+            return result
+
+        except Exception as e:
+            # One bad file must not abort the whole load
+            logger.error(f"Bulk ingest failed for {ingest_file.path}: {e}", exc_info=True)
+            if staged is not None:
+                staged.unlink(missing_ok=True)
+            return self._result(
+                ingest_file,
+                "failed",
+                elapsed_seconds=round(time.perf_counter() - started, 3),
+                stage_timings=progress.timings,
+                error_message=str(e),
+            )
+
+    def _split_duplicates(
+        self,
+        files: List[IngestFile],
+    ) -> Tuple[List[IngestFile], List[IngestFile]]:
+        """Split off files naming a (document, version) already taken by an earlier file."""
+        seen = set()
+        unique, duplicates = [], []
+        for ingest_file in files:
+            key = (DocumentProcessor._slugify(ingest_file.title), ingest_file.version)
+            (duplicates if key in seen else unique).append(ingest_file)
+            seen.add(key)
+        return unique, duplicates
+
+    async def _get_or_create_documents(self, files: List[IngestFile]) -> Dict[str, Document]:
+        """
+        Load or create every document named by ``files`` in one transaction.
+
+        Creating them up front keeps concurrent files of one document from
+        racing to insert the same slug.
+        """
+        by_slug = {DocumentProcessor._slugify(f.title): f.title for f in files}
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Document).where(Document.slug.in_(by_slug))
+            )
+            documents = {doc.slug: doc for doc in result.scalars()}
+
+            for slug, title in by_slug.items():
+                if slug not in documents:
+                    documents[slug] = Document(
+                        slug=slug,
+                        title=title,
+                        active_version=None,  # Set when a version completes
+                        storage_path=slug,
+                    )
+                    db.add(documents[slug])
+            await db.commit()
+        return documents
+
+    def _result(self, ingest_file: IngestFile, status: str, **kwargs: Any) -> IngestFileResult:
+        """Result for a file with the given status."""
+        return IngestFileResult(
+            path=ingest_file.path,
+            title=ingest_file.title,
+            version=ingest_file.version,
+            status=status,
+            size=ingest_file.size,
+            **kwargs,
+        )
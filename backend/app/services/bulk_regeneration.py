@@ -0,0 +1,173 @@
+"""
+Bulk regeneration of stored document versions.
+
+After a generator change every stored version has to be rebuilt. This
+service walks the DocumentVersion rows, regenerates each version from its
+element cache with bounded concurrency and reports throughput and failures.
+
+Each version is regenerated in its own session: chapter files are replaced
+atomically and its chapter rows (with their tsvectors) are swapped in a
+single transaction, so every version stays readable while the run
+progresses. CPU-bound generation runs in the ingestion process pool.
+"""
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import Document, DocumentVersion
+from app.schemas.admin import BulkRegenerationReport, RegenerationResult
+from app.services.document_processor_v2 import DocumentProcessingError, DocumentProcessor
+from app.services.file_storage import FileStorageError, FileStorageService
+from app.services.ingestion_progress import TimingProgress
+
+logger = logging.getLogger(__name__)
+
+
+class BulkRegenerationService:
+    """Regenerate stored versions from their element caches."""
+
+    def __init__(self, file_storage: Optional[FileStorageService] = None) -> None:
+        """
+        Initialize service.
+
+        Args:
+            file_storage: File storage service (defaults to standard location)
+        """
+        self._file_storage = file_storage or FileStorageService()
+
+    async def regenerate_one(self, document_id: UUID, version: str) -> RegenerationResult:
+        """
+        Regenerate one version in a session of its own.
+
+        Failures are reported in the result rather than raised.
+
+        Args:
+            document_id: Document ID
+            version: Version string
+
+        Returns:
+            RegenerationResult
+        """
+        progress = TimingProgress()
+        async with AsyncSessionLocal() as db:
+            try:
+                processor = DocumentProcessor(db, self._file_storage)
+                chapter_count = await processor.regenerate_version(
+                    document_id, version, progress
+                )
+            except Exception as e:
+                # One bad version must not abort the whole run
+                try:
+                    await db.rollback()
+                except Exception:
+                    pass
+                expected = isinstance(e, (DocumentProcessingError, FileStorageError))
+                logger.error(
+                    f"Regeneration failed for {document_id}/{version}: {e}",
+                    exc_info=not expected,
+                )
+                return RegenerationResult(
+                    document_id=document_id,
+                    version=version,
+                    status="failed",
+                    error_message=str(e),
+                    stage_timings=progress.timings,
+                )
+
+        return RegenerationResult(
+            document_id=document_id,
+            version=version,
+            status="completed",
+            chapter_count=chapter_count,
+            stage_timings=progress.timings,
+        )
+
+    async def regenerate_all(
+        self,
+        document_id: Optional[UUID] = None,
+        concurrency: Optional[int] = None,
+    ) -> BulkRegenerationReport:
+        """
+        Regenerate every stored version that has an element cache.
+
+        Args:
+            document_id: Limit to one document's versions
+            concurrency: Versions regenerated at once
+                (defaults to ``settings.regeneration_concurrency``)
+
+        Returns:
+            BulkRegenerationReport with per-version results and throughput
+        """
+        concurrency = concurrency or settings.regeneration_concurrency
+        versions, skipped = await self._cached_versions(document_id)
+        logger.info(
+            f"Regenerating {len(versions)} versions "
+            f"({skipped} without element cache skipped, concurrency {concurrency})"
+        )
+
+        slots = asyncio.Semaphore(concurrency)
+
+        async def run(doc_id: UUID, version: str) -> RegenerationResult:
+            async with slots:
+                return await self.regenerate_one(doc_id, version)
+
+        started = time.perf_counter()
+        results = list(await asyncio.gather(*(run(*v) for v in versions)))
+        elapsed = time.perf_counter() - started
+
+        completed = [r for r in results if r.status == "completed"]
+        chapters = sum(r.chapter_count or 0 for r in completed)
+        report = BulkRegenerationReport(
+            results=results,
+            total=len(results),
+            completed=len(completed),
+            failed=len(results) - len(completed),
+            skipped=skipped,
+            chapters=chapters,
+            elapsed_seconds=round(elapsed, 3),
+            versions_per_second=round(len(results) / elapsed, 3) if elapsed else 0.0,
+            chapters_per_second=round(chapters / elapsed, 3) if elapsed else 0.0,
+        )
+        logger.info(
+            f"Regenerated {report.completed}/{report.total} versions "
+            f"({report.failed} failed) in {report.elapsed_seconds}s: "
+            f"{report.versions_per_second} versions/s, "
+            f"{report.chapters_per_second} chapters/s"
+        )
+        return report
+
+    async def _cached_versions(
+        self,
+        document_id: Optional[UUID],
+    ) -> Tuple[List[Tuple[UUID, str]], int]:
+        """
+        List (document_id, version) pairs that have an element cache.
+
+        Returns:
+            Tuple of (versions to regenerate, number skipped for lack of a cache)
+        """
+        query = (
+            select(Document.id, Document.slug, DocumentVersion.version)
+            .join(DocumentVersion, DocumentVersion.document_id == Document.id)
+            .order_by(Document.slug, DocumentVersion.upload_date)
+        )
+        if document_id is not None:
+            query = query.where(Document.id == document_id)
+
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(query)).all()
+
+        versions = []
+        for doc_id, slug, version in rows:
+            if self._file_storage.element_cache_path(slug, version).exists():
+                versions.append((doc_id, version))
+            else:
+                logger.info(f"Skipping {slug}/{version}: no element cache")
+
+        return versions, len(rows) - len(versions)
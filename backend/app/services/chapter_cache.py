@@ -0,0 +1,141 @@
+"""In-memory LRU cache of chapter content.
+
+The same few chapters are opened thousands of times a day; without a cache
+every ``get_section`` reads and re-parses the chapter file. Entries are
+keyed by the chapter's absolute path and validated against the file's
+(mtime_ns, size, inode) on every lookup, so chapters rewritten by
+ingestion (atomic rename: new inode) or edited out of band are never served
+stale. A hit costs one ``stat``.
+
+The cache is bounded by the bytes of chapter content it holds
+(``settings.chapter_cache_bytes``) and shared by all FileStorageService
+instances of the process, since the API creates one per request.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+# (mtime_ns, size, inode) of the file an entry was read from
+FileIdentity = Tuple[int, int, int]
+
+
+def stat_identity(stat: os.stat_result) -> FileIdentity:
+    """Identity used to validate a cache entry."""
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+@dataclass
+class _Entry:
+    identity: FileIdentity
+    content: str
+    size: int
+
+
+class ChapterCache:
+    """Thread-safe LRU of chapter content bounded by total bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Memory budget for cached content; 0 disables caching
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, identity: FileIdentity) -> Optional[str]:
+        """
+        Look up content read from a file with the given identity.
+
+        A cached entry for another identity (the file changed) is dropped.
+
+        Args:
+            key: Absolute chapter path
+            identity: Current identity of the file
+
+        Returns:
+            Cached content, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.identity == identity:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.content
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, identity: FileIdentity, content: str, size: int) -> None:
+        """
+        Cache content, evicting least recently used entries to stay in budget.
+
+        Content larger than the whole budget is not cached.
+
+        Args:
+            key: Absolute chapter path
+            identity: Identity of the file the content was read from
+            content: Content to cache
+            size: Bytes charged against the budget (the file size)
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(identity, content, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Drop the entry for a path, if any."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+
+_chapter_cache: Optional[ChapterCache] = None
+
+
+def get_chapter_cache() -> ChapterCache:
+    """Process-wide chapter cache, sized from settings on first use."""
+    global _chapter_cache
+    if _chapter_cache is None:
+        _chapter_cache = ChapterCache(settings.chapter_cache_bytes)
+    return _chapter_cache
@@ -0,0 +1,207 @@
+"""Split oversized chapters into parts at level-2 headings.
+
+Message-structure and error-code chapters render to several MB of markdown,
+too much to load into the editor at once. Chapters above
+``settings.chapter_split_threshold`` are therefore also stored as part files,
+next to the chapter file, with a manifest:
+
+    chapters/chapter-05-....md            full chapter (source of truth)
+    chapters/chapter-05-....parts/
+        manifest.json                     part list with anchors and sizes
+        000-<hash>.part                   text before the first "## " heading
+        001-<hash>.part                   one part per "## " section
+
+Part files are not ``*.md``, so wikilink resolution, backlinks and the
+linkable-document list never see them.
+
+Clients load the manifest (the chapter skeleton) and fetch parts by anchor.
+Part files are named by content hash: rewriting a chapter only writes parts
+that changed, and a part file never changes under a reader holding an older
+manifest (it can only disappear, after which the manifest is reloaded). The
+manifest records the chapter file's identity (inode, size, mtime). Parts are
+written by FileStorageService whenever it places a chapter file (saved,
+updated, reused by hardlink from another version, cloned with a draft);
+readers never write them. A chapter whose manifest no longer matches (e.g.
+edited outside the service) is served whole until it is written again.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+# Bump when the manifest layout changes; older manifests are ignored
+PARTS_FORMAT = 1
+
+MANIFEST_FILENAME = "manifest.json"
+
+# Anchor of the text before the first level-2 heading
+INTRO_ANCHOR = "intro"
+
+_FENCE = re.compile(r"^\s{0,3}(```|~~~)")
+
+
+@dataclass
+class ChapterPart:
+    """A contiguous slice of a chapter starting at a level-2 heading (or the intro)."""
+
+    index: int
+    anchor: str
+    title: str
+    content: str
+
+
+def heading_anchor(text: str) -> str:
+    """Anchor for a heading (same slugs as the chapter outline)."""
+    slug = text.lower()
+    slug = re.sub(r'[\s_]+', '-', slug)
+    slug = re.sub(r'[^a-z0-9-]', '', slug)
+    slug = re.sub(r'-+', '-', slug)
+    return slug.strip('-')
+
+
+def split_chapter(content: str) -> List[ChapterPart]:
+    """
+    Split chapter markdown before every level-2 heading outside code fences.
+
+    Joining the parts' content in order gives back ``content`` exactly.
+    Duplicate anchors get a numeric suffix ("-2", "-3"...).
+
+    Args:
+        content: Chapter markdown (frontmatter already stripped)
+
+    Returns:
+        Parts in order; the intro part is omitted when it is blank
+    """
+    parts: List[ChapterPart] = []
+    seen: Dict[str, int] = {}
+    title, anchor = "", INTRO_ANCHOR
+    lines: List[str] = []
+    in_fence = False
+
+    def close() -> None:
+        text = "".join(lines)
+        if parts or text.strip():
+            parts.append(ChapterPart(len(parts), anchor, title, text))
+
+    for line in content.splitlines(keepends=True):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith("## "):
+            close()
+            title = line[3:].strip()
+            base = heading_anchor(title) or "section"
+            seen[base] = seen.get(base, 0) + 1
+            anchor = base if seen[base] == 1 else f"{base}-{seen[base]}"
+            lines = []
+        lines.append(line)
+
+    close()
+    return parts
+
+
+def parts_dir(chapter_path: Path) -> Path:
+    """Directory holding a chapter's part files."""
+    return chapter_path.with_suffix(".parts")
+
+
+def file_identity(path: Path) -> Dict[str, int]:
+    """Identity of a chapter file recorded in its manifest."""
+    stat = path.stat()
+    return {"inode": stat.st_ino, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_parts(chapter_path: Path, parts: List[ChapterPart]) -> Dict[str, Any]:
+    """
+    Write part files and then the manifest; drop part files no longer listed.
+
+    Args:
+        chapter_path: Chapter file the parts were split from (already written)
+        parts: Parts from ``split_chapter``
+
+    Returns:
+        The manifest
+    """
+    directory = parts_dir(chapter_path)
+    directory.mkdir(exist_ok=True)
+
+    entries = []
+    for part in parts:
+        data = part.content.encode("utf-8")
+        filename = f"{part.index:03d}-{hashlib.sha256(data).hexdigest()[:16]}.part"
+        target = directory / filename
+        if not target.exists():
+            _atomic_write_bytes(target, data)
+        entries.append({
+            "index": part.index,
+            "anchor": part.anchor,
+            "title": part.title,
+            "file": filename,
+            "size": len(data),
+        })
+
+    manifest = {
+        "format": PARTS_FORMAT,
+        "chapter": file_identity(chapter_path),
+        "size": sum(entry["size"] for entry in entries),
+        "parts": entries,
+    }
+    _atomic_write_bytes(
+        directory / MANIFEST_FILENAME,
+        json.dumps(manifest, ensure_ascii=False).encode("utf-8"),
+    )
+
+    listed = {entry["file"] for entry in entries} | {MANIFEST_FILENAME}
+    for path in directory.iterdir():
+        if path.name not in listed and not path.name.startswith("."):
+            path.unlink(missing_ok=True)
+    return manifest
+
+
+def read_manifest(chapter_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load a chapter's manifest if it still describes the chapter file.
+
+    Returns:
+        The manifest, or None if it is missing, unreadable, of another
+        format or stale
+    """
+    try:
+        with open(parts_dir(chapter_path) / MANIFEST_FILENAME, "rb") as f:
+            manifest = json.load(f)
+        identity = file_identity(chapter_path)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("format") != PARTS_FORMAT
+        or manifest.get("chapter") != identity
+    ):
+        return None
+    return manifest
+
+
+def remove_parts(chapter_path: Path) -> None:
+    """Delete a chapter's parts (the chapter is no longer split)."""
+    directory = parts_dir(chapter_path)
+    if not directory.is_dir():
+        return
+    for path in directory.iterdir():
+        path.unlink(missing_ok=True)
+    directory.rmdir()
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write a file under a temp name and rename it into place."""
+    temp = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        temp.write_bytes(data)
+        os.replace(temp, path)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from app.services.chapter_parts import heading_anchor
 from app.services.wikilink_service import WikiLinkService, Backlink
 from app.services.file_storage import FileStorageService, FileStorageError
 
@@ -123,6 +124,19 @@ class ChapterRenderService:
         except Exception as e:
             raise ChapterRenderError(f"Failed to render chapter: {e}") from e
 
+    def resolve_links(self, content: str, doc_path: str) -> str:
+        """
+        Resolve [[wikilinks]] in a piece of chapter markdown (e.g. one part).
+
+        Args:
+            content: Markdown content
+            doc_path: Document version base path
+
+        Returns:
+            Content with wikilinks converted to markdown links
+        """
+        return self._resolve_wikilinks_to_urls(content, doc_path)
+
     def _resolve_wikilinks_to_urls(self, content: str, base_path: str) -> str:
         """
         Convert [[wikilinks]] to markdown [links](urls).
@@ -264,17 +278,7 @@ class ChapterRenderService:
         Returns:
             Slugified anchor string
         """
-        # Convert to lowercase
-        slug = text.lower()
-        # Replace spaces with hyphens
-        slug = re.sub(r'[\s_]+', '-', slug)
-        # Remove non-alphanumeric characters (keep hyphens)
-        slug = re.sub(r'[^a-z0-9-]', '', slug)
-        # Remove duplicate hyphens
-        slug = re.sub(r'-+', '-', slug)
-        # Strip leading/trailing hyphens
-        slug = slug.strip('-')
-        return slug
+        return heading_anchor(text)
 
     def _backlink_to_dict(self, backlink: Backlink) -> Dict:
         """Convert Backlink dataclass to dictionary."""
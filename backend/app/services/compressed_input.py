@@ -0,0 +1,113 @@
+"""Streaming decompression of compressed Docling JSON uploads.
+
+Docling JSON compresses roughly 15:1, so ``.json.gz`` and ``.json.zst``
+uploads are accepted and kept compressed on disk. At ingestion they are
+decompressed chunk by chunk straight into the incremental JSON parser; the
+inflated document never exists as a file or as one buffer in memory.
+
+gzip support is built in; zstd needs the optional ``zstandard`` package.
+Decompressed output is capped (``settings.max_decompressed_upload_size``) so a
+small upload cannot inflate without bound.
+"""
+
+import gzip
+import io
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+ZSTD_AVAILABLE = zstandard is not None
+
+# Upload suffix -> compression
+_COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+# Accepted extensions for Docling JSON uploads
+JSON_UPLOAD_EXTENSIONS: List[str] = [".json", ".json.gz"] + (
+    [".json.zst"] if ZSTD_AVAILABLE else []
+)
+
+_ERRORS = (OSError, EOFError) + ((zstandard.ZstdError,) if ZSTD_AVAILABLE else ())
+
+
+class CompressedInputError(ValueError):
+    """Raised when a compressed upload is corrupt, unsupported or inflates too far."""
+    pass
+
+
+def compression_of(filename: str) -> Optional[str]:
+    """
+    Compression of a file, from its name.
+
+    Args:
+        filename: File name or path
+
+    Returns:
+        "gzip", "zstd", or None for an uncompressed file
+    """
+    return _COMPRESSIONS.get(Path(filename).suffix.lower())
+
+
+class _DecompressingReader(io.RawIOBase):
+    """Binary reader over a decompression stream that enforces a size cap."""
+
+    def __init__(self, stream: BinaryIO, name: str, max_size: int) -> None:
+        self._stream = stream
+        self._name = name
+        self._max_size = max_size
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:
+        try:
+            data = self._stream.read(len(buffer))
+        except _ERRORS as e:
+            raise CompressedInputError(f"Cannot decompress {self._name}: {e}") from e
+
+        self.bytes_read += len(data)
+        if self.bytes_read > self._max_size:
+            raise CompressedInputError(
+                f"{self._name} inflates beyond the {self._max_size} byte limit"
+            )
+        buffer[:len(data)] = data
+        return len(data)
+
+
+@contextmanager
+def open_docling_input(path: Path, max_decompressed_size: int) -> Iterator[BinaryIO]:
+    """
+    Open a Docling JSON upload for streaming, decompressing it if needed.
+
+    Args:
+        path: Upload on disk (.json, .json.gz or .json.zst)
+        max_decompressed_size: Cap on decompressed bytes for compressed uploads
+
+    Yields:
+        Binary stream of the JSON document
+
+    Raises:
+        CompressedInputError: If the compression is unsupported; corrupt or
+            oversized input raises it while reading
+    """
+    compression = compression_of(path.name)
+    if compression == "zstd" and not ZSTD_AVAILABLE:
+        raise CompressedInputError(f"{path.name}: zstd uploads require the zstandard package")
+
+    with open(path, "rb") as raw:
+        if compression is None:
+            yield raw
+            return
+
+        if compression == "gzip":
+            stream = gzip.GzipFile(fileobj=raw, mode="rb")
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+
+        with stream:
+            yield _DecompressingReader(stream, path.name, max_decompressed_size)
@@ -0,0 +1,424 @@
+"""Streaming ingestion for large Docling JSON documents.
+
+The regular path (``generate_rich_markdown_from_json``) loads the whole
+Docling JSON and then builds lookup tables for every element. For very large
+exchange specifications that costs several times the file size in memory.
+
+This module provides a streaming alternative:
+- The upload is read once with an incremental JSON parser (ijson)
+- Every text/table/picture/group element is spilled to an on-disk SQLite index
+  keyed by its ``self_ref``; only the ordered ``body.children`` refs stay in memory
+- ``$ref``s are resolved lazily from the index, one chapter slice at a time
+- Chapters are emitted as soon as each chapter boundary closes
+
+Peak memory is therefore bounded by the largest chapter, not the whole document.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+from collections import deque
+from concurrent.futures import Executor, Future
+from pathlib import Path
+from typing import Any, BinaryIO, Deque, Dict, Iterator, List, Optional, Tuple
+
+import ijson
+
+from app.core.config import settings
+from app.services.boilerplate_filter import DEFAULT_RULE_SET, BoilerplateFilter
+from app.services.compressed_input import open_docling_input
+from app.services.rich_markdown_generator import (
+    ChapterMarkdown,
+    ChapterSlice,
+    RichMarkdownGenerator,
+    render_chapter_slice,
+)
+
+logger = logging.getLogger(__name__)
+
+# Top-level Docling collections whose items are addressable via $ref
+_ELEMENT_PREFIXES = {
+    "texts.item",
+    "tables.item",
+    "pictures.item",
+    "groups.item",
+}
+_BODY_REF_PREFIX = "body.children.item.$ref"
+
+# SQLite limits the number of host parameters per statement
+_LOOKUP_BATCH_SIZE = 500
+_INSERT_BATCH_SIZE = 500
+
+
+class DoclingStreamError(Exception):
+    """Raised when a Docling JSON stream cannot be indexed."""
+    pass
+
+
+class DoclingSpillIndex:
+    """
+    On-disk index of Docling elements keyed by ``self_ref``.
+
+    Built in a single pass over the JSON stream. Besides the serialized
+    element, the label, level, text and page number are stored as columns so
+    chapter detection can run as a query without loading elements.
+    """
+
+    def __init__(self, spill_dir: Optional[Path] = None) -> None:
+        """
+        Create an empty spill index.
+
+        Args:
+            spill_dir: Directory for the temporary index file (defaults to system temp)
+        """
+        if spill_dir is not None:
+            spill_dir.mkdir(parents=True, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="docling-spill-", suffix=".sqlite", dir=spill_dir)
+        os.close(fd)
+
+        self._path = Path(path)
+        self._conn = sqlite3.connect(path)
+        # The index is a throwaway scratch file: no journal, no fsync
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            """
+            CREATE TABLE elements (
+                ref TEXT PRIMARY KEY,
+                label TEXT,
+                level INTEGER,
+                text TEXT,
+                page_no INTEGER,
+                body TEXT NOT NULL
+            )
+            """
+        )
+
+        self.name: Optional[str] = None
+        self.body_refs: List[str] = []
+
+    @classmethod
+    def build(
+        cls,
+        stream: BinaryIO,
+        spill_dir: Optional[Path] = None,
+    ) -> "DoclingSpillIndex":
+        """
+        Build an index from a binary Docling JSON stream.
+
+        Args:
+            stream: Binary file object positioned at the start of the JSON
+            spill_dir: Directory for the temporary index file
+
+        Returns:
+            Populated DoclingSpillIndex (caller must close it)
+
+        Raises:
+            DoclingStreamError: If the stream is not valid Docling JSON
+        """
+        index = cls(spill_dir)
+        try:
+            index._load(stream)
+        except (ijson.JSONError, ValueError, sqlite3.Error) as e:
+            index.close()
+            raise DoclingStreamError(f"Failed to index Docling JSON: {e}") from e
+        except BaseException:
+            index.close()
+            raise
+        return index
+
+    def _load(self, stream: BinaryIO) -> None:
+        """Single pass over the JSON events, spilling elements to disk."""
+        events = ijson.parse(stream, use_float=True)
+        batch = []
+        element_count = 0
+
+        for prefix, event, value in events:
+            if event == "start_map" and prefix in _ELEMENT_PREFIXES:
+                element = self._build_object(events, prefix)
+                batch.append(self._to_row(element))
+                element_count += 1
+                if len(batch) >= _INSERT_BATCH_SIZE:
+                    self._insert(batch)
+                    batch = []
+            elif prefix == _BODY_REF_PREFIX and event == "string":
+                self.body_refs.append(value)
+            elif prefix == "name" and event == "string":
+                self.name = value
+
+        if batch:
+            self._insert(batch)
+        self._conn.commit()
+
+        logger.info(
+            f"Indexed {element_count} Docling elements "
+            f"({len(self.body_refs)} body children) in {self._path}"
+        )
+
+    def _build_object(self, events: Iterator, prefix: str) -> Dict[str, Any]:
+        """Assemble one element from the event stream (start_map already consumed)."""
+        builder = ijson.ObjectBuilder()
+        builder.event("start_map", None)
+        for event_prefix, event, value in events:
+            builder.event(event, value)
+            if event == "end_map" and event_prefix == prefix:
+                break
+        return builder.value
+
+    def _to_row(self, element: Dict[str, Any]) -> tuple:
+        """Convert an element to an index row."""
+        prov = element.get("prov") or []
+        page_no = prov[0].get("page_no", 0) if prov else 0
+        level = element.get("level")
+        return (
+            element.get("self_ref"),
+            element.get("label"),
+            level if isinstance(level, int) else None,
+            element.get("text"),
+            page_no,
+            json.dumps(element, separators=(",", ":"), ensure_ascii=False),
+        )
+
+    def _insert(self, rows: List[tuple]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO elements VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+
+    def get(self, ref: str) -> Optional[Dict[str, Any]]:
+        """Resolve a single $ref (None if unknown)."""
+        row = self._conn.execute(
+            "SELECT body FROM elements WHERE ref = ?", (ref,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, refs: List[str]) -> List[Dict[str, Any]]:
+        """
+        Resolve refs in order, dropping unknown refs.
+
+        Args:
+            refs: Element refs to resolve
+
+        Returns:
+            Resolved elements in the same order as ``refs``
+        """
+        found: Dict[str, str] = {}
+        for start in range(0, len(refs), _LOOKUP_BATCH_SIZE):
+            chunk = refs[start:start + _LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT ref, body FROM elements WHERE ref IN ({placeholders})", chunk
+            )
+            found.update(rows)
+        return [json.loads(found[ref]) for ref in refs if ref in found]
+
+    def iter_body_elements(self) -> Iterator[Dict[str, Any]]:
+        """Resolve every body element in order, one lookup batch at a time."""
+        for start in range(0, len(self.body_refs), _LOOKUP_BATCH_SIZE):
+            yield from self.get_many(self.body_refs[start:start + _LOOKUP_BATCH_SIZE])
+
+    def iter_body_lines(self) -> Iterator[Tuple[str, str, int]]:
+        """
+        (label, text, page) of every body element, for repeated-line detection.
+
+        Reads the index columns only (no element is decoded); the order is
+        not the body order.
+        """
+        body_refs = set(self.body_refs)
+        rows = self._conn.execute(
+            "SELECT ref, COALESCE(label, ''), COALESCE(text, ''), page_no FROM elements"
+        )
+        for ref, label, text, page_no in rows:
+            if ref in body_refs:
+                yield label, text, page_no
+
+    def level_one_headers(self) -> Dict[str, str]:
+        """Map of ref -> text for every level 1 section header."""
+        rows = self._conn.execute(
+            "SELECT ref, COALESCE(text, '') FROM elements "
+            "WHERE label = 'section_header' AND level = 1"
+        )
+        return dict(rows)
+
+    def close(self) -> None:
+        """Close the index and delete its spill file."""
+        try:
+            self._conn.close()
+        finally:
+            self._path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "DoclingSpillIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class StreamingMarkdownGenerator(RichMarkdownGenerator):
+    """
+    RichMarkdownGenerator backed by a DoclingSpillIndex.
+
+    Produces the same chapters as the in-memory generator, but only one
+    chapter's elements are resolved at a time.
+    """
+
+    def __init__(
+        self,
+        index: DoclingSpillIndex,
+        boilerplate: Optional[BoilerplateFilter] = None,
+    ):
+        """Initialize with a populated spill index and an optional boilerplate filter."""
+        # Deliberately skip RichMarkdownGenerator.__init__: no lookup tables
+        self._index = index
+        self.boilerplate = boilerplate or BoilerplateFilter()
+        self.json_data = {"name": index.name}
+        self.body_elements: List[Dict[str, Any]] = []
+
+    def _resolve_ref(self, ref: str) -> Optional[Dict[str, Any]]:
+        """Resolve a $ref lazily from the spill index."""
+        if not ref:
+            return None
+        return self._index.get(ref)
+
+    def iter_chapters(
+        self,
+        executor: Optional[Executor] = None,
+        window: int = 4,
+    ) -> Iterator[ChapterMarkdown]:
+        """
+        Yield chapters in document order as each chapter boundary closes.
+
+        Chapter boundaries and anchors are derived from the level 1 headers
+        in the index, so cross-references can be linked before later chapters
+        are rendered.
+
+        Args:
+            executor: Optional process pool to render chapters in parallel
+            window: Chapters in flight at once when using ``executor``
+                (bounds how many chapter slices are held in memory)
+        """
+        logger.info("Starting streaming chapter generation from Docling index")
+
+        boundaries = self._detect_streaming_boundaries()
+        if not boundaries:
+            logger.warning("No chapters found, creating single chapter from frontmatter")
+            self.body_elements = self._index.get_many(self._index.body_refs)
+            yield self._create_frontmatter_chapter()
+            return
+
+        logger.info(f"Detected {len(boundaries)} chapters")
+
+        chapter_map = {
+            boundary["chapter_number"]: self._generate_anchor_id(boundary["title"])
+            for boundary in boundaries
+            if boundary["chapter_number"] > 0
+        }
+
+        if executor is None:
+            for i, boundary in enumerate(boundaries):
+                chapter_md = self._generate_chapter_markdown(self._load_chapter(boundary), i)
+                yield self._link_chapter_references(chapter_md, chapter_map)
+            return
+
+        pending: Deque[Future] = deque()
+        for i, boundary in enumerate(boundaries):
+            chapter_slice = self._chapter_slice(self._load_chapter(boundary), i)
+            pending.append(executor.submit(render_chapter_slice, chapter_slice))
+            if len(pending) >= window:
+                yield self._collect(pending.popleft(), chapter_map)
+        while pending:
+            yield self._collect(pending.popleft(), chapter_map)
+
+    def _load_chapter(self, boundary: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve a boundary's elements from the index."""
+        refs = self._index.body_refs[boundary["start_index"]:boundary["end_index"]]
+        elements = self._index.get_many(refs)
+        return dict(boundary, elements=elements, header_element=elements[0])
+
+    def _chapter_slice(self, chapter_info: Dict[str, Any], index: int) -> ChapterSlice:
+        """Package a chapter for a worker, resolving group children in one batch."""
+        child_refs = [
+            child_ref.get("$ref")
+            for element in chapter_info["elements"]
+            for child_ref in element.get("children", [])
+        ]
+        refs = {
+            element["self_ref"]: element
+            for element in self._index.get_many([ref for ref in child_refs if ref])
+        }
+        return ChapterSlice(
+            chapter_number=chapter_info["chapter_number"],
+            title=chapter_info["title"],
+            index=index,
+            elements=chapter_info["elements"],
+            refs=refs,
+            rule_set=self.boilerplate.rule_set,
+            repeated_lines=self.boilerplate.repeated_lines,
+        )
+
+    def _collect(self, future: Future, chapter_map: Dict[int, str]) -> ChapterMarkdown:
+        """Wait for a rendered chapter, record its boilerplate hits and link it."""
+        chapter_md, hits = future.result()
+        self.boilerplate.hits.update(hits)
+        return self._link_chapter_references(chapter_md, chapter_map)
+
+    def _detect_streaming_boundaries(self) -> List[Dict[str, Any]]:
+        """Find 'Chapter X' level 1 headings using the index (refs only)."""
+        headers = self._index.level_one_headers()
+        chapter_pattern = re.compile(r'^Chapter\s+(\d+)', re.IGNORECASE)
+        body_refs = self._index.body_refs
+
+        boundaries: List[Dict[str, Any]] = []
+        for i, ref in enumerate(body_refs):
+            text = headers.get(ref)
+            if text is None:
+                continue
+            match = chapter_pattern.match(text)
+            if not match:
+                continue
+
+            if boundaries:
+                boundaries[-1]["end_index"] = i
+            boundaries.append({
+                "chapter_number": int(match.group(1)),
+                "title": text,
+                "start_index": i,
+                "end_index": len(body_refs),
+            })
+
+        return boundaries
+
+
+def generate_rich_markdown_streaming(
+    file_path: Path,
+    spill_dir: Optional[Path] = None,
+    rule_set: str = DEFAULT_RULE_SET,
+) -> Iterator[ChapterMarkdown]:
+    """
+    Streaming entry point: generate chapters from a Docling JSON file.
+
+    Args:
+        file_path: Path to the Docling JSON file (optionally .gz/.zst compressed)
+        spill_dir: Directory for the temporary element index
+        rule_set: Boilerplate rule set (see boilerplate_filter.RULE_SETS)
+
+    Yields:
+        ChapterMarkdown objects in document order
+
+    Raises:
+        DoclingStreamError: If the file is not valid Docling JSON
+    """
+    with open_docling_input(file_path, settings.max_decompressed_upload_size) as f:
+        index = DoclingSpillIndex.build(f, spill_dir)
+
+    with index:
+        generator = StreamingMarkdownGenerator(index, BoilerplateFilter(rule_set))
+        for ch in generator.iter_chapters():
+            logger.info(
+                f"  Chapter {ch.chapter_number}: '{ch.title}' "
+                f"(pages {ch.page_range[0]}-{ch.page_range[1]}, "
+                f"{len(ch.markdown_content)} chars markdown)"
+            )
+            yield ch
@@ -0,0 +1,365 @@
+"""Typed decoding of Docling JSON into precompiled structs.
+
+``RichMarkdownGenerator`` walks untyped JSON with ``dict.get`` chains on
+every element (``element.get("prov", [])[0].get("page_no")``,
+``element.get("data", {}).get("grid", [])``...). This module decodes the
+document straight into msgspec structs instead: field types are validated
+once at decode time, fields the generator never reads (bounding boxes,
+``orig`` text, captions...) are skipped by the decoder, and
+``TypedRichMarkdownGenerator`` reads attributes.
+
+msgspec is optional. When it is not installed ``TYPED_DECODE_AVAILABLE`` is
+False and callers fall back to the dict path.
+"""
+
+import logging
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from app.services.boilerplate_filter import (
+    _FURNITURE_LABELS,
+    _TEXT_LABELS,
+    DOCLING_FURNITURE,
+    BoilerplateFilter,
+)
+from app.services.rich_markdown_generator import ChapterMarkdown, RichMarkdownGenerator
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+TYPED_DECODE_AVAILABLE = msgspec is not None
+
+
+class DoclingDecodeError(Exception):
+    """Raised when Docling JSON cannot be decoded into typed structs."""
+    pass
+
+
+if TYPED_DECODE_AVAILABLE:
+
+    class ProvenanceItem(msgspec.Struct, omit_defaults=True):
+        """Where an item appears in the source PDF (only the page is kept)."""
+
+        page_no: int = 0
+
+    class RefItem(msgspec.Struct, omit_defaults=True):
+        """A JSON pointer to another item (``{"$ref": "#/texts/3"}``)."""
+
+        ref: str = msgspec.field(name="$ref", default="")
+
+    class TableCell(msgspec.Struct, omit_defaults=True):
+        """A table grid cell; cells spanning columns are repeated by Docling."""
+
+        text: str = ""
+        col_span: int = 1
+        start_col_offset_idx: Optional[int] = None
+
+    class TableData(msgspec.Struct, omit_defaults=True):
+        """Table contents as a grid of rows."""
+
+        grid: List[List[TableCell]] = []
+
+    class NodeItem(msgspec.Struct, omit_defaults=True):
+        """Fields shared by every Docling item."""
+
+        self_ref: str
+        label: str = ""
+        children: List[RefItem] = []
+        prov: List[ProvenanceItem] = []
+
+    class TextItem(NodeItem, omit_defaults=True):
+        """Paragraphs, section headers, list items, code and page furniture."""
+
+        text: str = ""
+        level: int = 2
+
+    class TableItem(NodeItem, omit_defaults=True):
+        """A table; ``merged_pages`` is set when continuations are merged into it."""
+
+        data: TableData = msgspec.field(default_factory=TableData)
+        merged_pages: Optional[str] = None
+
+    class PictureItem(NodeItem, omit_defaults=True):
+        """A picture (not rendered)."""
+
+    class GroupItem(NodeItem, omit_defaults=True):
+        """A group of items, e.g. a list."""
+
+        name: str = ""
+
+    class BodyItem(msgspec.Struct, omit_defaults=True):
+        """The document body: its children are the reading order."""
+
+        children: List[RefItem] = []
+
+    class DoclingDocument(msgspec.Struct, omit_defaults=True):
+        """The parts of a Docling document the markdown generator reads."""
+
+        name: str = ""
+        body: BodyItem = msgspec.field(default_factory=BodyItem)
+        texts: List[TextItem] = []
+        tables: List[TableItem] = []
+        pictures: List[PictureItem] = []
+        groups: List[GroupItem] = []
+
+    DoclingItem = Union[TextItem, TableItem, PictureItem, GroupItem]
+
+    # Decoders precompile the struct layout; build once per process
+    _decoder = msgspec.json.Decoder(DoclingDocument)
+
+
+def decode_docling_json(data: bytes) -> "DoclingDocument":
+    """
+    Decode and validate Docling JSON into typed structs.
+
+    Args:
+        data: Raw Docling JSON
+
+    Returns:
+        DoclingDocument
+
+    Raises:
+        DoclingDecodeError: If msgspec is missing or the JSON does not match
+            the expected shape
+    """
+    if not TYPED_DECODE_AVAILABLE:
+        raise DoclingDecodeError("Typed decoding requires the msgspec package")
+
+    try:
+        return _decoder.decode(data)
+    except msgspec.DecodeError as e:
+        # ValidationError is a DecodeError subclass; its message includes the path
+        raise DoclingDecodeError(f"Invalid Docling JSON: {e}") from e
+
+
+def typed_element_lines(elements: Iterable["DoclingItem"]) -> Iterator[Tuple[str, str, int]]:
+    """(label, text, page) of typed items, for boilerplate repeated-line detection."""
+    for item in elements:
+        yield (
+            item.label,
+            getattr(item, "text", ""),
+            item.prov[0].page_no if item.prov else 0,
+        )
+
+
+def to_builtins(item: "DoclingItem") -> Dict[str, Any]:
+    """Convert a typed item back to the Docling dict shape (defaults omitted)."""
+    return msgspec.to_builtins(item)
+
+
+class TypedRichMarkdownGenerator(RichMarkdownGenerator):
+    """RichMarkdownGenerator over a decoded DoclingDocument.
+
+    Element-level methods read struct attributes; chapter assembly, anchors,
+    callouts, searchable text and cross-references are inherited unchanged,
+    so the output is identical to the dict path.
+    """
+
+    def __init__(
+        self,
+        document: "DoclingDocument",
+        boilerplate: Optional[BoilerplateFilter] = None,
+    ):
+        """Initialize with a decoded document and an optional boilerplate filter."""
+        # Deliberately skip RichMarkdownGenerator.__init__: items are typed
+        self.json_data = {"name": document.name}
+        self.boilerplate = boilerplate or BoilerplateFilter()
+        self._items: Dict[str, "DoclingItem"] = {
+            item.self_ref: item
+            for item in chain(document.texts, document.tables, document.pictures, document.groups)
+        }
+
+        items = self._items
+        self.body_elements = [
+            items[child.ref] for child in document.body.children if child.ref in items
+        ]
+
+    def generate_chapters(self, executor: Any = None) -> List[ChapterMarkdown]:
+        """
+        Generate chapters in-process.
+
+        Worker processes render dict slices (see ``render_chapter_slice``),
+        so ``executor`` is ignored here.
+        """
+        return super().generate_chapters(None)
+
+    def _resolve_ref(self, ref: str) -> Optional["DoclingItem"]:
+        """Resolve a $ref to the actual item."""
+        return self._items.get(ref) if ref else None
+
+    def _level_one_header_text(self, element: "DoclingItem") -> Optional[str]:
+        """Text of a level 1 section header, or None for any other item."""
+        if element.label == "section_header" and element.level == 1:
+            return element.text
+        return None
+
+    def _get_page_number(self, element: "DoclingItem") -> int:
+        """Page number of the item's first provenance entry (0 if none)."""
+        prov = element.prov
+        return prov[0].page_no if prov else 0
+
+    def _filter_page_footers(self, elements: Iterable["DoclingItem"]) -> Iterator["DoclingItem"]:
+        """Drop page furniture; same rules and hit counting as BoilerplateFilter.filter."""
+        boilerplate = self.boilerplate
+        hits = boilerplate.hits
+        for element in elements:
+            label = element.label
+
+            if label in _FURNITURE_LABELS:
+                hits[DOCLING_FURNITURE] += 1
+                continue
+
+            if label in _TEXT_LABELS:
+                text = element.text.strip()
+                if not text:
+                    continue
+                rule = boilerplate.match(text)
+                if rule is not None:
+                    hits[rule] += 1
+                    continue
+
+            yield element
+
+    def _merge_consecutive_tables(
+        self, elements: Iterable["DoclingItem"]
+    ) -> Iterator["DoclingItem"]:
+        """Merge tables that continue across pages (see the dict implementation)."""
+        table: Optional["TableItem"] = None
+        table_page = 0
+        table_headers: List[str] = []
+        continuations: List["TableItem"] = []
+        skipped: List["DoclingItem"] = []
+
+        for element in elements:
+            label = element.label
+
+            if table is not None:
+                if label == "table":
+                    if (self._get_table_headers(element) == table_headers and
+                            0 <= self._get_page_number(element) - table_page <= 3):
+                        continuations.append(element)
+                        skipped.clear()
+                        continue
+                elif label in ("text", "picture"):
+                    skipped.append(element)
+                    continue
+
+                yield from self._close_table(table, continuations, skipped)
+                table = None
+
+            if label == "table":
+                table = element
+                table_page = self._get_page_number(element)
+                table_headers = self._get_table_headers(element)
+                continuations = []
+                skipped = []
+            else:
+                yield element
+
+        if table is not None:
+            yield from self._close_table(table, continuations, skipped)
+
+    def _get_table_headers(self, table_element: "TableItem") -> List[str]:
+        """Extract header row from table item."""
+        grid = table_element.data.grid
+        return [cell.text.strip() for cell in grid[0]] if grid else []
+
+    def _merge_table_elements(
+        self,
+        first_table: "TableItem",
+        continuation_tables: List["TableItem"],
+    ) -> "TableItem":
+        """Extend the first table's grid in place with the continuations' rows."""
+        grid = first_table.data.grid
+        for cont_table in continuation_tables:
+            grid.extend(cont_table.data.grid[1:])
+
+        first_page = self._get_page_number(first_table)
+        last_page = self._get_page_number(continuation_tables[-1])
+        first_table.merged_pages = f"{first_page}-{last_page}"
+        return first_table
+
+    def _element_to_markdown(self, element: "DoclingItem") -> Optional[str]:
+        """Convert a Docling item to markdown."""
+        label = element.label
+
+        if label == "text":
+            return self._text_to_markdown(element)
+        elif label == "section_header":
+            return self._header_to_markdown(element)
+        elif label == "table":
+            return self._table_to_markdown(element)
+        elif label == "picture":
+            return self._picture_to_markdown(element)
+        elif label == "code":
+            return self._code_to_markdown(element)
+        elif label == "list":
+            return self._group_to_markdown(element)
+        else:
+            # Default: treat as text (tables, pictures and groups have none)
+            text = getattr(element, "text", "")
+            return text if text else None
+
+    def _text_to_markdown(self, element: "TextItem") -> str:
+        """Convert text item to markdown."""
+        return element.text.strip()
+
+    def _header_to_markdown(self, element: "TextItem") -> str:
+        """Convert section header to markdown (level 1 becomes h2)."""
+        text = element.text.strip()
+        if not text:
+            return ""
+        return f"{'#' * min(element.level + 1, 6)} {text}"
+
+    def _table_to_markdown(self, element: "TableItem") -> str:
+        """Convert table to GFM markdown, dropping cells repeated for col_span."""
+        grid = element.data.grid
+        if len(grid) < 2:  # Need at least header + 1 row
+            return ""
+
+        clean = self._clean_cell_text
+
+        def row_texts(row: List["TableCell"]) -> List[str]:
+            seen = set()
+            texts = []
+            for cell in row:
+                start_col = cell.start_col_offset_idx
+                key = (len(texts) if start_col is None else start_col, cell.text.strip())
+                if key not in seen:
+                    seen.add(key)
+                    texts.append(clean(cell.text))
+            return texts
+
+        header_texts = row_texts(grid[0])
+        num_cols = len(header_texts)
+        md_lines = [
+            "| " + " | ".join(header_texts) + " |",
+            "| " + " | ".join(["---"] * num_cols) + " |",
+        ]
+        for row in grid[1:]:
+            texts = row_texts(row)
+            texts.extend([""] * (num_cols - len(texts)))
+            md_lines.append("| " + " | ".join(texts[:num_cols]) + " |")
+
+        return "\n".join(md_lines)
+
+    def _code_to_markdown(self, element: "TextItem") -> str:
+        """Convert code block to markdown with language hint."""
+        text = element.text
+        return f"```{self._detect_code_language(text)}\n{text}\n```"
+
+    def _group_to_markdown(self, element: "GroupItem") -> str:
+        """Convert group (list) to markdown."""
+        md_parts = []
+        for child_ref in element.children:
+            child_element = self._resolve_ref(child_ref.ref)
+            if child_element is not None:
+                text = getattr(child_element, "text", "").strip()
+                if text:
+                    md_parts.append(f"- {text}")
+
+        return "\n".join(md_parts)
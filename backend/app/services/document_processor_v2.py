@@ -5,35 +5,107 @@ This version uses FileStorageService to store content in files and only
 metadata in the database.
 """
 import asyncio
+import hashlib
 import json
 import logging
 import re
+import time
+from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Literal, Optional
+from typing import BinaryIO, Dict, List, Literal, Optional, Tuple
 from uuid import UUID, uuid4
 
 from fastapi import UploadFile
-from sqlalchemy import select, func
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.dialects.postgresql import TSVECTOR
 
 from app.core.config import settings
 from app.core.database import engine
-from app.models import Document, DocumentVersion, Chapter
+from app.models import Document, DocumentVersion, Chapter, IngestionJob
 from app.schemas.document import ProcessingStatus
 from app.services.file_storage import FileStorageService, FileStorageError
-from app.services.rich_markdown_generator import generate_rich_markdown_from_json
+from app.services.rich_markdown_generator import ChapterMarkdown, GENERATOR_VERSION
+from app.services.docling_stream import DoclingStreamError
+from app.services.compressed_input import CompressedInputError, compression_of
+from app.services.ingestion_progress import IngestionProgress
+from app.services.ingestion_checkpoint import (
+    CommittedChapter,
+    IngestionCheckpoint,
+    element_cache_checkpoint_path,
+    generated_checkpoint_path,
+    load_generated_chapters,
+    save_generated_chapters,
+)
+from app.services.element_cache import ElementCacheError
+from app.services.ingestion_executor import (
+    GenerationResult,
+    IngestionExecutorError,
+    chapter_worker_count,
+    generate_chapters_from_file,
+    regenerate_chapters_from_cache,
+    run_generation,
+)
 from app.services.docling_json_parser import DoclingJSONParser, DoclingParsingError
 
 logger = logging.getLogger(__name__)
 
+# Ingestion job status -> ProcessingStatus.status
+JOB_STATUS_MAP = {
+    "queued": "pending",
+    "running": "processing",
+    "completed": "completed",
+    "failed": "failed",
+}
+
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Chapter rows per multi-row INSERT (11 bind parameters per row)
+CHAPTER_INSERT_BATCH_SIZE = 1000
+
+# Chapters written and committed per checkpoint when ingestion is resumable
+CHECKPOINT_BATCH_SIZE = 10
+
+
+def generator_config_hash(file_type: str) -> str:
+    """
+    Fingerprint of everything besides the upload that shapes generated output.
+
+    Two uploads with the same content hash only produce identical chapters
+    if this fingerprint matches too.
+    """
+    config = {
+        "generator_version": GENERATOR_VERSION,
+        "file_type": file_type,
+        "boilerplate_rule_set": settings.boilerplate_rule_set,
+        "boilerplate_repeat_fraction": settings.boilerplate_repeat_fraction,
+    }
+    encoded = json.dumps(config, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
 
 class DocumentProcessingError(Exception):
     """Raised when document processing fails."""
     pass
 
 
+class UploadTooLargeError(DocumentProcessingError):
+    """Raised when an upload exceeds the configured size limit."""
+    pass
+
+
+@dataclass
+class StoredUpload:
+    """An upload saved to the temp directory."""
+
+    path: Path
+    sha256: str  # Hex digest of the uploaded bytes
+    size: int  # Bytes
+
+
 class DocumentProcessor:
     """Orchestrates document conversion with file-based storage."""
 
@@ -52,8 +124,11 @@ class DocumentProcessor:
         self._db = db_session
         self._file_storage = file_storage or FileStorageService()
         self._parser = DoclingJSONParser()
+        # Boilerplate hits per rule from the last JSON generation (for tuning)
+        self._boilerplate_hits: Dict[str, int] = {}
 
-    def _slugify(self, text: str) -> str:
+    @staticmethod
+    def _slugify(text: str) -> str:
         """Convert text to URL-safe slug."""
         text = text.lower()
         text = re.sub(r'[\s_]+', '-', text)
@@ -68,10 +143,13 @@ class DocumentProcessor:
         version: str,
         metadata: Optional[Dict] = None,
         file_type: Literal["pdf", "json", "markdown"] = "json",
-    ) -> Document:
+    ) -> Tuple[Document, StoredUpload]:
         """
         Create document record and save file (without processing).
 
+        The upload is saved first, so an oversized file is rejected before
+        any database record is created.
+
         Args:
             file: Uploaded file
             title: Document title
@@ -80,15 +158,19 @@ class DocumentProcessor:
             file_type: Type of file
 
         Returns:
-            Created Document instance
+            Tuple of (Document instance, saved upload)
 
         Raises:
+            UploadTooLargeError: If the upload exceeds settings.max_upload_size
             DocumentProcessingError: If creation fails
         """
         try:
             # Generate slug from title
             slug = self._slugify(title)
 
+            # Save uploaded file temporarily
+            upload = await self._save_temp_file(file, slug, version, file_type)
+
             # Check if document exists
             result = await self._db.execute(
                 select(Document).where(Document.slug == slug)
@@ -111,12 +193,11 @@ class DocumentProcessor:
             else:
                 logger.info(f"Using existing document: {document.id} (slug: {slug})")
 
-            # Save uploaded file temporarily
-            temp_path = await self._save_temp_file(file, slug, version, file_type)
-
             logger.info(f"Document record ready: {document.id}")
-            return document
+            return document, upload
 
+        except DocumentProcessingError:
+            raise
         except Exception as e:
             logger.error(f"Failed to create document record: {e}", exc_info=True)
             raise DocumentProcessingError(f"Failed to create document: {str(e)}") from e
@@ -127,8 +208,16 @@ class DocumentProcessor:
         slug: str,
         version: str,
         file_type: str
-    ) -> Path:
-        """Save uploaded file temporarily for processing."""
+    ) -> StoredUpload:
+        """
+        Save uploaded file temporarily for processing.
+
+        The upload is copied in fixed-size chunks on a worker thread, hashed
+        as it streams, and aborted as soon as it exceeds the size limit.
+
+        Raises:
+            UploadTooLargeError: If the upload exceeds settings.max_upload_size
+        """
         upload_dir = settings.upload_dir
         upload_dir.mkdir(parents=True, exist_ok=True)
 
@@ -138,40 +227,179 @@ class DocumentProcessor:
             "markdown": ".md",
             "pdf": ".pdf"
         }.get(file_type, ".dat")
+        if file_type == "json" and file.filename:
+            # Compressed uploads stay compressed on disk (decompressed while parsing)
+            if compression_of(file.filename):
+                extension += Path(file.filename).suffix.lower()
 
-        temp_filename = f"{slug}-{version}{extension}"
+        # Unique per upload: concurrent uploads of one version must not collide
+        temp_filename = f"{slug}-{version}-{uuid4().hex[:12]}{extension}"
         temp_path = upload_dir / temp_filename
 
+        # Reject early when the client declared the size
+        max_size = settings.max_upload_size
+        if file.size is not None and file.size > max_size:
+            raise UploadTooLargeError(
+                f"Upload is {file.size} bytes; limit is {max_size} bytes"
+            )
+
         # Save file
-        content = await file.read()
-        temp_path.write_bytes(content)
+        upload = await asyncio.to_thread(
+            self._copy_upload, file.file, temp_path, max_size
+        )
+
+        logger.info(
+            f"Saved temp file: {temp_path} ({upload.size} bytes, sha256 {upload.sha256})"
+        )
+        return upload
+
+    def _copy_upload(
+        self,
+        source: BinaryIO,
+        temp_path: Path,
+        max_size: int,
+    ) -> StoredUpload:
+        """Copy an upload to disk in chunks, hashing and enforcing the size limit."""
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            with open(temp_path, "wb") as out:
+                while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_size:
+                        raise UploadTooLargeError(
+                            f"Upload exceeds the {max_size} byte limit"
+                        )
+                    digest.update(chunk)
+                    out.write(chunk)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        return StoredUpload(path=temp_path, sha256=digest.hexdigest(), size=size)
+
+    async def find_existing_version(
+        self,
+        document_id: UUID,
+        version: str,
+        content_hash: str,
+        file_type: str,
+    ) -> Optional[DocumentVersion]:
+        """
+        Find the requested version if it was fully processed from identical input.
+
+        Only the version being uploaded matches: the same file uploaded
+        under a new version label is processed as that version (incremental
+        ingestion reuses the unchanged chapters).
+
+        Args:
+            document_id: Document ID
+            version: Version string of the upload
+            content_hash: SHA-256 of the uploaded file
+            file_type: Type of file
+
+        Returns:
+            Matching DocumentVersion, or None if the upload must be processed
+        """
+        result = await self._db.execute(
+            select(DocumentVersion).where(
+                DocumentVersion.document_id == document_id,
+                DocumentVersion.version == version,
+                DocumentVersion.content_hash == content_hash,
+                DocumentVersion.generator_hash == generator_config_hash(file_type),
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def activate_version(self, document_id: UUID, version: str) -> Optional[str]:
+        """
+        Make a processed version the document's active version.
+
+        A deduplicated upload activates its version like a processed one
+        does. Only the database row is changed: the caller commits and
+        then calls ``write_active_version``, so the files never get ahead
+        of a transaction that is rolled back.
+
+        Args:
+            document_id: Document ID
+            version: Version string
+
+        Returns:
+            Document slug if the active version changed, else None
+
+        Raises:
+            DocumentProcessingError: If the document does not exist
+        """
+        document = await self._db.get(Document, document_id)
+        if not document:
+            raise DocumentProcessingError(f"Document not found: {document_id}")
+        if document.active_version == version:
+            return None
+
+        document.active_version = version
+        return document.slug
+
+    async def write_active_version(self, doc_slug: str, version: str) -> None:
+        """
+        Record a committed activation on disk (active_version.txt and pack).
+
+        Args:
+            doc_slug: Document slug
+            version: Version string
 
-        logger.info(f"Saved temp file: {temp_path}")
-        return temp_path
+        Raises:
+            FileStorageError: If active_version.txt cannot be written
+        """
+        await asyncio.to_thread(self._file_storage.set_active_version, doc_slug, version)
+        await self._pack_version(doc_slug, version)
+        logger.info(f"Activated existing version {doc_slug}/{version}")
 
     async def process_document_async(
         self,
         document_id: UUID,
         temp_file_path: str,
         version: str,
-        file_type: str = "json"
-    ) -> None:
+        file_type: str = "json",
+        content_hash: Optional[str] = None,
+        progress: Optional[IngestionProgress] = None,
+        checkpoint: Optional[IngestionCheckpoint] = None,
+    ) -> int:
         """
-        Process document asynchronously in background.
+        Process document asynchronously (run by the ingestion worker).
 
         This method:
-        1. Parses the file and generates chapters
-        2. Saves each chapter to file system
-        3. Creates chapter records in database (metadata only)
-        4. Generates search indexes
-        5. Sets version as active
+        1. Parses the file and generates chapters (parse, generate stages)
+        2. Saves each chapter to file system (write stage)
+        3. Creates chapter records and search indexes in database (index stage)
+        4. Sets version as active (activate stage)
+
+        With a persistent ``checkpoint`` a retry of the same job resumes:
+        generated chapters saved by an earlier attempt are reused (no parse
+        or generate) and chapters whose rows were committed are skipped.
 
         Args:
             document_id: Document ID
             temp_file_path: Path to temporary uploaded file
             version: Version string
             file_type: Type of file
+            content_hash: SHA-256 of the upload, recorded for dedup on success
+            progress: Receives stage transitions (defaults to a no-op)
+            checkpoint: Records committed chapters (defaults to a no-op)
+
+        Returns:
+            Number of chapters in the version
+
+        Raises:
+            Exception: Any processing failure, after the version is marked draft
         """
+        progress = progress or IngestionProgress()
+        checkpoint = checkpoint or IngestionCheckpoint()
+        doc_version = None
+        temp_path = Path(temp_file_path)
+        cache_path = element_cache_checkpoint_path(temp_path)
+        generated_path = generated_checkpoint_path(temp_path)
+
         # Create new database session for background task
         async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -182,12 +410,12 @@ class DocumentProcessor:
                 # Get document
                 document = await db.get(Document, document_id)
                 if not document:
-                    logger.error(f"Document not found: {document_id}")
-                    return
+                    raise DocumentProcessingError(f"Document not found: {document_id}")
 
                 # Step 1: Parse file and generate chapters
-                temp_path = Path(temp_file_path)
-                chapters_data = await self._parse_file(temp_path, file_type)
+                chapters_data = await self._parse_file_resumable(
+                    temp_path, file_type, progress, cache_path, checkpoint
+                )
 
                 logger.info(f"Generated {len(chapters_data)} chapters")
 
@@ -210,87 +438,550 @@ class DocumentProcessor:
                     await db.commit()
                     await db.refresh(doc_version)
                     logger.info(f"Created document version: {doc_version.id}")
+                else:
+                    # Content is being replaced: the old hashes no longer apply
+                    doc_version.content_hash = None
+                    doc_version.generator_hash = None
+                    await db.commit()
 
-                # Step 3: Save chapters to file system and create DB records
-                for chapter_data in chapters_data:
-                    # Save chapter content to file
-                    file_path = self._file_storage.save_chapter(
-                        doc_slug=document.slug,
-                        version=version,
-                        chapter_number=chapter_data["chapter_number"],
-                        title=chapter_data["title"],
-                        content=chapter_data["content"],
-                    )
-
-                    # Calculate word count
-                    word_count = len(chapter_data["content"].split())
-
-                    # Generate search vector
-                    search_text = f"{chapter_data['title']} {chapter_data['content']}"
-
-                    # Create chapter record (metadata only)
-                    chapter = Chapter(
-                        version_id=doc_version.id,
-                        chapter_number=chapter_data["chapter_number"],
-                        title=chapter_data["title"],
-                        file_path=file_path,
-                        page_range=chapter_data.get("page_range"),
-                        word_count=word_count,
-                        has_manual_content=False,
-                        has_linked_docs=False,
-                    )
-                    db.add(chapter)
-                    await db.flush()
-
-                    # Generate PostgreSQL full-text search vector
-                    await db.execute(
-                        Chapter.__table__.update()
-                        .where(Chapter.id == chapter.id)
-                        .values(search_vector=func.to_tsvector('english', search_text))
-                    )
-
-                await db.commit()
-                logger.info(f"Saved {len(chapters_data)} chapters to file system")
+                # Step 3: Save chapters (and the element cache) to file system
+                # Step 4: Create chapter records with search vectors
+                await self._replace_chapters(
+                    db, document, doc_version, chapters_data, progress,
+                    checkpoint=checkpoint,
+                )
+                if cache_path.exists():
+                    try:
+                        await asyncio.to_thread(
+                            self._file_storage.save_element_cache,
+                            document.slug,
+                            version,
+                            cache_path,
+                        )
+                    except FileStorageError as e:
+                        # Only regeneration depends on the cache
+                        logger.warning(f"Element cache not saved: {e}")
+                else:
+                    # Never regenerate from a cache left by an earlier upload
+                    self._file_storage.element_cache_path(
+                        document.slug, version
+                    ).unlink(missing_ok=True)
 
-                # Step 4: Save metadata
+                # Step 5: Save metadata and set as active version
+                await progress.stage("activate")
                 metadata = {
                     "version": version,
                     "file_type": file_type,
                     "chapter_count": len(chapters_data),
                     "processed_at": datetime.utcnow().isoformat(),
+                    "stage_timings": progress.timings,
+                    "boilerplate_hits": self._boilerplate_hits,
                 }
                 self._file_storage.save_metadata(document.slug, version, metadata)
 
-                # Step 5: Set as active version
                 document.active_version = version
+                doc_version.content_hash = content_hash
+                doc_version.generator_hash = generator_config_hash(file_type)
                 self._file_storage.set_active_version(document.slug, version)
+                await self._pack_version(document.slug, version)
                 await db.commit()
+                await progress.finish()
 
                 logger.info(f"Document {document_id} processing completed successfully")
 
                 # Clean up temp file
                 temp_path.unlink(missing_ok=True)
+                generated_path.unlink(missing_ok=True)
+                return len(chapters_data)
 
             except Exception as e:
                 logger.error(
                     f"Document processing failed for {document_id}: {e}",
                     exc_info=True
                 )
+                if not checkpoint.enabled:
+                    # Kept for a resumed attempt otherwise (it skips parsing)
+                    cache_path.unlink(missing_ok=True)
                 # Update status to failed if possible
                 try:
-                    doc_version.status = "draft"  # Mark as draft instead of active
-                    await db.commit()
-                except:
+                    if doc_version is not None:
+                        doc_version.status = "draft"  # Mark as draft instead of active
+                        await db.commit()
+                except Exception:
                     pass
+                raise
+
+    async def regenerate_version(
+        self,
+        document_id: UUID,
+        version: str,
+        progress: Optional[IngestionProgress] = None,
+    ) -> int:
+        """
+        Regenerate a version's chapters from its element cache.
+
+        Skips JSON parsing entirely: the resolved element stream saved during
+        ingestion is run through the current generator rules. Manually
+        edited chapters are left untouched.
+
+        Args:
+            document_id: Document ID
+            version: Version string
+            progress: Receives stage transitions (defaults to a no-op)
+
+        Returns:
+            Number of chapters generated
+
+        Raises:
+            DocumentProcessingError: If the version or its element cache is missing
+        """
+        progress = progress or IngestionProgress()
+
+        document = await self._db.get(Document, document_id)
+        if not document:
+            raise DocumentProcessingError(f"Document not found: {document_id}")
+
+        result = await self._db.execute(
+            select(DocumentVersion).where(
+                DocumentVersion.document_id == document_id,
+                DocumentVersion.version == version,
+            )
+        )
+        doc_version = result.scalar_one_or_none()
+        if not doc_version:
+            raise DocumentProcessingError(f"Version not found: {document.slug}/{version}")
+
+        cache_path = self._file_storage.element_cache_path(document.slug, version)
+        if not cache_path.exists():
+            raise DocumentProcessingError(
+                f"No element cache for {document.slug}/{version}; re-upload to regenerate"
+            )
+
+        await progress.stage("parse")
+        try:
+            generation = await run_generation(
+                regenerate_chapters_from_cache,
+                str(cache_path),
+                settings.boilerplate_rule_set,
+                chapter_worker_count(),
+                settings.boilerplate_repeat_fraction,
+                on_parsed=partial(progress.stage, "generate"),
+            )
+        except (ElementCacheError, IngestionExecutorError) as e:
+            raise DocumentProcessingError(str(e)) from e
+        chapters_data = self._generation_result(generation, progress)
+
+        await self._replace_chapters(
+            self._db, document, doc_version, chapters_data, progress, keep_manual=True
+        )
+
+        await progress.stage("activate")
+        try:
+            metadata = self._file_storage.read_metadata(document.slug, version)
+        except FileStorageError:
+            metadata = {"version": version, "file_type": "json"}
+        metadata.update({
+            "chapter_count": len(chapters_data),
+            "regenerated_at": datetime.utcnow().isoformat(),
+            "stage_timings": progress.timings,
+            "boilerplate_hits": self._boilerplate_hits,
+        })
+        self._file_storage.save_metadata(document.slug, version, metadata)
+        if document.active_version == version:
+            await self._pack_version(document.slug, version)
+
+        # Output now matches the current generator, so dedup can match it again
+        doc_version.generator_hash = generator_config_hash("json")
+        await self._db.commit()
+        await progress.finish()
+
+        logger.info(
+            f"Regenerated {len(chapters_data)} chapters for {document.slug}/{version}"
+        )
+        return len(chapters_data)
+
+    async def _pack_version(self, doc_slug: str, version: str) -> None:
+        """Pack an activated version's chapters if enabled (settings.version_pack)."""
+        if not settings.version_pack:
+            return
+        try:
+            await asyncio.to_thread(self._file_storage.pack_version, doc_slug, version)
+        except FileStorageError as e:
+            # Reads fall back to the loose files
+            logger.warning(f"Version {doc_slug}/{version} not packed: {e}")
+
+    async def _replace_chapters(
+        self,
+        db: AsyncSession,
+        document: Document,
+        doc_version: DocumentVersion,
+        chapters_data: List[Dict],
+        progress: IngestionProgress,
+        keep_manual: bool = False,
+        checkpoint: Optional[IngestionCheckpoint] = None,
+    ) -> None:
+        """
+        Write chapter files and replace the version's chapter rows (write, index stages).
+
+        Without a persistent checkpoint all rows are swapped in one
+        transaction. With one, chapters of a version that is not active yet
+        are written and committed CHECKPOINT_BATCH_SIZE at a time and
+        recorded in the checkpoint; chapters committed by an earlier attempt
+        are skipped. The caller activates the version after the last batch.
+        The active version's rows are always replaced in one transaction, so
+        its readers never see a mix of old and new chapters (not even after
+        a failure partway). A chapter's old row is deleted in the
+        transaction that inserts its replacement; rows of chapters that no
+        longer exist are deleted at the end.
+
+        Args:
+            db: Database session (committed on success)
+            document: Parent document
+            doc_version: Version being written
+            chapters_data: Chapter dicts from _parse_file
+            progress: Receives stage transitions
+            keep_manual: Keep manually edited chapters (file and row) instead
+                of replacing them with generated content
+            checkpoint: Records committed chapters (defaults to a no-op)
+        """
+        checkpoint = checkpoint or IngestionCheckpoint()
+        await progress.stage("write")
+
+        keep: Dict[int, Chapter] = {}
+        if keep_manual:
+            result = await db.execute(
+                select(Chapter).where(
+                    Chapter.version_id == doc_version.id,
+                    Chapter.has_manual_content.is_(True),
+                )
+            )
+            keep = {ch.chapter_number: ch for ch in result.scalars()}
+            if keep:
+                logger.info(f"Keeping {len(keep)} manually edited chapters")
+                chapters_data = [
+                    ch for ch in chapters_data if ch["chapter_number"] not in keep
+                ]
+
+        # Chapters committed by an earlier attempt of this job are done
+        done: Dict[Tuple[int, str], List[UUID]] = {}
+        for chapter in await checkpoint.committed(db, doc_version.id):
+            done.setdefault((chapter.chapter_number, chapter.content_hash), []).append(chapter.id)
+
+        keep_ids = [ch.id for ch in keep.values()]
+        pending = []
+        for chapter_data in chapters_data:
+            ids = done.get(
+                (chapter_data["chapter_number"], self._content_hash(chapter_data["content"]))
+            )
+            if ids:
+                keep_ids.append(ids.pop())
+            else:
+                pending.append(chapter_data)
+        if len(pending) < len(chapters_data):
+            logger.info(
+                f"Resuming: {len(chapters_data) - len(pending)} of "
+                f"{len(chapters_data)} chapters already committed"
+            )
+
+        previous = (
+            await self._previous_chapters(db, document, doc_version)
+            if settings.incremental_ingest
+            else {}
+        )
+        stale = await self._stale_chapters(db, doc_version.id, keep_ids)
+
+        # Rows whose search vector a pending chapter will copy (by position)
+        reused_ids = [
+            getattr(previous.get((self._content_hash(ch["content"]), ch["title"])), "id", None)
+            for ch in pending
+        ]
+
+        batched = checkpoint.enabled and document.active_version != doc_version.version
+        batch_size = CHECKPOINT_BATCH_SIZE if batched else max(len(pending), 1)
+        write_seconds = index_seconds = 0.0
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+
+            started = time.perf_counter()
+            rows = await asyncio.to_thread(
+                self._write_chapter_files,
+                document,
+                doc_version,
+                batch,
+                previous,
+            )
+            written = time.perf_counter()
+
+            inserted = await self._insert_chapter_rows(db, rows)
+            # Old rows of these chapters go in the same transaction, unless
+            # a later chapter still copies its search vector from them
+            still_reused = set(reused_ids[start + batch_size:])
+            numbers = {ch["chapter_number"] for ch in batch}
+            replaced = [
+                row_id
+                for number in numbers
+                for row_id in stale.get(number, [])
+                if row_id not in still_reused
+            ]
+            if replaced:
+                await db.execute(delete(Chapter).where(Chapter.id.in_(replaced)))
+                for number in numbers:
+                    stale[number] = [i for i in stale.get(number, []) if i in still_reused]
+            await checkpoint.record(db, doc_version.id, inserted)
+            if batched:
+                await db.commit()
+
+            write_seconds += written - started
+            index_seconds += time.perf_counter() - written
+
+        logger.info(f"Saved {len(pending)} chapters to file system")
+
+        await progress.stage("index")
+        started = time.perf_counter()
+        remaining = [row_id for ids in stale.values() for row_id in ids]
+        if remaining:
+            await db.execute(delete(Chapter).where(Chapter.id.in_(remaining)))
+        await db.commit()
+
+        progress.record("write", write_seconds)
+        progress.record("index", index_seconds + time.perf_counter() - started)
+
+    async def _previous_chapters(
+        self,
+        db: AsyncSession,
+        document: Document,
+        doc_version: DocumentVersion,
+    ) -> Dict[Tuple[str, str], Chapter]:
+        """
+        Load reusable chapters for incremental ingestion.
+
+        Candidates are the chapters of the active version and any existing
+        chapters of the version being processed. Manually edited chapters
+        are excluded because their files no longer match their hash.
+
+        Returns:
+            Map of (content_hash, title) -> Chapter
+        """
+        version_ids = [doc_version.id]
+        if document.active_version and document.active_version != doc_version.version:
+            result = await db.execute(
+                select(DocumentVersion.id).where(
+                    DocumentVersion.document_id == document.id,
+                    DocumentVersion.version == document.active_version,
+                )
+            )
+            version_ids.extend(result.scalars())
+
+        result = await db.execute(
+            select(Chapter).where(
+                Chapter.version_id.in_(version_ids),
+                Chapter.content_hash.is_not(None),
+                Chapter.has_manual_content.is_(False),
+            )
+        )
+        return {(ch.content_hash, ch.title): ch for ch in result.scalars()}
+
+    def _write_chapter_files(
+        self,
+        document: Document,
+        doc_version: DocumentVersion,
+        chapters_data: List[Dict],
+        previous: Optional[Dict[Tuple[str, str], Chapter]] = None,
+    ) -> List[Dict]:
+        """
+        Save chapter files and build their chapter rows.
+
+        Chapters whose content matches a previous chapter reuse its file
+        (hardlink) and its search vector instead of being rewritten.
+
+        Args:
+            document: Parent document
+            doc_version: Version the chapters belong to
+            chapters_data: Chapter dicts from _parse_file
+            previous: Reusable chapters from _previous_chapters
+
+        Returns:
+            Row values for _insert_chapter_rows
+        """
+        previous = previous or {}
+        rows = []
+        reused = 0
+
+        for chapter_data in chapters_data:
+            content_hash = self._content_hash(chapter_data["content"])
+            match = previous.get((content_hash, chapter_data["title"]))
+
+            file_path = None
+            if match is not None:
+                try:
+                    file_path = self._file_storage.link_chapter(
+                        source_path=match.file_path,
+                        doc_slug=document.slug,
+                        version=doc_version.version,
+                        chapter_number=chapter_data["chapter_number"],
+                        title=chapter_data["title"],
+                    )
+                    reused += 1
+                except FileStorageError as e:
+                    logger.warning(f"Cannot reuse chapter file {match.file_path}: {e}")
+                    match = None
+
+            if file_path is None:
+                # Save chapter content to file
+                file_path = self._file_storage.save_chapter(
+                    doc_slug=document.slug,
+                    version=doc_version.version,
+                    chapter_number=chapter_data["chapter_number"],
+                    title=chapter_data["title"],
+                    content=chapter_data["content"],
+                )
+
+            row = self._chapter_row(doc_version.id, chapter_data, file_path)
+            row["content_hash"] = content_hash
+            if match is not None:
+                # Copy the existing search vector instead of recomputing it
+                row["search_vector"] = (
+                    select(Chapter.search_vector)
+                    .where(Chapter.id == match.id)
+                    .scalar_subquery()
+                )
+            rows.append(row)
+
+        if previous:
+            logger.info(
+                f"Incremental ingestion reused {reused} of {len(chapters_data)} chapters"
+            )
+        return rows
+
+    def _content_hash(self, content: str) -> str:
+        """SHA-256 of chapter markdown."""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _chapter_row(
+        self,
+        version_id: UUID,
+        chapter_data: Dict,
+        file_path: str,
+    ) -> Dict:
+        """Build the INSERT values for one chapter (metadata + search vector)."""
+        search_text = f"{chapter_data['title']} {chapter_data['content']}"
+        return {
+            "version_id": version_id,
+            "chapter_number": chapter_data["chapter_number"],
+            "title": chapter_data["title"],
+            "file_path": file_path,
+            "page_range": chapter_data.get("page_range"),
+            "word_count": len(chapter_data["content"].split()),
+            "has_manual_content": False,
+            "has_linked_docs": False,
+            # PostgreSQL full-text search vector, computed server-side in the INSERT
+            "search_vector": func.to_tsvector("english", search_text),
+        }
+
+    async def _stale_chapters(
+        self,
+        db: AsyncSession,
+        version_id: UUID,
+        keep_ids: List[UUID],
+    ) -> Dict[int, List[UUID]]:
+        """Existing chapter rows of a version to be replaced, by chapter number."""
+        query = select(Chapter.id, Chapter.chapter_number).where(
+            Chapter.version_id == version_id
+        )
+        if keep_ids:
+            query = query.where(Chapter.id.not_in(keep_ids))
+
+        stale: Dict[int, List[UUID]] = {}
+        for row_id, number in await db.execute(query):
+            stale.setdefault(number, []).append(row_id)
+        return stale
+
+    async def _insert_chapter_rows(
+        self,
+        db: AsyncSession,
+        rows: List[Dict],
+    ) -> List[CommittedChapter]:
+        """
+        Insert chapter rows with multi-row INSERTs in the caller's transaction.
+
+        One statement per CHAPTER_INSERT_BATCH_SIZE rows (asyncpg caps a
+        statement at 32767 bind parameters).
+
+        Returns:
+            CommittedChapter per inserted row (for checkpointing)
+        """
+        inserted = []
+        for start in range(0, len(rows), CHAPTER_INSERT_BATCH_SIZE):
+            batch = rows[start:start + CHAPTER_INSERT_BATCH_SIZE]
+            result = await db.execute(
+                insert(Chapter)
+                .values(batch)
+                .returning(Chapter.id, Chapter.chapter_number, Chapter.content_hash)
+            )
+            inserted.extend(
+                CommittedChapter(id=row_id, chapter_number=number, content_hash=content_hash)
+                for row_id, number, content_hash in result
+            )
+
+        if rows:
+            logger.info(f"Inserted {len(rows)} chapter rows")
+        return inserted
+
+    async def _parse_file_resumable(
+        self,
+        file_path: Path,
+        file_type: str,
+        progress: IngestionProgress,
+        cache_path: Path,
+        checkpoint: IngestionCheckpoint,
+    ) -> List[Dict]:
+        """
+        _parse_file, reusing chapters generated by an earlier attempt of the job.
+
+        Freshly generated chapters are checkpointed when ``checkpoint`` is
+        persistent, so a failure in a later stage does not repeat generation.
+        """
+        if not checkpoint.enabled:
+            return await self._parse_file(file_path, file_type, progress, cache_path)
+
+        generated_path = generated_checkpoint_path(file_path)
+        generator_hash = generator_config_hash(file_type)
+
+        saved = await asyncio.to_thread(
+            load_generated_chapters, generated_path, generator_hash
+        )
+        if saved is not None:
+            chapters_data, self._boilerplate_hits = saved
+            logger.info(
+                f"Resuming from {len(chapters_data)} checkpointed chapters; "
+                f"skipping parse and generate"
+            )
+            return chapters_data
+
+        chapters_data = await self._parse_file(file_path, file_type, progress, cache_path)
+        await asyncio.to_thread(
+            save_generated_chapters,
+            generated_path,
+            generator_hash,
+            chapters_data,
+            self._boilerplate_hits,
+        )
+        return chapters_data
 
     async def _parse_file(
         self,
         file_path: Path,
-        file_type: str
+        file_type: str,
+        progress: Optional[IngestionProgress] = None,
+        cache_path: Optional[Path] = None,
     ) -> List[Dict]:
         """
         Parse file and return chapter data.
 
+        Reports the parse stage (and generate, for JSON) to ``progress``.
+        For JSON, the resolved element stream is also written to
+        ``cache_path`` (if given) for later regeneration.
+
         Returns:
             List of chapter dictionaries with:
             - chapter_number: int
@@ -298,26 +989,45 @@ class DocumentProcessor:
             - content: str (markdown)
             - page_range: str (optional)
         """
+        progress = progress or IngestionProgress()
+        await progress.stage("parse")
+
         if file_type == "json":
-            # Use RichMarkdownGenerator for JSON files
-            with open(file_path, "r", encoding="utf-8") as f:
-                docling_json = json.load(f)
-
-            chapters = generate_rich_markdown_from_json(docling_json)
-
-            return [
-                {
-                    "chapter_number": ch.chapter_number,
-                    "title": ch.title,
-                    "content": ch.markdown_content,
-                    "page_range": f"{ch.page_range[0]}-{ch.page_range[1]}",
-                }
-                for ch in chapters
-            ]
+            # Large uploads use the streaming parser to bound worker memory;
+            # compressed uploads are always streamed so they are never inflated whole
+            streaming = (
+                compression_of(file_path.name) is not None
+                or file_path.stat().st_size >= settings.streaming_ingest_threshold
+            )
+            if streaming:
+                logger.info(f"Using streaming ingestion for {file_path}")
+
+            # CPU-bound generation runs in the ingestion process pool,
+            # keeping the API event loop responsive
+            try:
+                result = await run_generation(
+                    generate_chapters_from_file,
+                    str(file_path),
+                    streaming,
+                    str(settings.upload_dir),
+                    settings.boilerplate_rule_set,
+                    str(cache_path) if cache_path else None,
+                    chapter_worker_count(),
+                    settings.docling_typed_decode,
+                    settings.boilerplate_repeat_fraction,
+                    settings.max_decompressed_upload_size,
+                    on_parsed=partial(progress.stage, "generate"),
+                )
+            except (DoclingStreamError, CompressedInputError, IngestionExecutorError) as e:
+                raise DocumentProcessingError(str(e)) from e
+
+            return self._generation_result(result, progress)
 
         elif file_type == "markdown":
             # Parse markdown file
-            parsed_sections, page_count = self._parser.parse_markdown(file_path)
+            parsed_sections, page_count = await asyncio.to_thread(
+                self._parser.parse_markdown, file_path
+            )
 
             # Group sections into chapters (level 1 headings)
             chapters = []
@@ -349,10 +1059,41 @@ class DocumentProcessor:
         else:
             raise DocumentProcessingError(f"Unsupported file type: {file_type}")
 
+    def _generation_result(
+        self,
+        result: GenerationResult,
+        progress: IngestionProgress,
+    ) -> List[Dict]:
+        """Record a worker's timings and boilerplate hits; return its chapter dicts."""
+        # Both stages ran in the worker process; record their timings
+        progress.record("parse", result.parse_seconds)
+        progress.record("generate", result.generate_seconds)
+
+        self._boilerplate_hits = result.boilerplate_hits
+        logger.info(
+            f"Boilerplate removed ({settings.boilerplate_rule_set}): "
+            f"{result.boilerplate_hits}"
+        )
+
+        return [self._chapter_to_dict(ch) for ch in result.chapters]
+
+    def _chapter_to_dict(self, ch: ChapterMarkdown) -> Dict:
+        """Convert generated chapter to the chapter dict used for persistence."""
+        return {
+            "chapter_number": ch.chapter_number,
+            "title": ch.title,
+            "content": ch.markdown_content,
+            "page_range": f"{ch.page_range[0]}-{ch.page_range[1]}",
+        }
+
     async def get_processing_status(self, document_id: UUID) -> ProcessingStatus:
         """
         Get processing status for a document.
 
+        Reports the latest ingestion job (stage, progress, queue position and
+        stage timings). Documents processed before the job queue existed fall
+        back to checking the active version.
+
         Args:
             document_id: Document ID
 
@@ -363,26 +1104,21 @@ class DocumentProcessor:
         if not document:
             raise ValueError(f"Document not found: {document_id}")
 
-        # Check if active version exists
-        if document.active_version:
-            # Get version info
-            result = await self._db.execute(
-                select(DocumentVersion).where(
-                    DocumentVersion.document_id == document_id,
-                    DocumentVersion.version == document.active_version
-                )
-            )
-            version = result.scalar_one_or_none()
+        result = await self._db.execute(
+            select(IngestionJob)
+            .where(IngestionJob.document_id == document_id)
+            .order_by(IngestionJob.created_at.desc())
+            .limit(1)
+        )
+        job = result.scalar_one_or_none()
 
-            if version:
-                # Count chapters
-                result = await self._db.execute(
-                    select(func.count(Chapter.id)).where(
-                        Chapter.version_id == version.id
-                    )
-                )
-                chapter_count = result.scalar()
+        if job is not None:
+            return await self._job_status(document_id, job)
 
+        # Check if active version exists
+        if document.active_version:
+            chapter_count = await self._count_chapters(document_id, document.active_version)
+            if chapter_count is not None:
                 return ProcessingStatus(
                     document_id=str(document_id),
                     status="completed",
@@ -399,3 +1135,54 @@ class DocumentProcessor:
             message="Processing document...",
             error_message=None,
         )
+
+    async def _job_status(self, document_id: UUID, job: IngestionJob) -> ProcessingStatus:
+        """Build processing status from an ingestion job."""
+        queue_position = None
+        if job.status == "queued":
+            result = await self._db.execute(
+                select(func.count(IngestionJob.id)).where(
+                    IngestionJob.status == "queued",
+                    IngestionJob.created_at <= job.created_at,
+                )
+            )
+            queue_position = result.scalar()
+            message = f"Queued for processing (position {queue_position})"
+        elif job.status == "running":
+            message = f"Processing document ({job.stage or 'starting'})..."
+        elif job.status == "completed":
+            chapter_count = await self._count_chapters(document_id, job.version)
+            message = f"Processing complete - {chapter_count or 0} chapters"
+        else:
+            message = "Processing failed"
+
+        return ProcessingStatus(
+            document_id=str(document_id),
+            status=JOB_STATUS_MAP[job.status],
+            progress=job.progress,
+            message=message,
+            error_message=job.error_message,
+            job_id=job.id,
+            stage=job.stage,
+            queue_position=queue_position,
+            stage_timings=job.stage_timings or {},
+        )
+
+    async def _count_chapters(self, document_id: UUID, version: str) -> Optional[int]:
+        """Count chapters of a document version (None if the version doesn't exist)."""
+        result = await self._db.execute(
+            select(DocumentVersion).where(
+                DocumentVersion.document_id == document_id,
+                DocumentVersion.version == version
+            )
+        )
+        doc_version = result.scalar_one_or_none()
+        if not doc_version:
+            return None
+
+        result = await self._db.execute(
+            select(func.count(Chapter.id)).where(
+                Chapter.version_id == doc_version.id
+            )
+        )
+        return result.scalar()
@@ -0,0 +1,175 @@
+"""Persisted element-stream cache for re-generating markdown without re-parsing.
+
+During ingestion the resolved ``body_elements`` stream (plus the elements
+their groups reference) is written next to the version as a compact msgpack
+file. Regenerating a version's markdown after a generator rule change then
+reads this cache instead of re-uploading and re-parsing the Docling JSON.
+
+Only the fields the generator reads are kept (bounding boxes, ``orig`` text
+and other Docling detail are dropped). Map keys are interned by the msgpack
+unpacker; element labels are interned on load as well.
+
+File layout (a sequence of msgpack objects):
+    header   {"format": ELEMENT_CACHE_FORMAT, "name": str}
+    element  one per body element, in body order
+    nil      end of the body elements
+    refs     {ref: element} for group children
+"""
+
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+import msgpack
+
+from app.services.boilerplate_filter import BoilerplateFilter
+from app.services.rich_markdown_generator import RichMarkdownGenerator
+
+logger = logging.getLogger(__name__)
+
+# Bump when the pruned element shape changes; older caches are then rejected
+ELEMENT_CACHE_FORMAT = 1
+
+_ELEMENT_KEYS = ("self_ref", "label", "text", "level", "children")
+_CELL_KEYS = ("text", "col_span", "start_col_offset_idx")
+
+
+class ElementCacheError(Exception):
+    """Raised when an element cache cannot be written or read."""
+    pass
+
+
+def _prune(element: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the fields the markdown generator reads."""
+    pruned = {key: element[key] for key in _ELEMENT_KEYS if key in element}
+
+    prov = element.get("prov")
+    if prov:
+        pruned["prov"] = [{"page_no": prov[0].get("page_no", 0)}]
+
+    grid = (element.get("data") or {}).get("grid")
+    if grid is not None:
+        pruned["data"] = {
+            "grid": [
+                [{key: cell[key] for key in _CELL_KEYS if key in cell} for cell in row]
+                for row in grid
+            ]
+        }
+
+    return pruned
+
+
+def write_element_cache(
+    path: Path,
+    name: Optional[str],
+    elements: Iterable[Dict[str, Any]],
+    resolve_refs: Callable[[List[str]], Iterable[Dict[str, Any]]],
+) -> None:
+    """
+    Write an element cache atomically.
+
+    Args:
+        path: Destination file
+        name: Docling document name
+        elements: Resolved body elements in order (read once, not mutated)
+        resolve_refs: Resolves group child refs to elements (unknown refs dropped)
+
+    Raises:
+        ElementCacheError: If the cache cannot be written
+    """
+    temp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    packer = msgpack.Packer()
+    child_refs: List[str] = []
+    written = 0
+
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(packer.pack({"format": ELEMENT_CACHE_FORMAT, "name": name}))
+            for element in elements:
+                f.write(packer.pack(_prune(element)))
+                written += 1
+                for child in element.get("children", []):
+                    ref = child.get("$ref")
+                    if ref:
+                        child_refs.append(ref)
+            f.write(packer.pack(None))
+
+            refs = {
+                child["self_ref"]: _prune(child)
+                for child in resolve_refs(child_refs)
+            }
+            f.write(packer.pack(refs))
+        os.replace(temp_path, path)
+    except (OSError, ValueError, TypeError) as e:
+        temp_path.unlink(missing_ok=True)
+        raise ElementCacheError(f"Failed to write element cache {path}: {e}") from e
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Wrote element cache with {written} elements to {path}")
+
+
+def read_element_cache(
+    path: Path,
+) -> Tuple[Optional[str], List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Read an element cache.
+
+    Args:
+        path: Cache file
+
+    Returns:
+        Tuple of (document name, body elements, group child refs)
+
+    Raises:
+        ElementCacheError: If the cache is missing, corrupt or of another format
+    """
+    try:
+        with open(path, "rb") as f:
+            unpacker = msgpack.Unpacker(f, raw=False, strict_map_key=False)
+            header = unpacker.unpack()
+            if not isinstance(header, dict) or header.get("format") != ELEMENT_CACHE_FORMAT:
+                raise ElementCacheError(
+                    f"Unsupported element cache format in {path}: "
+                    f"{header.get('format') if isinstance(header, dict) else header!r}"
+                )
+
+            elements = []
+            while (element := unpacker.unpack()) is not None:
+                label = element.get("label")
+                if label is not None:
+                    element["label"] = sys.intern(label)
+                elements.append(element)
+            refs = unpacker.unpack()
+    except FileNotFoundError as e:
+        raise ElementCacheError(f"Element cache not found: {path}") from e
+    except (OSError, ValueError, KeyError, TypeError, AttributeError, msgpack.OutOfData) as e:
+        raise ElementCacheError(f"Failed to read element cache {path}: {e}") from e
+
+    return header.get("name"), elements, refs
+
+
+class CachedMarkdownGenerator(RichMarkdownGenerator):
+    """RichMarkdownGenerator over elements loaded from an element cache."""
+
+    def __init__(
+        self,
+        name: Optional[str],
+        body_elements: List[Dict[str, Any]],
+        refs: Dict[str, Dict[str, Any]],
+        boilerplate: Optional[BoilerplateFilter] = None,
+    ):
+        """Initialize with the contents of read_element_cache."""
+        # Deliberately skip RichMarkdownGenerator.__init__: elements are resolved
+        self.json_data = {"name": name}
+        self.body_elements = body_elements
+        self._refs = refs
+        self.boilerplate = boilerplate or BoilerplateFilter()
+
+    def _resolve_ref(self, ref: str) -> Optional[Dict[str, Any]]:
+        """Resolve a group child ref from the cached refs."""
+        return self._refs.get(ref) if ref else None
@@ -6,30 +6,98 @@ Follows the hybrid file-based architecture where content lives in files and meta
 """
 import json
 import logging
+import os
 import re
 import shutil
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from app.core.config import settings
+from app.services.chapter_cache import (
+    ChapterCache,
+    FileIdentity,
+    get_chapter_cache,
+    stat_identity,
+)
+from app.services.chapter_parts import (
+    parts_dir,
+    read_manifest,
+    remove_parts,
+    split_chapter,
+    write_parts,
+)
+from app.services.chapter_variants import (
+    ZSTD_AVAILABLE,
+    accepted_encodings,
+    compress,
+    read_variant,
+    remove_variants,
+    write_variant,
+)
+from app.services.version_clone import clone_tree
+from app.services.version_pack import (
+    PACKED_DIRECTORIES,
+    VersionPackError,
+    get_pack,
+    remove_pack,
+    write_pack,
+)
 
 logger = logging.getLogger(__name__)
 
+_NON_WHITESPACE = re.compile(r"\S")
+
+ELEMENT_CACHE_FILENAME = "elements.msgpack"
+
 
 class FileStorageError(Exception):
     """Raised when file storage operations fail."""
     pass
 
 
+class ChapterPartNotFoundError(FileStorageError):
+    """Raised when a chapter has no part with the requested anchor."""
+    pass
+
+
 class FileStorageService:
     """Manage file system operations for document storage."""
 
-    def __init__(self, base_path: str = "storage/documents"):
+    def __init__(
+        self,
+        base_path: str = "storage/documents",
+        chapter_split_threshold: Optional[int] = None,
+        chapter_cache: Optional[ChapterCache] = None,
+        precompression: Optional[str] = None,
+    ):
         """
         Initialize file storage service.
 
         Args:
             base_path: Base directory for document storage
+            chapter_split_threshold: Chapters larger than this many bytes are
+                also stored as parts (defaults to settings.chapter_split_threshold;
+                0 disables)
+            chapter_cache: Cache for read_chapter (defaults to the
+                process-wide cache sized by settings.chapter_cache_bytes)
+            precompression: Encoding of the compressed variant written with
+                each chapter, "gzip", "zstd" or "none" (defaults to
+                settings.chapter_precompression)
         """
         self._base_path = Path(base_path)
+        self._split_threshold = (
+            settings.chapter_split_threshold
+            if chapter_split_threshold is None
+            else chapter_split_threshold
+        )
+        self._chapter_cache = chapter_cache or get_chapter_cache()
+        self._precompression: Optional[str] = precompression or settings.chapter_precompression
+        if self._precompression == "none":
+            self._precompression = None
+        elif self._precompression == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard is not installed; writing gzip chapter variants instead")
+            self._precompression = "gzip"
         self._base_path.mkdir(parents=True, exist_ok=True)
         logger.info(f"FileStorageService initialized with base_path: {self._base_path}")
 
@@ -62,12 +130,14 @@ class FileStorageService:
             self.ensure_directory_structure(doc_slug, version)
 
             # Generate filename
-            title_slug = self._slugify(title)
-            filename = f"chapter-{chapter_number:02d}-{title_slug}.md"
+            filename = self._chapter_filename(chapter_number, title)
             file_path = self._get_chapter_path(doc_slug, version) / filename
 
             # Write content to file
-            file_path.write_text(content, encoding="utf-8")
+            self._atomic_write_text(file_path, content)
+            self._sync_chapter_parts(file_path, content)
+            self._sync_chapter_variant(file_path)
+            self._drop_pack(file_path)
             logger.info(f"Saved chapter {chapter_number} to {file_path}")
 
             # Return relative path
@@ -76,10 +146,98 @@ class FileStorageService:
         except (OSError, IOError) as e:
             raise FileStorageError(f"Failed to save chapter {chapter_number}: {e}") from e
 
+    def link_chapter(
+        self,
+        source_path: str,
+        doc_slug: str,
+        version: str,
+        chapter_number: int,
+        title: str,
+    ) -> str:
+        """
+        Reuse an existing chapter file (e.g. from the previous version) unchanged.
+
+        The file is hardlinked into place, falling back to a copy where
+        hardlinks are not supported. Chapter writes always replace the file,
+        so editing either copy never changes the other.
+
+        Args:
+            source_path: Relative path of the existing chapter file
+            doc_slug: Document slug
+            version: Target version string
+            chapter_number: Chapter number
+            title: Chapter title
+
+        Returns:
+            Relative file path of the chapter in the target version
+
+        Raises:
+            FileStorageError: If the source is missing or linking fails
+        """
+        try:
+            source = self._base_path / source_path
+            self._validate_path(source)
+            if not source.exists():
+                raise FileStorageError(f"Chapter file not found: {source_path}")
+
+            self.ensure_directory_structure(doc_slug, version)
+            filename = self._chapter_filename(chapter_number, title)
+            target = self._get_chapter_path(doc_slug, version) / filename
+
+            if target.exists() and os.path.samefile(source, target):
+                return str(target.relative_to(self._base_path))
+
+            temp = target.with_name(f".{target.name}.{uuid4().hex}.tmp")
+            try:
+                os.link(source, temp)
+            except OSError:
+                shutil.copy2(source, temp)
+            os.replace(temp, target)
+            self._refresh_chapter_parts(target)
+            self._refresh_chapter_variant(target)
+            self._drop_pack(target)
+            logger.debug(f"Linked chapter {chapter_number} from {source_path}")
+
+            return str(target.relative_to(self._base_path))
+
+        except (OSError, IOError, shutil.Error) as e:
+            raise FileStorageError(f"Failed to link chapter {chapter_number}: {e}") from e
+
+    def update_chapter(self, file_path: str, content: str) -> None:
+        """
+        Overwrite an existing chapter file (manual edits).
+
+        Args:
+            file_path: Relative path from base_path
+            content: New markdown content
+
+        Raises:
+            FileStorageError: If file not found or write fails
+        """
+        try:
+            full_path = self._base_path / file_path
+            self._validate_path(full_path)
+
+            if not full_path.exists():
+                raise FileStorageError(f"Chapter file not found: {file_path}")
+
+            self._atomic_write_text(full_path, content)
+            self._sync_chapter_parts(full_path, content)
+            self._sync_chapter_variant(full_path)
+            self._drop_pack(full_path)
+            logger.info(f"Updated chapter at {file_path}")
+
+        except (OSError, IOError) as e:
+            raise FileStorageError(f"Failed to update chapter {file_path}: {e}") from e
+
     def read_chapter(self, file_path: str) -> str:
         """
         Read chapter content from file.
 
+        Content is served from the chapter cache while the file is
+        unchanged, else from the version's pack file while it holds the
+        file's current content, else from the file.
+
         Args:
             file_path: Relative path from base_path
 
@@ -91,15 +249,26 @@ class FileStorageService:
         """
         try:
             full_path = self._base_path / file_path
-            self._validate_path(full_path)
+            key = str(self._validate_path(full_path))
 
-            if not full_path.exists():
+            try:
+                identity = stat_identity(full_path.stat())
+            except FileNotFoundError:
                 raise FileStorageError(f"Chapter file not found: {file_path}")
 
-            content = full_path.read_text(encoding="utf-8")
+            content = self._chapter_cache.get(key, identity)
+            if content is not None:
+                return content
+
+            data = self._read_packed(full_path, identity)
+            if data is None:
+                with open(full_path, "rb") as f:
+                    # Identity of the file actually read (it may have been replaced since the stat)
+                    identity = stat_identity(os.fstat(f.fileno()))
+                    data = f.read()
 
-            # Strip YAML frontmatter if present
-            content = self._strip_frontmatter(content)
+            content = self._decode_chapter(data)
+            self._chapter_cache.put(key, identity, content, len(data))
 
             logger.debug(f"Read chapter from {file_path}")
             return content
@@ -107,6 +276,285 @@ class FileStorageService:
         except (OSError, IOError) as e:
             raise FileStorageError(f"Failed to read chapter from {file_path}: {e}") from e
 
+    def read_chapter_encoded(
+        self, file_path: str, accept_encoding: Optional[str] = None
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        Read a chapter body as bytes for an HTTP response, pre-compressed if possible.
+
+        The compressed variant is returned when the client accepts its
+        encoding. Reading never writes: without a current variant (it failed
+        to write, or the chapter was edited outside the service) the plain
+        body is returned until the chapter is next written.
+
+        Args:
+            file_path: Relative path from base_path
+            accept_encoding: The request's Accept-Encoding header
+
+        Returns:
+            Tuple of (body, content encoding); encoding is None for the
+            plain UTF-8 body
+
+        Raises:
+            FileStorageError: If file not found or read fails
+        """
+        encoding = self._precompression
+        if encoding is not None and encoding in accepted_encodings(accept_encoding):
+            full_path = self._base_path / file_path
+            self._validate_path(full_path)
+            try:
+                data = read_variant(full_path, encoding)
+                if data is not None:
+                    return data, encoding
+            except FileNotFoundError:
+                raise FileStorageError(f"Chapter file not found: {file_path}")
+            except OSError as e:
+                # The plain body is still servable
+                logger.warning(f"Chapter variant of {file_path} unavailable: {e}")
+
+        return self.read_chapter(file_path).encode("utf-8"), None
+
+    def read_chapter_manifest(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the part manifest of a split chapter.
+
+        Parts are written with the chapter file; reading never writes. A
+        chapter without a current manifest (its parts failed to write, or it
+        was edited outside the service) is served whole until it is next
+        written.
+
+        Args:
+            file_path: Relative chapter path from base_path
+
+        Returns:
+            Manifest with the parts' index, anchor, title, file and size,
+            or None if the chapter has no current parts
+
+        Raises:
+            FileStorageError: If the chapter is missing or cannot be read
+        """
+        try:
+            full_path = self._base_path / file_path
+            self._validate_path(full_path)
+            size = full_path.stat().st_size
+        except FileNotFoundError:
+            raise FileStorageError(f"Chapter file not found: {file_path}")
+        except OSError as e:
+            raise FileStorageError(f"Failed to read chapter parts of {file_path}: {e}") from e
+
+        manifest = read_manifest(full_path)
+        if manifest is None and self._split_threshold and size > self._split_threshold:
+            logger.warning(f"Chapter {file_path} has no current parts; serving it whole")
+        return manifest
+
+    def read_chapter_part(self, file_path: str, anchor: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Read one part of a chapter by anchor.
+
+        Chapters below the split threshold are split in memory, so every
+        chapter can be fetched part by part.
+
+        Args:
+            file_path: Relative chapter path from base_path
+            anchor: Part anchor from the manifest
+
+        Returns:
+            Tuple of (manifest entry, part markdown)
+
+        Raises:
+            ChapterPartNotFoundError: If the chapter has no such part
+            FileStorageError: If the chapter or part cannot be read
+        """
+        # A part may be removed by a concurrent rewrite; reload the manifest once
+        for _ in range(2):
+            manifest = self.read_chapter_manifest(file_path)
+            if manifest is None:
+                content = self.read_chapter(file_path)
+                for part in split_chapter(content):
+                    if part.anchor == anchor:
+                        entry = {
+                            "index": part.index,
+                            "anchor": part.anchor,
+                            "title": part.title,
+                            "size": len(part.content.encode("utf-8")),
+                        }
+                        return entry, part.content
+                break
+
+            entry = next((p for p in manifest["parts"] if p["anchor"] == anchor), None)
+            if entry is None:
+                break
+            part_path = parts_dir(self._base_path / file_path) / entry["file"]
+            try:
+                return entry, part_path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            except (OSError, IOError) as e:
+                raise FileStorageError(f"Failed to read chapter part {anchor}: {e}") from e
+
+        raise ChapterPartNotFoundError(f"Chapter {file_path} has no part '{anchor}'")
+
+    def pack_version(self, doc_slug: str, version: str) -> int:
+        """
+        Write the pack file of a version's chapters and linked documents.
+
+        Args:
+            doc_slug: Document slug
+            version: Version string
+
+        Returns:
+            Number of files packed
+
+        Raises:
+            FileStorageError: If the pack cannot be written
+        """
+        version_path = self._get_version_path(doc_slug, version)
+        try:
+            files, size = write_pack(version_path)
+        except VersionPackError as e:
+            raise FileStorageError(str(e)) from e
+        logger.info(f"Packed {files} files ({size / 1e6:.1f} MB) of {doc_slug}/{version}")
+        return files
+
+    def _pack_location(self, path: Path) -> Optional[Tuple[Path, str]]:
+        """Version directory and pack member of a file, if packed files include it."""
+        try:
+            parts = path.relative_to(self._base_path).parts
+        except ValueError:
+            return None
+        if len(parts) < 5 or parts[1] != "versions" or parts[3] not in PACKED_DIRECTORIES:
+            return None
+        return self._get_version_path(parts[0], parts[2]), "/".join(parts[3:])
+
+    def _read_packed(self, path: Path, identity: FileIdentity) -> Optional[memoryview]:
+        """
+        Zero-copy bytes of a file from its version's pack.
+
+        Args:
+            path: Loose file
+            identity: Current (mtime_ns, size, inode) of the loose file
+
+        Returns:
+            The packed bytes, or None if the version has no pack or the file
+            changed since it was packed (e.g. edited outside the service)
+        """
+        location = self._pack_location(path)
+        if location is None:
+            return None
+        pack = get_pack(location[0])
+        if pack is None:
+            return None
+        member = location[1]
+        if pack.source_identity(member) != identity:
+            return None
+        return pack.read(member)
+
+    def _drop_pack(self, path: Path) -> None:
+        """Delete the pack of the version a packed file belongs to (it was rewritten)."""
+        location = self._pack_location(path)
+        if location is not None:
+            remove_pack(location[0])
+
+    def _decode_chapter(self, data: bytes) -> str:
+        """Chapter body as served: decoded, newlines normalised, frontmatter stripped."""
+        # Binary read + decode: text-mode reads translate newlines in Python
+        # code holding the GIL, ~10x slower on multi-MB chapters
+        content = str(data, "utf-8")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+        # Strip YAML frontmatter if present
+        return self._strip_frontmatter(content)
+
+    def _write_chapter_variant(self, full_path: Path, encoding: str) -> bytes:
+        """Compress a chapter's body into its variant file; returns the variant."""
+        with open(full_path, "rb") as f:
+            # Key the variant on the file actually compressed
+            identity = stat_identity(os.fstat(f.fileno()))
+            data = f.read()
+        compressed = compress(self._decode_chapter(data).encode("utf-8"), encoding)
+        write_variant(full_path, encoding, compressed, identity)
+        return compressed
+
+    def _sync_chapter_variant(self, full_path: Path) -> None:
+        """
+        Write (or remove) a chapter's compressed variant after the chapter was written.
+
+        Variants are derived data: failures are logged, and the chapter is
+        served uncompressed until it is written again.
+        """
+        try:
+            if self._precompression is None:
+                remove_variants(full_path)
+            else:
+                self._write_chapter_variant(full_path, self._precompression)
+        except OSError as e:
+            logger.warning(f"Compressed variant not written for {full_path}: {e}")
+
+    def _refresh_chapter_variant(self, full_path: Path) -> None:
+        """
+        Rebuild a chapter's compressed variant if it was not made from its file.
+
+        For chapter files placed without being written here (reused by
+        hardlink, cloned or copied with their version).
+        """
+        if self._precompression is None:
+            return
+        try:
+            if read_variant(full_path, self._precompression) is not None:
+                return
+        except OSError as e:
+            logger.warning(f"Compressed variant not refreshed for {full_path}: {e}")
+            return
+        self._sync_chapter_variant(full_path)
+
+    def _refresh_chapter_parts(self, full_path: Path) -> None:
+        """
+        Rebuild a chapter's parts if they do not describe its file.
+
+        For chapter files placed without being written here (reused by
+        hardlink, cloned or copied with their version). Chapters that are
+        too small to split are not read.
+        """
+        try:
+            if read_manifest(full_path) is not None:
+                return
+            # The file size bounds the body size (frontmatter included)
+            too_small = (
+                not self._split_threshold
+                or full_path.stat().st_size <= self._split_threshold
+            )
+            if too_small and not parts_dir(full_path).exists():
+                return
+            content = full_path.read_text(encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Chapter parts not refreshed for {full_path}: {e}")
+            return
+        self._sync_chapter_parts(full_path, content)
+
+    def _sync_chapter_parts(self, full_path: Path, content: str) -> Optional[Dict[str, Any]]:
+        """
+        Write (or remove) a chapter's parts after the chapter file was written.
+
+        Parts are derived data: failures are logged, and the chapter is
+        served whole until it is written again.
+
+        Returns:
+            The manifest, or None if the chapter is not split
+        """
+        body = self._strip_frontmatter(content)
+        try:
+            if not self._split_threshold or len(body.encode("utf-8")) <= self._split_threshold:
+                remove_parts(full_path)
+                return None
+
+            manifest = write_parts(full_path, split_chapter(body))
+            logger.info(f"Split {full_path.name} into {len(manifest['parts'])} parts")
+            return manifest
+        except OSError as e:
+            logger.warning(f"Chapter parts not written for {full_path}: {e}")
+            return None
+
     def _strip_frontmatter(self, content: str) -> str:
         """
         Strip YAML frontmatter from markdown content.
@@ -120,11 +568,11 @@ class FileStorageService:
             Markdown content without frontmatter
         """
         if content.startswith("---"):
-            # Find the closing ---
-            parts = content.split("---", 2)
-            if len(parts) >= 3:
-                # parts[0] is empty, parts[1] is frontmatter, parts[2] is content
-                return parts[2].lstrip()
+            # Find the closing --- (slice once instead of splitting and stripping copies)
+            end = content.find("---", 3)
+            if end != -1:
+                body = _NON_WHITESPACE.search(content, end + 3)
+                return content[body.start():] if body else ""
         return content
 
     def save_metadata(
@@ -151,9 +599,9 @@ class FileStorageService:
             self.ensure_directory_structure(doc_slug, version)
 
             metadata_path = self._get_version_path(doc_slug, version) / "metadata.json"
-            metadata_path.write_text(
+            self._atomic_write_text(
+                metadata_path,
                 json.dumps(metadata, indent=2, ensure_ascii=False),
-                encoding="utf-8"
             )
             logger.info(f"Saved metadata to {metadata_path}")
 
@@ -189,6 +637,38 @@ class FileStorageService:
         except (OSError, IOError, json.JSONDecodeError) as e:
             raise FileStorageError(f"Failed to read metadata: {e}") from e
 
+    def save_element_cache(self, doc_slug: str, version: str, source: Path) -> str:
+        """
+        Move a freshly written element cache into the version directory.
+
+        Args:
+            doc_slug: Document slug
+            version: Version string
+            source: Element cache written during generation
+
+        Returns:
+            Relative file path
+
+        Raises:
+            FileStorageError: If the move fails
+        """
+        try:
+            self.ensure_directory_structure(doc_slug, version)
+
+            target = self.element_cache_path(doc_slug, version)
+            # shutil.move renames on the same filesystem, copies across
+            shutil.move(str(source), target)
+            logger.info(f"Saved element cache to {target}")
+
+            return str(target.relative_to(self._base_path))
+
+        except (OSError, IOError, shutil.Error) as e:
+            raise FileStorageError(f"Failed to save element cache: {e}") from e
+
+    def element_cache_path(self, doc_slug: str, version: str) -> Path:
+        """Path of a version's element cache (may not exist)."""
+        return self._get_version_path(doc_slug, version) / ELEMENT_CACHE_FILENAME
+
     def get_active_version(self, doc_slug: str) -> Optional[str]:
         """
         Read active_version.txt.
@@ -266,7 +746,8 @@ class FileStorageService:
             links_path.mkdir(exist_ok=True)
 
             file_path = links_path / filename
-            file_path.write_text(content, encoding="utf-8")
+            self._atomic_write_text(file_path, content)
+            self._drop_pack(file_path)
             logger.info(f"Saved linked document to {file_path}")
 
             return str(file_path.relative_to(self._base_path))
@@ -324,18 +805,28 @@ class FileStorageService:
         doc_slug: str,
         from_version: str,
         to_version: str,
+        clone: Optional[bool] = None,
     ) -> None:
         """
         Copy entire version directory (for creating drafts).
 
+        By default files are cloned rather than copied: reflinked where the
+        file system supports it, hardlinked otherwise (see version_clone).
+        Both versions share data until one of them rewrites a file.
+
         Args:
             doc_slug: Document slug
             from_version: Source version
             to_version: Target version
+            clone: Share file data with the source instead of copying it
+                (defaults to settings.version_clone)
 
         Raises:
             FileStorageError: If copy fails
         """
+        if clone is None:
+            clone = settings.version_clone
+
         try:
             from_path = self._get_version_path(doc_slug, from_version)
             to_path = self._get_version_path(doc_slug, to_version)
@@ -346,8 +837,28 @@ class FileStorageService:
             if to_path.exists():
                 raise FileStorageError(f"Target version already exists: {to_version}")
 
-            shutil.copytree(from_path, to_path)
-            logger.info(f"Copied version directory from {from_version} to {to_version}")
+            if clone:
+                try:
+                    counts = clone_tree(from_path, to_path)
+                except OSError:
+                    shutil.rmtree(to_path, ignore_errors=True)
+                    raise
+                logger.info(
+                    f"Cloned version directory from {from_version} to {to_version} "
+                    f"({counts['reflink']} reflinked, {counts['hardlink']} hardlinked, "
+                    f"{counts['copy']} copied)"
+                )
+            else:
+                shutil.copytree(from_path, to_path)
+                logger.info(f"Copied version directory from {from_version} to {to_version}")
+
+            # Manifests and variants record their chapter's inode, which
+            # changes unless the chapter was hardlinked
+            chapters_path = to_path / "chapters"
+            if chapters_path.is_dir():
+                for chapter_path in chapters_path.glob("*.md"):
+                    self._refresh_chapter_parts(chapter_path)
+                    self._refresh_chapter_variant(chapter_path)
 
         except (OSError, IOError, shutil.Error) as e:
             raise FileStorageError(f"Failed to copy version directory: {e}") from e
@@ -370,12 +881,28 @@ class FileStorageService:
                 logger.warning(f"Version directory not found: {version_path}")
                 return
 
+            remove_pack(version_path)
             shutil.rmtree(version_path)
             logger.info(f"Deleted version directory: {version_path}")
 
         except (OSError, IOError, shutil.Error) as e:
             raise FileStorageError(f"Failed to delete version directory: {e}") from e
 
+    def list_documents(self) -> List[str]:
+        """
+        List the slugs of all stored documents.
+
+        Returns:
+            Sorted document slugs
+
+        Raises:
+            FileStorageError: If read fails
+        """
+        try:
+            return sorted(d.name for d in self._base_path.iterdir() if (d / "versions").is_dir())
+        except (OSError, IOError) as e:
+            raise FileStorageError(f"Failed to list documents: {e}") from e
+
     def list_versions(self, doc_slug: str) -> List[str]:
         """
         List all versions for a document.
@@ -529,7 +1056,7 @@ class FileStorageService:
             if not full_path.exists():
                 raise FileStorageError(f"User document not found: {file_path}")
 
-            full_path.write_text(content, encoding="utf-8")
+            self._atomic_write_text(full_path, content)
             logger.info(f"Updated user document at {file_path}")
 
         except (OSError, IOError) as e:
@@ -605,6 +1132,25 @@ class FileStorageService:
         """Get path to chapters directory."""
         return self._get_version_path(doc_slug, version) / "chapters"
 
+    def _chapter_filename(self, chapter_number: int, title: str) -> str:
+        """Get chapter filename (e.g. chapter-05-chapter-5-unsolicited-messages.md)."""
+        return f"chapter-{chapter_number:02d}-{self._slugify(title)}.md"
+
+    def _atomic_write_text(self, path: Path, content: str) -> None:
+        """
+        Write a file by replacing it, never by truncating it in place.
+
+        Readers never see a partial file, and files hardlinked into other
+        versions (incremental ingest, cloned drafts) keep their content.
+        """
+        temp = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+        try:
+            temp.write_text(content, encoding="utf-8")
+            os.replace(temp, path)
+        except BaseException:
+            temp.unlink(missing_ok=True)
+            raise
+
     def _slugify(self, text: str) -> str:
         """
         Convert text to filename-safe slug.
@@ -628,17 +1174,22 @@ class FileStorageService:
         # Limit length
         return text[:50]
 
-    def _validate_path(self, path: Path) -> None:
+    def _validate_path(self, path: Path) -> Path:
         """
         Validate that path is within base_path (prevent directory traversal).
 
         Args:
             path: Path to validate
 
+        Returns:
+            The resolved path
+
         Raises:
             FileStorageError: If path is outside base_path
         """
         try:
-            path.resolve().relative_to(self._base_path.resolve())
+            resolved = path.resolve()
+            resolved.relative_to(self._base_path.resolve())
+            return resolved
         except ValueError:
             raise FileStorageError(f"Invalid path: {path} (outside base directory)")
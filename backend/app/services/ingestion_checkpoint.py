@@ -0,0 +1,252 @@
+"""
+Checkpoints that let a failed or interrupted ingestion resume.
+
+Two things are checkpointed for a job:
+
+- Generated chapters. Once generation succeeds, the chapter dicts are saved
+  next to the upload (``{upload}.chapters.msgpack``). A retry with the same
+  generator configuration loads them instead of parsing and generating again.
+- Committed chapters. Chapter rows are written in batches. Each batch's
+  transaction also records the row id, chapter number and content hash of
+  every row it inserts in the job's ``checkpoint`` column. A retry skips
+  chapters whose row is still there with the same number and content hash.
+
+The base class is a no-op: callers without a job (regeneration) write all
+rows in one transaction. JobCheckpoint persists to the ingestion_jobs row.
+
+The upload and its checkpoint files are removed when the job completes. A
+failed job keeps them for a retry until the ingestion worker sweeps them
+(``settings.ingest_failed_retention_hours``).
+"""
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import msgpack
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Chapter, IngestionJob
+
+logger = logging.getLogger(__name__)
+
+# Bump when the saved chapter dict shape changes
+GENERATED_CHECKPOINT_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class CommittedChapter:
+    """A chapter row committed by an earlier attempt of the same job."""
+
+    id: UUID
+    chapter_number: int
+    content_hash: str
+
+
+class IngestionCheckpoint:
+    """Checkpoint sink that records nothing (every attempt starts from zero)."""
+
+    # Whether chapter rows should be committed batch by batch
+    enabled = False
+
+    async def committed(
+        self,
+        db: AsyncSession,
+        version_id: UUID,
+    ) -> List[CommittedChapter]:
+        """Chapters of ``version_id`` committed by earlier attempts."""
+        return []
+
+    async def record(
+        self,
+        db: AsyncSession,
+        version_id: UUID,
+        chapters: List[CommittedChapter],
+    ) -> None:
+        """Record chapters in the caller's transaction (committed with their rows)."""
+
+
+class JobCheckpoint(IngestionCheckpoint):
+    """Persists committed chapters in an ingestion job's ``checkpoint`` column."""
+
+    enabled = True
+
+    def __init__(self, job_id: UUID) -> None:
+        """
+        Initialize checkpointing.
+
+        Args:
+            job_id: IngestionJob being processed
+        """
+        self._job_id = job_id
+        self._state: Dict[str, Any] = {}
+
+    async def committed(
+        self,
+        db: AsyncSession,
+        version_id: UUID,
+    ) -> List[CommittedChapter]:
+        """
+        Load committed chapters, keeping only rows that still exist unchanged.
+
+        Args:
+            db: Database session
+            version_id: Version being written
+
+        Returns:
+            CommittedChapter per surviving row
+        """
+        state = await db.scalar(
+            select(IngestionJob.checkpoint).where(IngestionJob.id == self._job_id)
+        ) or {}
+        recorded = (
+            state.get("chapters", {})
+            # Otherwise a first attempt, or the version was recreated since
+            if state.get("version_id") == str(version_id)
+            else {}
+        )
+        self._state = {"version_id": str(version_id), "chapters": {}}
+        if not recorded:
+            return []
+
+        result = await db.execute(
+            select(Chapter.id, Chapter.chapter_number, Chapter.content_hash).where(
+                Chapter.version_id == version_id,
+                Chapter.id.in_([UUID(row_id) for row_id in recorded]),
+            )
+        )
+        committed = [
+            CommittedChapter(id=row_id, chapter_number=number, content_hash=content_hash)
+            for row_id, number, content_hash in result
+            if recorded[str(row_id)] == {
+                "chapter_number": number,
+                "content_hash": content_hash,
+            }
+        ]
+        for chapter in committed:
+            self._state["chapters"][str(chapter.id)] = recorded[str(chapter.id)]
+
+        logger.info(f"Job {self._job_id} checkpoint: {len(committed)} committed chapters")
+        return committed
+
+    async def record(
+        self,
+        db: AsyncSession,
+        version_id: UUID,
+        chapters: List[CommittedChapter],
+    ) -> None:
+        self._state.setdefault("version_id", str(version_id))
+        recorded = self._state.setdefault("chapters", {})
+        for chapter in chapters:
+            recorded[str(chapter.id)] = {
+                "chapter_number": chapter.chapter_number,
+                "content_hash": chapter.content_hash,
+            }
+        await db.execute(
+            update(IngestionJob)
+            .where(IngestionJob.id == self._job_id)
+            .values(checkpoint=self._state)
+        )
+
+
+def generated_checkpoint_path(upload_path: Path) -> Path:
+    """Where generated chapters for an upload are checkpointed."""
+    return upload_path.with_name(f"{upload_path.name}.chapters.msgpack")
+
+
+def element_cache_checkpoint_path(upload_path: Path) -> Path:
+    """Where the element cache of an upload is kept until its version is saved."""
+    return upload_path.with_name(f"{upload_path.name}.elements.msgpack")
+
+
+def remove_upload_artifacts(upload_path: Path) -> int:
+    """
+    Delete an upload and its checkpoint files.
+
+    Args:
+        upload_path: Uploaded file of a job
+
+    Returns:
+        Number of files deleted
+    """
+    removed = 0
+    for path in (
+        upload_path,
+        generated_checkpoint_path(upload_path),
+        element_cache_checkpoint_path(upload_path),
+    ):
+        try:
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def save_generated_chapters(
+    path: Path,
+    generator_hash: str,
+    chapters: List[Dict[str, Any]],
+    boilerplate_hits: Dict[str, int],
+) -> None:
+    """
+    Save generated chapter dicts atomically (failures are logged, not raised).
+
+    Args:
+        path: Destination file
+        generator_hash: generator_config_hash the chapters were produced with
+        chapters: Chapter dicts from DocumentProcessor._parse_file
+        boilerplate_hits: Boilerplate hits per rule from generation
+    """
+    temp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    payload = {
+        "format": GENERATED_CHECKPOINT_FORMAT,
+        "generator_hash": generator_hash,
+        "chapters": chapters,
+        "boilerplate_hits": boilerplate_hits,
+    }
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(msgpack.packb(payload))
+        os.replace(temp_path, path)
+    except (OSError, ValueError, TypeError) as e:
+        temp_path.unlink(missing_ok=True)
+        logger.warning(f"Generated chapters not checkpointed to {path}: {e}")
+
+
+def load_generated_chapters(
+    path: Path,
+    generator_hash: str,
+) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, int]]]:
+    """
+    Load generated chapters saved by an earlier attempt.
+
+    Args:
+        path: Checkpoint file
+        generator_hash: Current generator_config_hash
+
+    Returns:
+        Tuple of (chapter dicts, boilerplate hits), or None if there is no
+        usable checkpoint (missing, unreadable or from another generator)
+    """
+    try:
+        with open(path, "rb") as f:
+            payload = msgpack.unpackb(f.read(), raw=False)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, msgpack.ExtraData) as e:
+        logger.warning(f"Ignoring unreadable chapter checkpoint {path}: {e}")
+        return None
+
+    if (
+        not isinstance(payload, dict)
+        or payload.get("format") != GENERATED_CHECKPOINT_FORMAT
+        or payload.get("generator_hash") != generator_hash
+    ):
+        logger.info(f"Ignoring chapter checkpoint {path} from another generator")
+        return None
+
+    return payload["chapters"], payload.get("boilerplate_hits", {})
@@ -0,0 +1,438 @@
+"""
+Process pool for CPU-bound ingestion work.
+
+Markdown generation from Docling JSON is regex and table heavy. Running it
+inside the API process (even from a background task) holds the GIL and stalls
+every request. This module owns a ProcessPoolExecutor that generation work is
+shipped to: the worker receives only a file path and returns the generated
+ChapterMarkdown list (with parse/generate timings).
+
+Generation can additionally fan chapters out over a short-lived second pool
+(``settings.ingest_chapter_workers``) started by whichever process runs it:
+each chapter is rendered from its own element slice and the results are
+reassembled in document order. Every generation worker may run such a pool
+at once, so each pool is capped at the CPU count divided by the number of
+generation workers (``chapter_worker_count``): all chapter processes
+together never outnumber the CPUs.
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+from uuid import uuid4
+
+from app.core.config import settings
+from app.services.boilerplate_filter import DEFAULT_RULE_SET, BoilerplateFilter, element_lines
+from app.services.compressed_input import open_docling_input
+from app.services.docling_structs import (
+    TYPED_DECODE_AVAILABLE,
+    TypedRichMarkdownGenerator,
+    decode_docling_json,
+    to_builtins,
+    typed_element_lines,
+)
+from app.services.docling_stream import DoclingSpillIndex, StreamingMarkdownGenerator
+from app.services.element_cache import (
+    CachedMarkdownGenerator,
+    ElementCacheError,
+    read_element_cache,
+    write_element_cache,
+)
+from app.services.rich_markdown_generator import ChapterMarkdown, RichMarkdownGenerator
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# How often a running generation is checked for the end of its parse stage
+STAGE_POLL_INTERVAL = 0.5
+
+
+@dataclass
+class GenerationResult:
+    """Chapters generated by a worker, with timings for progress reporting."""
+
+    chapters: List[ChapterMarkdown]
+    parse_seconds: float
+    generate_seconds: float
+    boilerplate_hits: Dict[str, int]
+
+
+class IngestionExecutorError(Exception):
+    """Raised when the ingestion worker pool is unavailable."""
+    pass
+
+
+def _init_worker() -> None:
+    """Configure logging in freshly spawned worker processes."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+
+def get_ingestion_executor() -> Optional[Executor]:
+    """
+    Get the shared ingestion process pool, creating it on first use.
+
+    Returns:
+        ProcessPoolExecutor, or None when ``settings.ingest_workers`` is 0
+        (generation then runs in a thread of the API process)
+    """
+    global _executor
+
+    if settings.ingest_workers <= 0:
+        return None
+
+    if _executor is None:
+        # spawn: never fork a process that holds an event loop and DB connections
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.ingest_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        logger.info(
+            f"Started ingestion process pool with {settings.ingest_workers} workers "
+            f"({chapter_worker_count()} chapter processes each)"
+        )
+
+    return _executor
+
+
+def chapter_worker_count() -> int:
+    """
+    Processes each generation renders chapters with.
+
+    ``settings.ingest_chapter_workers``, capped at the CPU count divided by
+    the generation workers that may each run a chapter pool at once.
+    Computed in the API process and passed to the worker functions, since
+    spawned workers do not see settings changed at runtime (e.g. by the CLI).
+    """
+    generations = max(settings.ingest_workers, 1)
+    return min(settings.ingest_chapter_workers, (os.cpu_count() or 1) // generations)
+
+
+@contextmanager
+def chapter_executor(workers: int) -> Iterator[Optional[Executor]]:
+    """
+    Process pool for rendering one document's chapters in parallel.
+
+    The pool lives only for one generation: a pool left idle inside an
+    ingestion worker would keep that worker from exiting on shutdown.
+
+    Args:
+        workers: Pool size, from ``chapter_worker_count``
+
+    Yields:
+        ProcessPoolExecutor, or None when ``workers`` is below 2 (chapters
+        are then rendered sequentially)
+    """
+    if workers < 2:
+        yield None
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as executor:
+        yield executor
+
+
+def shutdown_ingestion_executor() -> None:
+    """Shut down the ingestion process pool (called on application shutdown)."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        logger.info("Ingestion process pool shut down")
+
+
+async def run_in_ingestion_executor(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a picklable function in the ingestion pool without blocking the event loop.
+
+    Args:
+        func: Module-level function to run
+        *args: Picklable arguments
+
+    Returns:
+        Function result
+
+    Raises:
+        IngestionExecutorError: If a worker process died (pool is recreated on next use)
+    """
+    global _executor
+
+    executor = get_ingestion_executor()
+    if executor is None:
+        return await asyncio.to_thread(func, *args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, func, *args)
+    except BrokenProcessPool as e:
+        # A worker was killed (e.g. OOM); drop the pool so the next job gets a fresh one
+        logger.error(f"Ingestion worker pool broke: {e}")
+        _executor = None
+        raise IngestionExecutorError(f"Ingestion worker died: {e}") from e
+
+
+async def run_generation(
+    func: Callable[..., GenerationResult],
+    *args: Any,
+    on_parsed: Callable[[], Awaitable[None]],
+) -> GenerationResult:
+    """
+    Run a generation worker function, reporting when its parse stage ends.
+
+    Parsing and generation both run inside one worker call. The worker
+    touches a marker file (its ``parsed_marker`` argument) between the two;
+    it is polled here so the generate stage is announced when it starts.
+
+    Args:
+        func: generate_chapters_from_file or regenerate_chapters_from_cache
+        *args: Picklable arguments
+        on_parsed: Called once generation starts (at the latest when the
+            worker returns)
+
+    Returns:
+        The worker's GenerationResult
+
+    Raises:
+        IngestionExecutorError: If a worker process died
+    """
+    marker = settings.upload_dir / f".parsed-{uuid4().hex}"
+    task = asyncio.ensure_future(
+        run_in_ingestion_executor(partial(func, parsed_marker=str(marker)), *args)
+    )
+    try:
+        announced = False
+        while not task.done():
+            await asyncio.wait({task}, timeout=STAGE_POLL_INTERVAL)
+            if not announced and marker.exists():
+                announced = True
+                await on_parsed()
+        result = task.result()
+        if not announced:
+            await on_parsed()
+        return result
+    finally:
+        task.cancel()
+        marker.unlink(missing_ok=True)
+
+
+def _mark_parsed(parsed_marker: Optional[str]) -> None:
+    """Touch the marker run_generation polls for (never fails generation)."""
+    if parsed_marker:
+        try:
+            Path(parsed_marker).touch()
+        except OSError as e:
+            logger.warning(f"Cannot mark parse stage done: {e}")
+
+
+# =========================================================================
+# Worker functions (run in the pool; must be module-level and picklable)
+#
+# Spawned workers import settings afresh and do not see values changed at
+# runtime, so callers pass every setting generation depends on.
+# =========================================================================
+
+def generate_chapters_from_file(
+    file_path: str,
+    streaming: bool,
+    spill_dir: Optional[str] = None,
+    rule_set: str = DEFAULT_RULE_SET,
+    cache_path: Optional[str] = None,
+    chapter_workers: int = 0,
+    typed_decode: Optional[bool] = None,
+    repeat_fraction: Optional[float] = None,
+    max_decompressed_size: Optional[int] = None,
+    parsed_marker: Optional[str] = None,
+) -> GenerationResult:
+    """
+    Parse a Docling JSON file and generate chapter markdown.
+
+    The optional settings default to the worker's own ``settings``, which
+    misses runtime changes: callers running this in the pool pass them.
+
+    Args:
+        file_path: Path to the Docling JSON file
+        streaming: Use the streaming parser (bounded memory) instead of json.load;
+            otherwise ``typed_decode`` selects typed structs.
+            Compressed files (.json.gz, .json.zst) must be streamed
+        spill_dir: Directory for the streaming parser's temporary index
+        rule_set: Boilerplate rule set (see boilerplate_filter.RULE_SETS)
+        cache_path: Where to write the element cache (skipped if None; a
+            failed write is logged and does not fail generation)
+        chapter_workers: Processes to render chapters with (see
+            ``chapter_worker_count``; below 2 renders sequentially)
+        typed_decode: Decode with msgspec structs when not streaming
+            (defaults to ``settings.docling_typed_decode``)
+        repeat_fraction: Page share for repeated-line detection; 0 disables
+            (defaults to ``settings.boilerplate_repeat_fraction``)
+        max_decompressed_size: Inflated size limit of compressed files
+            (defaults to ``settings.max_decompressed_upload_size``)
+        parsed_marker: File to touch when parsing is done (see run_generation)
+
+    Returns:
+        GenerationResult with chapters in document order and stage timings
+    """
+    if typed_decode is None:
+        typed_decode = settings.docling_typed_decode
+    if repeat_fraction is None:
+        repeat_fraction = settings.boilerplate_repeat_fraction
+    if max_decompressed_size is None:
+        max_decompressed_size = settings.max_decompressed_upload_size
+
+    path = Path(file_path)
+    boilerplate = BoilerplateFilter(rule_set)
+    started = time.perf_counter()
+
+    if streaming:
+        # Compressed uploads are inflated chunk by chunk into the parser
+        with open_docling_input(path, max_decompressed_size) as f:
+            index = DoclingSpillIndex.build(f, Path(spill_dir) if spill_dir else None)
+
+        with index, chapter_executor(chapter_workers) as executor:
+            if cache_path:
+                _write_cache(
+                    Path(cache_path), index.name, index.iter_body_elements(), index.get_many
+                )
+            parsed = time.perf_counter()
+            _mark_parsed(parsed_marker)
+
+            boilerplate.detect_repeated(index.iter_body_lines(), repeat_fraction)
+            generator = StreamingMarkdownGenerator(index, boilerplate)
+            chapters = list(generator.iter_chapters(
+                executor, window=2 * chapter_workers
+            ))
+    elif typed_decode and TYPED_DECODE_AVAILABLE:
+        with open(path, "rb") as f:
+            document = decode_docling_json(f.read())
+        generator = TypedRichMarkdownGenerator(document, boilerplate)
+        if cache_path:
+            _write_cache(
+                Path(cache_path),
+                document.name or None,
+                map(to_builtins, generator.body_elements),
+                lambda refs: map(to_builtins, filter(None, map(generator._resolve_ref, refs))),
+            )
+        parsed = time.perf_counter()
+        _mark_parsed(parsed_marker)
+
+        boilerplate.detect_repeated(
+            typed_element_lines(generator.body_elements), repeat_fraction
+        )
+        # Typed items are rendered in-process (no chapter pool)
+        chapters = generator.generate_chapters()
+    else:
+        if typed_decode:
+            logger.warning("DOCLING_TYPED_DECODE is set but msgspec is not installed")
+        with open(path, "r", encoding="utf-8") as f:
+            docling_json = json.load(f)
+        generator = RichMarkdownGenerator(docling_json, boilerplate)
+        if cache_path:
+            # Before generation: table merging extends grids in place
+            _write_cache(
+                Path(cache_path),
+                docling_json.get("name"),
+                generator.body_elements,
+                lambda refs: filter(None, map(generator._resolve_ref, refs)),
+            )
+        parsed = time.perf_counter()
+        _mark_parsed(parsed_marker)
+
+        boilerplate.detect_repeated(element_lines(generator.body_elements), repeat_fraction)
+        with chapter_executor(chapter_workers) as executor:
+            chapters = generator.generate_chapters(executor)
+
+    return GenerationResult(
+        chapters=chapters,
+        parse_seconds=parsed - started,
+        generate_seconds=time.perf_counter() - parsed,
+        boilerplate_hits=boilerplate.stats(),
+    )
+
+
+def regenerate_chapters_from_cache(
+    cache_path: str,
+    rule_set: str = DEFAULT_RULE_SET,
+    chapter_workers: int = 0,
+    repeat_fraction: Optional[float] = None,
+    parsed_marker: Optional[str] = None,
+) -> GenerationResult:
+    """
+    Generate chapter markdown from a version's element cache.
+
+    Args:
+        cache_path: Element cache written during ingestion
+        rule_set: Boilerplate rule set (see boilerplate_filter.RULE_SETS)
+        chapter_workers: Processes to render chapters with (see
+            ``chapter_worker_count``; below 2 renders sequentially)
+        repeat_fraction: Page share for repeated-line detection; 0 disables
+            (defaults to ``settings.boilerplate_repeat_fraction``)
+        parsed_marker: File to touch when the cache is loaded (see run_generation)
+
+    Returns:
+        GenerationResult (parse_seconds is the cache load time)
+
+    Raises:
+        ElementCacheError: If the cache is missing or unreadable
+    """
+    if repeat_fraction is None:
+        repeat_fraction = settings.boilerplate_repeat_fraction
+
+    boilerplate = BoilerplateFilter(rule_set)
+    started = time.perf_counter()
+
+    name, body_elements, refs = read_element_cache(Path(cache_path))
+    parsed = time.perf_counter()
+    _mark_parsed(parsed_marker)
+
+    boilerplate.detect_repeated(element_lines(body_elements), repeat_fraction)
+    with chapter_executor(chapter_workers) as executor:
+        generator = CachedMarkdownGenerator(name, body_elements, refs, boilerplate)
+        chapters = generator.generate_chapters(executor)
+
+    return GenerationResult(
+        chapters=chapters,
+        parse_seconds=parsed - started,
+        generate_seconds=time.perf_counter() - parsed,
+        boilerplate_hits=boilerplate.stats(),
+    )
+
+
+def _write_cache(
+    path: Path,
+    name: Optional[str],
+    elements: Iterable[Dict[str, Any]],
+    resolve_refs: Callable[[List[str]], Iterable[Dict[str, Any]]],
+) -> None:
+    """Write the element cache; regeneration is an optimization, so never fail ingestion."""
+    try:
+        write_element_cache(path, name, elements, resolve_refs)
+    except ElementCacheError as e:
+        logger.warning(str(e))
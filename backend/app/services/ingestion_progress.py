@@ -0,0 +1,112 @@
+"""
+Stage-level progress reporting for document ingestion.
+
+DocumentProcessor announces each stage (parse, generate, write, index,
+activate) through an IngestionProgress. The base class is a no-op so the
+processor can run without a job; JobProgress persists stage, percentage and
+per-stage timings to the job's ingestion_jobs row; TimingProgress only keeps
+the timings in memory.
+"""
+import logging
+import time
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import update
+
+from app.core.database import AsyncSessionLocal
+from app.models import IngestionJob
+
+logger = logging.getLogger(__name__)
+
+# Ingestion stages in order, with the progress reported when each starts
+STAGE_PROGRESS: Dict[str, int] = {
+    "parse": 5,
+    "generate": 30,
+    "write": 60,
+    "index": 80,
+    "activate": 95,
+}
+
+
+class IngestionProgress:
+    """Progress sink that ignores all updates."""
+
+    async def stage(self, name: str) -> None:
+        """Mark the start of a stage (closes the previous one)."""
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a stage duration measured elsewhere (e.g. in a worker process)."""
+
+    async def finish(self) -> None:
+        """Close the current stage."""
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Per-stage durations in seconds."""
+        return {}
+
+
+class TimingProgress(IngestionProgress):
+    """Records per-stage durations in memory."""
+
+    def __init__(self) -> None:
+        self._timings: Dict[str, float] = {}
+        self._current: Optional[str] = None
+        self._started_at = 0.0
+
+    async def stage(self, name: str) -> None:
+        self._close_current()
+        self._current = name
+        self._started_at = time.perf_counter()
+
+    def record(self, name: str, seconds: float) -> None:
+        self._timings[name] = round(seconds, 3)
+
+    async def finish(self) -> None:
+        self._close_current()
+        self._current = None
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        return dict(self._timings)
+
+    def _close_current(self) -> None:
+        """Record the running stage's duration unless it was recorded explicitly."""
+        if self._current and self._current not in self._timings:
+            self.record(self._current, time.perf_counter() - self._started_at)
+
+
+class JobProgress(TimingProgress):
+    """Persists progress for one ingestion job."""
+
+    def __init__(self, job_id: UUID) -> None:
+        """
+        Initialize progress tracking.
+
+        Args:
+            job_id: IngestionJob being processed
+        """
+        super().__init__()
+        self._job_id = job_id
+
+    async def stage(self, name: str) -> None:
+        await super().stage(name)
+        await self._save(stage=name, progress=STAGE_PROGRESS[name])
+
+    async def finish(self) -> None:
+        await super().finish()
+        await self._save(progress=100)
+
+    async def _save(self, **values) -> None:
+        """Write progress in a short session of its own (never fails the job)."""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(IngestionJob)
+                    .where(IngestionJob.id == self._job_id)
+                    .values(stage_timings=self.timings, **values)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to record progress for job {self._job_id}: {e}")
@@ -0,0 +1,479 @@
+"""
+Durable ingestion job queue.
+
+Uploads are recorded as rows in ``ingestion_jobs`` and processed by an
+IngestionWorker running inside each API process. Because the queue lives in
+PostgreSQL, queued work survives restarts.
+
+Jobs are claimed with ``FOR UPDATE SKIP LOCKED``. A claimed job is leased to
+its worker (``claimed_by``), which renews the lease (``heartbeat_at``) while
+the job runs. A running job whose lease has not been renewed for
+``settings.ingest_job_lease_seconds`` belonged to a worker that died and is
+queued again by any live worker; jobs of a worker that stops cleanly are
+released at once. Jobs still running in another process are never claimed
+twice.
+
+Each worker runs at most ``settings.ingest_max_concurrent_jobs`` jobs at once
+so ingestion cannot starve API traffic of database connections and CPU. At
+most ``max_parallel`` jobs of any one batch upload run across all workers:
+claiming a batch job locks the batch row, so claims of one batch are
+serialised and each sees the others' running jobs. Interrupted and retried
+jobs resume from their checkpoint (see ingestion_checkpoint). The upload and
+checkpoint files of a failed job are deleted once it has not been retried
+for ``settings.ingest_failed_retention_hours``.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Set
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import IngestionBatch, IngestionJob
+from app.services.document_processor_v2 import DocumentProcessor
+from app.services.ingestion_checkpoint import JobCheckpoint, remove_upload_artifacts
+from app.services.ingestion_progress import JobProgress
+
+logger = logging.getLogger(__name__)
+
+# Seconds between sweeps for the files of failed jobs past their retention
+FAILED_SWEEP_INTERVAL = 3600.0
+
+
+class IngestionQueueError(Exception):
+    """Raised when a job cannot be queued or retried."""
+    pass
+
+
+class IngestionQueue:
+    """Enqueue ingestion jobs."""
+
+    def __init__(self, db_session: AsyncSession) -> None:
+        """
+        Initialize queue.
+
+        Args:
+            db_session: Database session
+        """
+        self._db = db_session
+
+    async def enqueue(
+        self,
+        document_id: UUID,
+        version: str,
+        file_type: str,
+        temp_path: str,
+        content_hash: Optional[str] = None,
+    ) -> IngestionJob:
+        """
+        Add an uploaded file to the queue and wake the worker.
+
+        Args:
+            document_id: Document ID
+            version: Version string
+            file_type: Type of file
+            temp_path: Saved upload to process
+            content_hash: SHA-256 of the upload
+
+        Returns:
+            Created IngestionJob
+        """
+        job = IngestionJob(
+            document_id=document_id,
+            version=version,
+            file_type=file_type,
+            temp_path=temp_path,
+            content_hash=content_hash,
+            status="queued",
+            stage_timings={},
+        )
+        self._db.add(job)
+        await self._db.commit()
+        await self._db.refresh(job)
+
+        logger.info(f"Queued ingestion job {job.id} for document {document_id}")
+        ingestion_worker.notify()
+        return job
+
+    async def retry(self, document_id: UUID) -> IngestionJob:
+        """
+        Queue a document's latest failed job again.
+
+        The retry resumes from the job's checkpoint: chapters already
+        generated and committed are not processed again.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            The re-queued IngestionJob
+
+        Raises:
+            IngestionQueueError: If the latest job has not failed or its
+                upload is no longer available
+        """
+        result = await self._db.execute(
+            select(IngestionJob)
+            .where(IngestionJob.document_id == document_id)
+            .order_by(IngestionJob.created_at.desc())
+            .limit(1)
+            .with_for_update()
+        )
+        job = result.scalar_one_or_none()
+        if job is None or job.status != "failed":
+            raise IngestionQueueError(
+                f"No failed ingestion job to retry for document {document_id}"
+            )
+        if not Path(job.temp_path).exists():
+            raise IngestionQueueError(
+                f"Upload for job {job.id} is no longer available; upload it again"
+            )
+
+        job.status = "queued"
+        job.stage = None
+        job.progress = 0
+        job.error_message = None
+        job.finished_at = None
+        job.claimed_by = None
+        job.heartbeat_at = None
+        await self._db.commit()
+        await self._db.refresh(job)
+
+        logger.info(f"Re-queued failed ingestion job {job.id} (attempt {job.attempts + 1})")
+        ingestion_worker.notify()
+        return job
+
+
+class IngestionWorker:
+    """Claims queued jobs and runs them with bounded concurrency."""
+
+    def __init__(self) -> None:
+        # Lease owner recorded on claimed jobs; unique per process lifetime
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._wake = asyncio.Event()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._main_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self._stopping = False
+        self._next_sweep = 0.0
+
+    def start(self) -> None:
+        """Start the worker loop on the running event loop."""
+        if self._main_task is not None:
+            return
+        self._stopping = False
+        self._slots = asyncio.Semaphore(settings.ingest_max_concurrent_jobs)
+        self._main_task = asyncio.create_task(self._run())
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        logger.info(
+            f"Ingestion worker {self.worker_id} started "
+            f"(max {settings.ingest_max_concurrent_jobs} concurrent jobs)"
+        )
+
+    async def stop(self) -> None:
+        """
+        Stop the worker loop and cancel running jobs.
+
+        Cancelled jobs are released (queued again) so another worker can
+        resume them without waiting for their lease to expire.
+        """
+        if self._main_task is None:
+            return
+        self._stopping = True
+        tasks = [self._main_task, self._heartbeat_task, *self._running]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._main_task = None
+        self._heartbeat_task = None
+        self._running.clear()
+        await self._release_claimed()
+        logger.info("Ingestion worker stopped")
+
+    def notify(self) -> None:
+        """Wake the worker (a job was queued in this process)."""
+        self._wake.set()
+
+    async def _run(self) -> None:
+        """Main loop: claim the oldest queued job whenever a slot is free."""
+        await self._requeue_expired()
+
+        while not self._stopping:
+            await self._slots.acquire()
+            try:
+                job_id = await self._claim_next()
+            except Exception as e:
+                logger.error(f"Failed to claim ingestion job: {e}", exc_info=True)
+                job_id = None
+
+            if job_id is None:
+                self._slots.release()
+                await self._wait_for_work()
+                continue
+
+            task = asyncio.create_task(self._execute(job_id))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _wait_for_work(self) -> None:
+        """Sleep until notified or the poll interval passes."""
+        try:
+            await asyncio.wait_for(
+                self._wake.wait(), timeout=settings.ingest_poll_interval
+            )
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _heartbeat(self) -> None:
+        """Renew the leases of this worker's jobs, requeue expired ones, sweep failed ones."""
+        interval = settings.ingest_job_lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(IngestionJob)
+                        .where(
+                            IngestionJob.claimed_by == self.worker_id,
+                            IngestionJob.status == "running",
+                        )
+                        .values(heartbeat_at=func.now())
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Failed to renew ingestion job leases: {e}", exc_info=True)
+            await self._requeue_expired()
+            if time.monotonic() >= self._next_sweep:
+                self._next_sweep = time.monotonic() + FAILED_SWEEP_INTERVAL
+                await self._sweep_failed()
+
+    async def _requeue_expired(self) -> None:
+        """Queue again running jobs whose worker stopped renewing their lease."""
+        cutoff = func.now() - timedelta(seconds=settings.ingest_job_lease_seconds)
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    update(IngestionJob)
+                    .where(
+                        IngestionJob.status == "running",
+                        or_(
+                            IngestionJob.heartbeat_at.is_(None),
+                            IngestionJob.heartbeat_at < cutoff,
+                        ),
+                    )
+                    .values(status="queued", stage=None, claimed_by=None, heartbeat_at=None)
+                )
+                await db.commit()
+            if result.rowcount:
+                logger.warning(
+                    f"Re-queued {result.rowcount} ingestion jobs with expired leases"
+                )
+                self.notify()
+        except Exception as e:
+            logger.error(f"Failed to re-queue expired jobs: {e}", exc_info=True)
+
+    async def _sweep_failed(self) -> None:
+        """
+        Delete the upload and checkpoint files of jobs that failed long ago.
+
+        The job rows are kept (a retry then reports the upload as gone).
+        Rows are locked while their files are deleted, so a concurrent
+        retry either runs first or sees the files missing.
+        """
+        cutoff = datetime.utcnow() - timedelta(hours=settings.ingest_failed_retention_hours)
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(IngestionJob.temp_path)
+                    .where(
+                        IngestionJob.status == "failed",
+                        IngestionJob.finished_at < cutoff,
+                    )
+                    .with_for_update(skip_locked=True)
+                )).scalars().all()
+                removed = 0
+                for temp_path in rows:
+                    removed += await asyncio.to_thread(
+                        remove_upload_artifacts, Path(temp_path)
+                    )
+                await db.commit()
+            if removed:
+                logger.info(f"Deleted {removed} files of failed ingestion jobs")
+        except Exception as e:
+            logger.error(f"Failed to sweep failed ingestion jobs: {e}", exc_info=True)
+
+    async def _release_claimed(self) -> None:
+        """Queue again the jobs this worker was running (on shutdown)."""
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    update(IngestionJob)
+                    .where(
+                        IngestionJob.claimed_by == self.worker_id,
+                        IngestionJob.status == "running",
+                    )
+                    .values(status="queued", stage=None, claimed_by=None, heartbeat_at=None)
+                )
+                await db.commit()
+            if result.rowcount:
+                logger.info(f"Released {result.rowcount} interrupted ingestion jobs")
+        except Exception as e:
+            logger.error(f"Failed to release ingestion jobs: {e}", exc_info=True)
+
+    async def _claim_next(self) -> Optional[UUID]:
+        """
+        Atomically mark the oldest claimable queued job as running.
+
+        Jobs of a batch that already has ``max_parallel`` jobs running are
+        skipped until one of them finishes. The running count in the job
+        query can be stale under concurrent claims, so a batch job is only
+        claimed after locking its batch row and counting again: the lock
+        serialises claims of the batch across workers, and the count runs
+        after the lock is granted, so it sees every committed claim.
+        """
+        running = aliased(IngestionJob)
+        batch_running = (
+            select(func.count(running.id))
+            .where(running.batch_id == IngestionJob.batch_id, running.status == "running")
+            .scalar_subquery()
+        )
+        full_batches: Set[UUID] = set()
+
+        async with AsyncSessionLocal() as db:
+            while True:
+                query = (
+                    select(IngestionJob)
+                    .outerjoin(IngestionBatch, IngestionBatch.id == IngestionJob.batch_id)
+                    .where(
+                        IngestionJob.status == "queued",
+                        or_(
+                            IngestionJob.batch_id.is_(None),
+                            batch_running < IngestionBatch.max_parallel,
+                        ),
+                    )
+                    .order_by(IngestionJob.created_at)
+                    .limit(1)
+                    .with_for_update(of=IngestionJob, skip_locked=True)
+                )
+                if full_batches:
+                    query = query.where(or_(
+                        IngestionJob.batch_id.is_(None),
+                        IngestionJob.batch_id.not_in(full_batches),
+                    ))
+                job = (await db.execute(query)).scalar_one_or_none()
+                if job is None:
+                    await db.rollback()
+                    return None
+
+                if job.batch_id is None or await self._batch_has_room(db, job.batch_id):
+                    break
+                # Another worker filled the batch since the job query's snapshot
+                full_batches.add(job.batch_id)
+                await db.rollback()
+
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            job.attempts = job.attempts + 1
+            job.error_message = None
+            job.claimed_by = self.worker_id
+            job.heartbeat_at = func.now()
+            await db.commit()
+            return job.id
+
+    async def _batch_has_room(self, db: AsyncSession, batch_id: UUID) -> bool:
+        """Lock a batch row (until commit) and check it runs fewer than max_parallel jobs."""
+        max_parallel = (await db.execute(
+            select(IngestionBatch.max_parallel)
+            .where(IngestionBatch.id == batch_id)
+            .with_for_update()
+        )).scalar_one_or_none()
+        if max_parallel is None:
+            return True  # Batch deleted; its jobs are unbatched now
+
+        running = (await db.execute(
+            select(func.count(IngestionJob.id)).where(
+                IngestionJob.batch_id == batch_id,
+                IngestionJob.status == "running",
+            )
+        )).scalar()
+        return running < max_parallel
+
+    async def _execute(self, job_id: UUID) -> None:
+        """Run one claimed job and record its outcome."""
+        try:
+            async with AsyncSessionLocal() as db:
+                job = await db.get(IngestionJob, job_id)
+                arguments = (
+                    job.document_id,
+                    job.temp_path,
+                    job.version,
+                    job.file_type,
+                    job.content_hash,
+                )
+                processor = DocumentProcessor(db)
+            # Processing and progress open sessions of their own: this one is
+            # closed so it does not sit idle in a transaction for the whole job
+            await processor.process_document_async(
+                *arguments,
+                progress=JobProgress(job_id),
+                checkpoint=JobCheckpoint(job_id),
+            )
+            await self._finish(job_id, "completed")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ingestion job {job_id} failed: {e}")
+            await self._finish(job_id, "failed", error_message=str(e))
+        finally:
+            self._slots.release()
+            # A batch may have been waiting for one of its jobs to finish
+            self.notify()
+
+    async def _finish(
+        self,
+        job_id: UUID,
+        status: str,
+        error_message: Optional[str] = None,
+    ) -> None:
+        """Record a job's final status (unless its lease passed to another worker)."""
+        values = {
+            "status": status,
+            "finished_at": datetime.utcnow(),
+            "error_message": error_message,
+            "heartbeat_at": None,
+        }
+        if status == "completed":
+            values["progress"] = 100
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(IngestionJob)
+                .where(
+                    IngestionJob.id == job_id,
+                    IngestionJob.claimed_by == self.worker_id,
+                )
+                .values(**values)
+            )
+            await db.commit()
+        if not result.rowcount:
+            logger.warning(
+                f"Ingestion job {job_id} {status} after its lease expired; "
+                f"another worker owns it now"
+            )
+            return
+        logger.info(f"Ingestion job {job_id} {status}")
+
+
+# Process-wide worker, started and stopped with the application lifespan
+ingestion_worker = IngestionWorker()
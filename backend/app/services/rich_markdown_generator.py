@@ -17,11 +17,32 @@ Architecture:
 
 import logging
 import re
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import chain, islice
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from app.services.boilerplate_filter import DEFAULT_RULE_SET, BoilerplateFilter
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever a change alters the generated markdown, so identical uploads
+# processed by an older generator are re-ingested instead of deduplicated
+GENERATOR_VERSION = "2"
+
+# "Chapter X" mention not already followed by a markdown link target
+_CHAPTER_REFERENCE_PATTERN = re.compile(r'\bChapter\s+(\d+)\b(?!\]\()')
+
+# "Note: ...", "WARNING: ..." etc. at the start of a line
+_CALLOUT_PATTERN = re.compile(
+    r'^(Note|NOTE|Important|IMPORTANT|Warning|WARNING|Tip|TIP):\s*(.+)$',
+    re.MULTILINE,
+)
+
+
+def _callout_replacement(match: re.Match) -> str:
+    return f"> [!{match.group(1).lower()}]\n> {match.group(2)}"
+
 
 @dataclass
 class ChapterMarkdown:
@@ -36,12 +57,30 @@ class ChapterMarkdown:
     anchor_id: str
 
 
+@dataclass
+class ChapterSlice:
+    """Everything a worker process needs to render one chapter."""
+
+    chapter_number: int
+    title: str
+    index: int
+    elements: List[Dict[str, Any]]
+    refs: Dict[str, Dict[str, Any]]  # Elements referenced by groups in the slice
+    rule_set: str
+    repeated_lines: FrozenSet[str] = frozenset()  # Detected for the whole document
+
+
 class RichMarkdownGenerator:
     """Convert Docling JSON to rich, chapter-based markdown."""
 
-    def __init__(self, docling_json: Dict[str, Any]):
-        """Initialize with parsed Docling JSON."""
+    def __init__(
+        self,
+        docling_json: Dict[str, Any],
+        boilerplate: Optional[BoilerplateFilter] = None,
+    ):
+        """Initialize with parsed Docling JSON and an optional boilerplate filter."""
         self.json_data = docling_json
+        self.boilerplate = boilerplate or BoilerplateFilter()
         self.texts = {t["self_ref"]: t for t in docling_json.get("texts", [])}
         self.tables = {t["self_ref"]: t for t in docling_json.get("tables", [])}
         self.pictures = {p["self_ref"]: p for p in docling_json.get("pictures", [])}
@@ -79,7 +118,7 @@ class RichMarkdownGenerator:
             return self.groups[ref]
         return None
 
-    def generate_chapters(self) -> List[ChapterMarkdown]:
+    def generate_chapters(self, executor: Optional[Executor] = None) -> List[ChapterMarkdown]:
         """
         Main entry point: Parse JSON and return list of chapters.
 
@@ -89,6 +128,10 @@ class RichMarkdownGenerator:
         3. Generate complete markdown for each chapter
         4. Extract searchable text separately
         5. Return list of ChapterMarkdown objects
+
+        Args:
+            executor: Optional process pool; chapters are then rendered in
+                parallel, each worker receiving only its chapter's slice
         """
         logger.info("Starting chapter-based markdown generation from Docling JSON")
 
@@ -102,16 +145,48 @@ class RichMarkdownGenerator:
         logger.info(f"Detected {len(chapter_boundaries)} chapters")
 
         # Step 2: Generate markdown for each chapter
-        chapter_markdowns = []
-        for i, chapter_info in enumerate(chapter_boundaries):
-            chapter_md = self._generate_chapter_markdown(chapter_info, i)
-            chapter_markdowns.append(chapter_md)
+        if executor is not None and len(chapter_boundaries) > 1:
+            slices = [
+                self._chapter_slice(chapter_info, i)
+                for i, chapter_info in enumerate(chapter_boundaries)
+            ]
+            chapter_markdowns = []
+            # map() yields results in submission order
+            for chapter_md, hits in executor.map(render_chapter_slice, slices):
+                self.boilerplate.hits.update(hits)
+                chapter_markdowns.append(chapter_md)
+        else:
+            chapter_markdowns = []
+            for i, chapter_info in enumerate(chapter_boundaries):
+                chapter_md = self._generate_chapter_markdown(chapter_info, i)
+                chapter_markdowns.append(chapter_md)
 
         # Step 3: Add cross-references
         chapter_markdowns = self._add_cross_references(chapter_markdowns)
 
         return chapter_markdowns
 
+    def _chapter_slice(self, chapter_info: Dict[str, Any], index: int) -> ChapterSlice:
+        """Package a chapter's elements and the refs its groups need for a worker."""
+        elements = chapter_info['elements']
+        refs = {}
+        for element in elements:
+            for child_ref in element.get("children", []):
+                ref = child_ref.get("$ref")
+                child_element = self._resolve_ref(ref)
+                if child_element:
+                    refs[ref] = child_element
+
+        return ChapterSlice(
+            chapter_number=chapter_info['chapter_number'],
+            title=chapter_info['title'],
+            index=index,
+            elements=elements,
+            refs=refs,
+            rule_set=self.boilerplate.rule_set,
+            repeated_lines=self.boilerplate.repeated_lines,
+        )
+
     def _detect_chapter_boundaries(self) -> List[Dict[str, Any]]:
         """
         Detect chapter boundaries by finding 'Chapter X' level 1 headings.
@@ -130,8 +205,8 @@ class RichMarkdownGenerator:
 
         for i, element in enumerate(self.body_elements):
             # Check if this is a chapter header
-            if element.get("label") == "section_header" and element.get("level") == 1:
-                text = element.get("text", "")
+            text = self._level_one_header_text(element)
+            if text is not None:
                 match = chapter_pattern.match(text)
 
                 if match:
@@ -157,15 +232,20 @@ class RichMarkdownGenerator:
 
         return boundaries
 
+    def _level_one_header_text(self, element: Dict[str, Any]) -> Optional[str]:
+        """Text of a level 1 section header, or None for any other element."""
+        if element.get("label") == "section_header" and element.get("level") == 1:
+            return element.get("text", "")
+        return None
+
     def _create_frontmatter_chapter(self) -> ChapterMarkdown:
         """Create a chapter from frontmatter (preface, TOC, etc.) when no chapters found."""
         # Get elements before first real chapter
         frontmatter_elements = []
         for element in self.body_elements:
-            if element.get("label") == "section_header" and element.get("level") == 1:
-                text = element.get("text", "")
-                if re.match(r'^Chapter\s+\d+', text, re.IGNORECASE):
-                    break
+            text = self._level_one_header_text(element)
+            if text is not None and re.match(r'^Chapter\s+\d+', text, re.IGNORECASE):
+                break
             frontmatter_elements.append(element)
 
         # Generate markdown
@@ -206,23 +286,14 @@ class RichMarkdownGenerator:
         start_page = min(page_nums) if page_nums else 1
         end_page = max(page_nums) if page_nums else start_page
 
-        # Generate chapter content (NO frontmatter - that's added by the caller if needed)
-        md_parts = [f"# {title}\n"]
-
-        # Filter out page footers and merge tables
-        filtered_elements = self._filter_page_footers(elements[1:])
-        merged_elements = self._merge_consecutive_tables(filtered_elements)
-
-        # Convert elements to markdown
-        for element in merged_elements:
-            md = self._element_to_markdown(element)
-            if md:
-                md_parts.append(md)
+        # Lazy pipeline: filter -> merge tables -> render -> callouts.
+        # Each stage pulls one element at a time from the previous one.
+        content = self._filter_page_footers(elements[1:])
+        content = self._merge_consecutive_tables(content)
+        parts = self._render_elements(content)
 
-        markdown_content = "\n\n".join(md_parts)
-
-        # Add callouts
-        markdown_content = self._add_callouts(markdown_content)
+        # Generate chapter content (NO frontmatter - that's added by the caller if needed)
+        markdown_content = "\n\n".join(chain((f"# {title}\n",), parts))
 
         # Extract searchable text
         searchable_text = self._extract_searchable_text(markdown_content)
@@ -283,68 +354,23 @@ document: "{self.json_data.get('name', 'Unknown')}"
             return prov[0].get("page_no", 0)
         return 0
 
-    def _filter_page_footers(self, elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _filter_page_footers(self, elements: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
         """
         Filter out repetitive page footers and headers.
 
-        Common patterns to remove:
-        - "Non-Confidential"
-        - Page numbers (standalone numbers)
-        - Document title footers
-        - Page break artifacts
+        Uses the generator's BoilerplateFilter (one compiled sweep per
+        element); hits are counted per rule in ``boilerplate_stats``.
         """
-        filtered = []
-        filtered_count = 0
-        footer_patterns = [
-            r'^Non-Confidential\s*$',
-            r'^Confidential\s*$',
-            r'^\d+\s*$',  # Standalone page numbers
-            r'^Capital Market Trading System.*Protocol.*$',
-            r'^Trading System.*Protocol.*$',
-            r'^Page\s+\d+\s*$',
-        ]
-
-        for element in elements:
-            label = element.get("label", "")
-            text = element.get("text", "").strip()
-
-            # Always skip page_header and page_footer elements from Docling
-            if label in ["page_footer", "page_header"]:
-                filtered_count += 1
-                logger.debug(f"Filtered Docling footer/header: '{text}' (label: {label})")
-                continue
-
-            # Always keep non-text elements (tables, pictures, etc.)
-            if label in ["table", "code", "list", "picture"]:
-                filtered.append(element)
-                continue
-
-            # For text elements, check if they're footers
-            if label in ["text", "section_header"]:
-                # Skip if no text
-                if not text:
-                    continue
-
-                # Check if this is a footer pattern
-                is_footer = False
-                for pattern in footer_patterns:
-                    if re.match(pattern, text, re.IGNORECASE):
-                        is_footer = True
-                        filtered_count += 1
-                        logger.debug(f"Filtered footer: '{text}' (matched: {pattern})")
-                        break
-
-                if not is_footer:
-                    filtered.append(element)
-            else:
-                # Unknown label, keep it to be safe
-                filtered.append(element)
+        return self.boilerplate.filter(elements)
 
-        if filtered_count > 0:
-            logger.info(f"Filtered {filtered_count} footer elements")
-        return filtered
+    @property
+    def boilerplate_stats(self) -> Dict[str, int]:
+        """Boilerplate elements removed so far, per rule."""
+        return self.boilerplate.stats()
 
-    def _merge_consecutive_tables(self, elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _merge_consecutive_tables(
+        self, elements: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
         """
         Merge tables that continue across multiple pages.
 
@@ -352,65 +378,61 @@ document: "{self.json_data.get('name', 'Unknown')}"
         1. They appear consecutively (allowing text elements in between)
         2. They have the same column headers
         3. They appear on sequential or nearby pages
+
+        Text and pictures between a table and its continuations are dropped
+        along with the repeated header rows.
         """
-        merged = []
-        i = 0
-
-        while i < len(elements):
-            element = elements[i]
-
-            # Check if current element is a table
-            if element.get("label") == "table":
-                current_table = element
-                current_page = self._get_page_number(current_table)
-                current_headers = self._get_table_headers(current_table)
-
-                # Look ahead for continuation tables
-                j = i + 1
-                continuation_tables = []
-
-                while j < len(elements):
-                    next_elem = elements[j]
-                    next_label = next_elem.get("label", "")
-
-                    # Stop if we hit a section header (new section started)
-                    if next_label == "section_header":
-                        break
-
-                    # Check if it's a table
-                    if next_label == "table":
-                        next_page = self._get_page_number(next_elem)
-                        next_headers = self._get_table_headers(next_elem)
-
-                        # Merge if headers match and pages are close
-                        if (current_headers == next_headers and
-                            0 <= next_page - current_page <= 3):
-                            continuation_tables.append(next_elem)
-                            j += 1
-                        else:
-                            # Different table, stop looking
-                            break
-                    elif next_label in ["text", "picture"]:
-                        # Allow some text/images between table continuations
-                        j += 1
-                    else:
-                        break
-
-                # If we found continuation tables, merge them
-                if continuation_tables:
-                    merged_table = self._merge_table_elements(
-                        current_table, continuation_tables
-                    )
-                    merged.append(merged_table)
-                    i = j  # Skip all merged tables
-                else:
-                    merged.append(current_table)
-                    i += 1
+        table: Optional[Dict[str, Any]] = None
+        table_page = 0
+        table_headers: List[str] = []
+        continuations: List[Dict[str, Any]] = []
+        skipped: List[Dict[str, Any]] = []
+
+        for element in elements:
+            label = element.get("label", "")
+
+            if table is not None:
+                if label == "table":
+                    # Merge if headers match and pages are close
+                    if (self._get_table_headers(element) == table_headers and
+                            0 <= self._get_page_number(element) - table_page <= 3):
+                        continuations.append(element)
+                        skipped.clear()
+                        continue
+                elif label in ("text", "picture"):
+                    # Allow some text/images between table continuations
+                    skipped.append(element)
+                    continue
+
+                # Section header, different table or other element: close the table
+                yield from self._close_table(table, continuations, skipped)
+                table = None
+
+            if label == "table":
+                table = element
+                table_page = self._get_page_number(element)
+                table_headers = self._get_table_headers(element)
+                continuations = []
+                skipped = []
             else:
-                merged.append(element)
-                i += 1
+                yield element
 
-        return merged
+        if table is not None:
+            yield from self._close_table(table, continuations, skipped)
+
+    def _close_table(
+        self,
+        table: Dict[str, Any],
+        continuations: List[Dict[str, Any]],
+        skipped: List[Dict[str, Any]],
+    ) -> Iterator[Dict[str, Any]]:
+        """Emit a table (merged with its continuations) once its run has ended."""
+        if continuations:
+            yield self._merge_table_elements(table, continuations)
+        else:
+            # Nothing to merge: the elements looked past are kept
+            yield table
+            yield from skipped
 
     def _get_table_headers(self, table_element: Dict[str, Any]) -> List[str]:
         """Extract header row from table element."""
@@ -429,40 +451,36 @@ document: "{self.json_data.get('name', 'Unknown')}"
         first_table: Dict[str, Any],
         continuation_tables: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
-        """Merge multiple table elements into one."""
-        # Create a copy of the first table
-        merged = dict(first_table)
+        """
+        Merge continuation tables into the first table.
 
+        The first table's grid is extended in place (no copies of the
+        table, its data or its rows) and the first table is returned.
+        """
         try:
-            # Get the grid from first table
-            merged_data = dict(first_table.get("data", {}))
-            merged_grid = list(merged_data.get("grid", []))
+            grid = first_table.setdefault("data", {}).setdefault("grid", [])
 
             # Append rows from continuation tables (skip their header rows)
             for cont_table in continuation_tables:
-                cont_data = cont_table.get("data", {})
-                cont_grid = cont_data.get("grid", [])
-
-                # Skip header row (first row) and append the rest
-                if len(cont_grid) > 1:
-                    merged_grid.extend(cont_grid[1:])
+                cont_grid = cont_table.get("data", {}).get("grid", [])
+                grid.extend(islice(cont_grid, 1, None))
 
-            # Update the merged table data
-            merged_data["grid"] = merged_grid
-            merged["data"] = merged_data
-
-            # Update page range in prov to show it spans multiple pages
+            # Keep first table's prov but note the page range in metadata
             first_page = self._get_page_number(first_table)
             last_page = self._get_page_number(continuation_tables[-1])
-
-            # Keep first table's prov but note the page range in metadata
-            merged["_merged_pages"] = f"{first_page}-{last_page}"
+            first_table["_merged_pages"] = f"{first_page}-{last_page}"
 
         except Exception as e:
             logger.warning(f"Failed to merge tables: {e}")
-            return first_table
 
-        return merged
+        return first_table
+
+    def _render_elements(self, elements: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Render elements to markdown blocks, skipping empty ones, with callouts applied."""
+        for element in elements:
+            md = self._element_to_markdown(element)
+            if md:
+                yield self._add_callouts(md)
 
     def _element_to_markdown(self, element: Dict[str, Any]) -> Optional[str]:
         """Convert a Docling element to markdown."""
@@ -638,39 +656,7 @@ document: "{self.json_data.get('name', 'Unknown')}"
         - "Warning:" or "WARNING:" -> [!warning]
         - "Tip:" or "TIP:" -> [!tip]
         """
-        # Note patterns
-        markdown = re.sub(
-            r'^(Note:|NOTE:)\s*(.+)$',
-            r'> [!note]\n> \2',
-            markdown,
-            flags=re.MULTILINE,
-        )
-
-        # Important patterns
-        markdown = re.sub(
-            r'^(Important:|IMPORTANT:)\s*(.+)$',
-            r'> [!important]\n> \2',
-            markdown,
-            flags=re.MULTILINE,
-        )
-
-        # Warning patterns
-        markdown = re.sub(
-            r'^(Warning:|WARNING:)\s*(.+)$',
-            r'> [!warning]\n> \2',
-            markdown,
-            flags=re.MULTILINE,
-        )
-
-        # Tip patterns
-        markdown = re.sub(
-            r'^(Tip:|TIP:)\s*(.+)$',
-            r'> [!tip]\n> \2',
-            markdown,
-            flags=re.MULTILINE,
-        )
-
-        return markdown
+        return _CALLOUT_PATTERN.sub(_callout_replacement, markdown)
 
     def _extract_searchable_text(self, markdown: str) -> str:
         """
@@ -732,52 +718,114 @@ document: "{self.json_data.get('name', 'Unknown')}"
         chapter_map = {}
         for ch in chapters:
             if ch.chapter_number > 0:  # Skip frontmatter
-                chapter_map[ch.chapter_number] = (ch.anchor_id, ch.page_range[0])
-
-        # Update each chapter's content
-        updated_chapters = []
-        for chapter in chapters:
-            content = chapter.markdown_content
-
-            # Find "Chapter X" references
-            for ch_num, (anchor, page) in chapter_map.items():
-                if ch_num != chapter.chapter_number:  # Don't link to self
-                    # Match "Chapter X" not followed by markdown link
-                    pattern = rf'\bChapter\s+{ch_num}\b(?!\]\()'
-                    replacement = f"[Chapter {ch_num}](#{anchor})"
-                    content = re.sub(pattern, replacement, content)
-
-            # Create updated chapter
-            updated_chapter = ChapterMarkdown(
-                chapter_number=chapter.chapter_number,
-                title=chapter.title,
-                markdown_content=content,
-                searchable_text=chapter.searchable_text,
-                page_range=chapter.page_range,
-                metadata=chapter.metadata,
-                anchor_id=chapter.anchor_id,
-            )
-            updated_chapters.append(updated_chapter)
-
-        return updated_chapters
+                chapter_map[ch.chapter_number] = ch.anchor_id
+
+        return [
+            self._link_chapter_references(chapter, chapter_map)
+            for chapter in chapters
+        ]
+
+    def _link_chapter_references(
+        self, chapter: ChapterMarkdown, chapter_map: Dict[int, str]
+    ) -> ChapterMarkdown:
+        """
+        Rewrite "Chapter X" mentions in one chapter into internal links.
+
+        All mentions are linked in a single scan with one precompiled pattern;
+        the chapter number is looked up in ``chapter_map`` per match.
+
+        Args:
+            chapter: Chapter to update
+            chapter_map: Chapter number -> anchor ID for every linkable chapter
+
+        Returns:
+            New ChapterMarkdown with links added
+        """
+        # Keyed by the literal digits so "Chapter 05" is not linked to chapter 5
+        anchors = {
+            str(ch_num): anchor
+            for ch_num, anchor in chapter_map.items()
+            if ch_num != chapter.chapter_number  # Don't link to self
+        }
+
+        def link(match: re.Match) -> str:
+            anchor = anchors.get(match.group(1))
+            if anchor is None:
+                return match.group(0)
+            return f"[Chapter {match.group(1)}](#{anchor})"
+
+        content = _CHAPTER_REFERENCE_PATTERN.sub(link, chapter.markdown_content)
+
+        return ChapterMarkdown(
+            chapter_number=chapter.chapter_number,
+            title=chapter.title,
+            markdown_content=content,
+            searchable_text=chapter.searchable_text,
+            page_range=chapter.page_range,
+            metadata=chapter.metadata,
+            anchor_id=chapter.anchor_id,
+        )
+
+
+class _ChapterSliceGenerator(RichMarkdownGenerator):
+    """Renders a single ChapterSlice; refs resolve only within the slice."""
+
+    def __init__(self, refs: Dict[str, Dict[str, Any]], boilerplate: BoilerplateFilter):
+        # Deliberately skip RichMarkdownGenerator.__init__: no lookup tables
+        self._refs = refs
+        self.json_data = {}
+        self.body_elements: List[Dict[str, Any]] = []
+        self.boilerplate = boilerplate
+
+    def _resolve_ref(self, ref: str) -> Optional[Dict[str, Any]]:
+        return self._refs.get(ref) if ref else None
+
+
+def render_chapter_slice(chapter_slice: ChapterSlice) -> Tuple[ChapterMarkdown, Dict[str, int]]:
+    """
+    Render one chapter in a worker process (module-level so it can be pickled).
+
+    Cross-references are not linked here; the caller links them once all
+    chapters are back in order.
+
+    Args:
+        chapter_slice: Chapter elements and the refs they need
+
+    Returns:
+        Tuple of (ChapterMarkdown, boilerplate hits per rule)
+    """
+    generator = _ChapterSliceGenerator(
+        chapter_slice.refs,
+        BoilerplateFilter(chapter_slice.rule_set, chapter_slice.repeated_lines),
+    )
+    chapter_info = {
+        'chapter_number': chapter_slice.chapter_number,
+        'title': chapter_slice.title,
+        'elements': chapter_slice.elements,
+    }
+    chapter_md = generator._generate_chapter_markdown(chapter_info, chapter_slice.index)
+    return chapter_md, generator.boilerplate_stats
 
 
 def generate_rich_markdown_from_json(
-    docling_json: Dict[str, Any]
+    docling_json: Dict[str, Any],
+    rule_set: str = DEFAULT_RULE_SET,
 ) -> List[ChapterMarkdown]:
     """
     Main entry point: Generate rich markdown chapters from Docling JSON.
 
     Args:
         docling_json: Parsed Docling JSON document
+        rule_set: Boilerplate rule set (see boilerplate_filter.RULE_SETS)
 
     Returns:
         List of ChapterMarkdown objects with complete markdown and searchable text
     """
-    generator = RichMarkdownGenerator(docling_json)
+    generator = RichMarkdownGenerator(docling_json, BoilerplateFilter(rule_set))
     chapters = generator.generate_chapters()
 
     logger.info(f"Generated {len(chapters)} chapters with rich markdown")
+    logger.info(f"Boilerplate removed ({rule_set}): {generator.boilerplate_stats}")
     for ch in chapters:
         logger.info(
             f"  Chapter {ch.chapter_number}: '{ch.title}' "
@@ -9,6 +9,7 @@ from sqlalchemy import select, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import UserDocument, Document, Chapter
+from app.services.async_file_storage import AsyncFileStorage
 from app.services.file_storage import FileStorageService, FileStorageError
 
 logger = logging.getLogger(__name__)
@@ -41,6 +42,8 @@ class UserDocumentService:
         """
         self._db = db_session
         self._file_storage = file_storage or FileStorageService()
+        # File I/O runs on the storage pool, off the event loop
+        self._storage = AsyncFileStorage(self._file_storage)
 
     async def create_document(
         self,
@@ -84,7 +87,7 @@ class UserDocumentService:
             directory = "notes" if doc_type == "note" else "references"
 
             # Save to file
-            file_path = self._file_storage.save_user_document(
+            file_path = await self._storage.save_user_document(
                 doc_slug=doc_slug,
                 version=version,
                 directory=directory,
@@ -152,7 +155,7 @@ class UserDocumentService:
             UserDocumentError: If read fails
         """
         try:
-            return self._file_storage.read_user_document(file_path)
+            return await self._storage.read_user_document(file_path)
         except FileStorageError as e:
             raise UserDocumentError(f"Failed to read document: {e}") from e
 
@@ -181,7 +184,7 @@ class UserDocumentService:
                 raise UserDocumentError(f"User document not found: {user_doc_id}")
 
             # Update file
-            self._file_storage.update_user_document(user_doc.file_path, content)
+            await self._storage.update_user_document(user_doc.file_path, content)
 
             # Regenerate search vector
             search_text = f"{user_doc.title} {content}"
@@ -265,7 +268,7 @@ class UserDocumentService:
                 raise UserDocumentError(f"User document not found: {user_doc_id}")
 
             # Delete file
-            self._file_storage.delete_user_document(user_doc.file_path)
+            await self._storage.delete_user_document(user_doc.file_path)
 
             # Delete DB record
             await self._db.delete(user_doc)
@@ -309,7 +312,7 @@ class UserDocumentService:
             old_path = user_doc.file_path
 
             # Move file
-            self._file_storage.move_user_document(old_path, new_path)
+            await self._storage.move_user_document(old_path, new_path)
 
             # Update DB
             user_doc.file_path = new_path
@@ -430,7 +433,7 @@ class UserDocumentService:
                 actual_file_path = chapter_file_path
 
             # Read current chapter content
-            content = self._file_storage.read_chapter(actual_file_path)
+            content = await self._storage.read_chapter(actual_file_path)
 
             # Append wikilink
             wikilink = f"\n\n## Related Notes\n\n- [[{target_filename}]]\n"
@@ -447,8 +450,7 @@ class UserDocumentService:
                 content += wikilink
 
             # Write back to file
-            full_path = self._file_storage._base_path / actual_file_path
-            full_path.write_text(content, encoding="utf-8")
+            await self._storage.update_chapter(actual_file_path, content)
 
             logger.info(f"Inserted wikilink to {target_filename} in {actual_file_path}")
 
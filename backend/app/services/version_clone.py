@@ -0,0 +1,127 @@
+"""Copy-on-write cloning of version directories.
+
+Creating a draft from an active version used to copy every byte. A clone
+shares file data with the source instead:
+
+- reflink (``FICLONE``): the file system shares extents and copies them on
+  write (btrfs, XFS, bcachefs; OCFS2 and NFS 4.2 servers that support it);
+- hardlink, where reflinks are not supported: both versions point at the
+  same inode;
+- plain copy, where neither works (e.g. source on another file system).
+
+Hardlinks are safe because FileStorageService never writes into an existing
+file: every write goes to a temp file that is renamed over the old name, so
+writing a file of one version replaces that version's link and leaves the
+other version's copy untouched (break-on-write).
+"""
+
+import errno
+import os
+import shutil
+from pathlib import Path
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# ioctl(dest_fd, FICLONE, src_fd) from linux/fs.h
+FICLONE = 0x40049409
+
+# Errors meaning "this file system cannot do that", not a real failure
+_UNSUPPORTED = {
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EINVAL,
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EPERM,
+    errno.EMLINK,
+}
+
+
+def reflink(source: Path, target: Path) -> bool:
+    """
+    Clone a file's data with FICLONE (copy-on-write).
+
+    Args:
+        source: Existing file
+        target: New file (must not exist)
+
+    Returns:
+        True if the file was reflinked, False if the file system does not
+        support it (no target is left behind)
+    """
+    if fcntl is None:
+        return False
+    with open(source, "rb") as src, open(target, "xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+            cloned = False
+        else:
+            cloned = True
+    if not cloned:
+        target.unlink()
+        return False
+    shutil.copystat(source, target)
+    return True
+
+
+def clone_tree(source: Path, target: Path) -> Dict[str, int]:
+    """
+    Clone a directory tree, sharing file data with the source where possible.
+
+    Each file is reflinked, else hardlinked, else copied; once a method is
+    unsupported it is not tried for the remaining files. Temp files of
+    writes in progress (``.*.tmp``) are skipped.
+
+    Args:
+        source: Directory to clone
+        target: New directory (must not exist)
+
+    Returns:
+        Number of files per method: "reflink", "hardlink" and "copy"
+
+    Raises:
+        OSError: If the tree cannot be cloned
+    """
+    counts = {"reflink": 0, "hardlink": 0, "copy": 0}
+    use_reflink = True
+    use_hardlink = True
+
+    for directory, _, filenames in os.walk(source):
+        relative = Path(directory).relative_to(source)
+        destination = target / relative
+        destination.mkdir(exist_ok=relative != Path("."))
+
+        for name in filenames:
+            if name.startswith(".") and name.endswith(".tmp"):
+                continue
+            src = Path(directory) / name
+            dst = destination / name
+
+            if use_reflink:
+                if reflink(src, dst):
+                    counts["reflink"] += 1
+                    continue
+                use_reflink = False
+
+            if use_hardlink:
+                try:
+                    os.link(src, dst)
+                    counts["hardlink"] += 1
+                    continue
+                except OSError as e:
+                    if e.errno not in _UNSUPPORTED:
+                        raise
+                    # EMLINK is per file; the others hold for the whole tree
+                    use_hardlink = e.errno == errno.EMLINK
+
+            shutil.copy2(src, dst)
+            counts["copy"] += 1
+
+    return counts
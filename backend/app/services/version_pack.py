@@ -0,0 +1,251 @@
+"""Pack files: a version's generated markdown in one memory-mapped file.
+
+A version directory holds hundreds of small chapter files; on network-mounted
+storage every cold read costs an open, a stat and a read round trip. When a
+version is activated (and ``settings.version_pack`` is on) its generated
+files (``chapters/`` and ``links/``) are also written to a single pack file:
+
+    versions/<version>/version.pack
+        MAGIC (8 bytes) | header length (4 bytes, little endian)
+        header: JSON {"format": 2, "files": {path: [offset, length, sha256,
+                                                    mtime_ns, size, inode]}}
+        file data, back to back
+
+Readers map the pack once per process and serve files as zero-copy slices
+of the map; paths are relative to the version directory. Notes and
+references are not packed: users edit them, and loose files remain the
+write path. The pack is a read cache of the loose files, so
+FileStorageService deletes it whenever it writes a packed file, and
+readers fall back to the loose files until the version is packed again.
+
+Each member records the (mtime_ns, size, inode) signature of the loose file
+it was packed from, the signature the chapter cache validates against.
+FileStorageService stats the loose file before every read (it needs the
+signature for the chapter cache anyway) and serves the packed bytes only
+while the signatures match, so a file edited outside the service is read
+from disk, not from the pack. A read from the pack saves the open and read
+of the loose file, not its stat.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+
+PACK_FILENAME = "version.pack"
+PACK_FORMAT = 2
+MAGIC = b"EDMPACK1"
+
+# Version subdirectories whose markdown is packed (generated, read-mostly)
+PACKED_DIRECTORIES = ("chapters", "links")
+
+_PREFIX = struct.Struct("<8sI")
+_COPY_CHUNK = 1024 * 1024
+
+# (mtime_ns, size, inode) of a file
+PackIdentity = Tuple[int, int, int]
+
+
+class VersionPackError(Exception):
+    """Raised when a pack file cannot be written or is malformed."""
+    pass
+
+
+def pack_path(version_path: Path) -> Path:
+    """Pack file of a version directory."""
+    return version_path / PACK_FILENAME
+
+
+def write_pack(version_path: Path) -> Tuple[int, int]:
+    """
+    Write the pack file of a version from its loose files.
+
+    The header is written last into space reserved for its largest possible
+    size (padded with spaces), so files are streamed into the pack once.
+
+    Args:
+        version_path: Version directory
+
+    Returns:
+        Tuple of (files packed, data bytes)
+
+    Raises:
+        VersionPackError: If the pack cannot be written
+    """
+    members: List[str] = sorted(
+        path.relative_to(version_path).as_posix()
+        for directory in PACKED_DIRECTORIES
+        if (version_path / directory).is_dir()
+        for path in (version_path / directory).rglob("*.md")
+    )
+
+    # Largest header: every number at its maximum digit count
+    placeholder = [10 ** 15, 10 ** 15, "0" * 64, 10 ** 19, 10 ** 15, 2 ** 64]
+    reserved = len(_encode_header({member: placeholder for member in members}))
+
+    target = pack_path(version_path)
+    temp = target.with_name(f".{target.name}.{uuid4().hex}.tmp")
+    files: Dict[str, List] = {}
+    identities: Dict[str, PackIdentity] = {}
+    offset = _PREFIX.size + reserved
+    try:
+        with open(temp, "wb") as out:
+            out.seek(offset)
+            for member in members:
+                digest = hashlib.sha256()
+                length = 0
+                with open(version_path / member, "rb") as f:
+                    identities[member] = _identity(os.fstat(f.fileno()))
+                    while chunk := f.read(_COPY_CHUNK):
+                        digest.update(chunk)
+                        out.write(chunk)
+                        length += len(chunk)
+                files[member] = [offset, length, digest.hexdigest(), *identities[member]]
+                offset += length
+
+            header = _encode_header(files)
+            out.seek(0)
+            out.write(_PREFIX.pack(MAGIC, reserved))
+            out.write(header.ljust(reserved, b" "))
+        os.replace(temp, target)
+    except OSError as e:
+        temp.unlink(missing_ok=True)
+        raise VersionPackError(f"Failed to write pack for {version_path}: {e}") from e
+
+    _forget(target)
+    # A file rewritten while packing may have dropped the old pack before
+    # this one was installed; writers drop the pack after writing, so a
+    # change not visible here will remove this pack itself
+    for member, identity in identities.items():
+        try:
+            current = _identity((version_path / member).stat())
+        except FileNotFoundError:
+            current = None
+        if current != identity:
+            remove_pack(version_path)
+            raise VersionPackError(f"{member} changed while packing {version_path}")
+
+    return len(files), offset - _PREFIX.size - reserved
+
+
+def remove_pack(version_path: Path) -> None:
+    """Delete a version's pack (its loose files changed)."""
+    target = pack_path(version_path)
+    target.unlink(missing_ok=True)
+    _forget(target)
+
+
+def _identity(stat: os.stat_result) -> PackIdentity:
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _encode_header(files: Dict[str, List]) -> bytes:
+    return json.dumps(
+        {"format": PACK_FORMAT, "files": files}, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class PackReader:
+    """A memory-mapped pack file."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Map a pack file and load its header.
+
+        Raises:
+            OSError: If the file cannot be opened or mapped
+            VersionPackError: If the file is not a pack of a known format
+        """
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity: PackIdentity = _identity(stat)
+
+        try:
+            magic, header_length = _PREFIX.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise VersionPackError(f"Not a pack file: {path}")
+            header = json.loads(self._map[_PREFIX.size:_PREFIX.size + header_length])
+        except (struct.error, ValueError) as e:
+            raise VersionPackError(f"Malformed pack header in {path}: {e}") from e
+        if header.get("format") != PACK_FORMAT:
+            raise VersionPackError(f"Unsupported pack format in {path}")
+
+        self.files: Dict[str, List] = header["files"]
+        self._view = memoryview(self._map)
+
+    def read(self, member: str) -> Optional[memoryview]:
+        """
+        Zero-copy view of a packed file.
+
+        Args:
+            member: Path relative to the version directory
+
+        Returns:
+            The file's bytes, or None if it is not in the pack
+        """
+        entry = self.files.get(member)
+        if entry is None:
+            return None
+        offset, length = entry[0], entry[1]
+        return self._view[offset:offset + length]
+
+    def sha256(self, member: str) -> Optional[str]:
+        """Hex sha256 of a packed file recorded at pack time."""
+        entry = self.files.get(member)
+        return entry[2] if entry else None
+
+    def source_identity(self, member: str) -> Optional[PackIdentity]:
+        """(mtime_ns, size, inode) of the loose file a member was packed from."""
+        entry = self.files.get(member)
+        return tuple(entry[3:6]) if entry else None
+
+
+_readers: Dict[str, PackReader] = {}
+_readers_lock = threading.Lock()
+
+
+def get_pack(version_path: Path) -> Optional[PackReader]:
+    """
+    Mapped pack of a version, if it has a current one.
+
+    Readers are shared per process and re-mapped when the pack file was
+    replaced; costs one stat per call.
+
+    Args:
+        version_path: Version directory
+
+    Returns:
+        The pack, or None if the version is not packed (or its pack is unreadable)
+    """
+    target = pack_path(version_path)
+    key = str(target)
+    try:
+        stat = target.stat()
+    except FileNotFoundError:
+        _forget(target)
+        return None
+
+    identity = _identity(stat)
+    with _readers_lock:
+        reader = _readers.get(key)
+        if reader is not None and reader.identity == identity:
+            return reader
+        try:
+            reader = PackReader(target)
+        except (OSError, VersionPackError):
+            _readers.pop(key, None)
+            return None
+        _readers[key] = reader
+        return reader
+
+
+def _forget(target: Path) -> None:
+    """Drop a cached reader; its map is released once no slice refers to it."""
+    with _readers_lock:
+        _readers.pop(str(target), None)
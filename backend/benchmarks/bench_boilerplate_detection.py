@@ -0,0 +1,111 @@
+"""
+Benchmark statistical repeated-line detection during generation.
+
+Writes a synthetic specification of about ``--pages`` pages whose running
+title matches no rule set, then generates chapters from the file as the
+ingestion worker does, with detection disabled and enabled
+(BOILERPLATE_REPEAT_FRACTION), alternating runs. Reports the best total
+time of each, the time of the detection pass alone and the lines removed by
+detection.
+
+Usage (from backend/):
+    python -m benchmarks.bench_boilerplate_detection
+    python -m benchmarks.bench_boilerplate_detection --pages 2000 --streaming
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Tuple
+
+from app.services.boilerplate_filter import REPEATED_LINE, detect_repeated_lines, element_lines
+from app.services.docling_stream import DoclingSpillIndex
+from app.services.ingestion_executor import GenerationResult, generate_chapters_from_file
+from app.services.rich_markdown_generator import RichMarkdownGenerator
+from benchmarks.synthetic import make_docling_document
+
+RUNNING_TITLE = "ACME Derivatives Exchange - Member Interface Specification"
+
+# Pages per synthetic chapter: one per section plus one per continued table
+SECTIONS = 12
+TABLES = 3
+
+
+def generate(path: Path, streaming: bool, fraction: float) -> Tuple[float, GenerationResult]:
+    """Total time and result of one generation with the given repeat fraction."""
+    result = generate_chapters_from_file(
+        str(path), streaming, str(path.parent), repeat_fraction=fraction
+    )
+    return result.parse_seconds + result.generate_seconds, result
+
+
+def best_detection(path: Path, streaming: bool, fraction: float, repeat: int) -> float:
+    """Best time of the detection pass alone, over the input the worker uses."""
+    if streaming:
+        with open(path, "rb") as f:
+            index = DoclingSpillIndex.build(f, path.parent)
+        source: Callable[[], Iterable[Tuple[str, str, int]]] = index.iter_body_lines
+    else:
+        index = None
+        elements = RichMarkdownGenerator(json.loads(path.read_bytes())).body_elements
+        source = lambda: element_lines(elements)  # noqa: E731
+
+    timings = []
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            detect_repeated_lines(source(), fraction)
+            timings.append(time.perf_counter() - started)
+    finally:
+        if index is not None:
+            index.close()
+    return min(timings)
+
+
+def main(pages: int, streaming: bool, fraction: float, repeat: int) -> None:
+    document = make_docling_document(
+        chapters=max(1, pages // (SECTIONS + TABLES)),
+        sections=SECTIONS,
+        tables=TABLES,
+        running_title=RUNNING_TITLE,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "spec.json"
+        path.write_text(json.dumps(document))
+        print(
+            f"{len(document['texts'])} texts on ~{pages} pages, "
+            f"{path.stat().st_size / 1e6:.1f} MB, "
+            f"{'streaming' if streaming else 'in-memory'}, best of {repeat}"
+        )
+
+        # Alternate so drift on a busy machine affects both sides alike
+        off_runs, on_runs = [], []
+        for _ in range(repeat):
+            off_runs.append(generate(path, streaming, 0.0))
+            on_runs.append(generate(path, streaming, fraction))
+        detection = best_detection(path, streaming, fraction, repeat)
+
+    off_total, off = min(off_runs, key=lambda run: run[0])
+    on_total, on = min(on_runs, key=lambda run: run[0])
+
+    print(f"  detection off  {off_total:7.3f}s")
+    print(f"  detection on   {on_total:7.3f}s  ({(on_total / off_total - 1) * 100:+.1f}%)")
+    print(f"  detection pass {detection:7.3f}s  ({detection / off_total * 100:.1f}% of ingest)")
+    print(f"  lines removed by detection: {on.boilerplate_hits.get(REPEATED_LINE, 0)}")
+
+    leaked = sum(RUNNING_TITLE in c.markdown_content for c in off.chapters)
+    assert not any(RUNNING_TITLE in c.markdown_content for c in on.chapters), (
+        "Running title survived detection"
+    )
+    print(f"  chapters containing the running title: {leaked} without, 0 with detection")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--fraction", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--streaming", action="store_true")
+    args = parser.parse_args()
+    main(args.pages, args.streaming, args.fraction, args.repeat)
@@ -0,0 +1,82 @@
+"""
+Benchmark FileStorageService.read_chapter with and without the chapter cache.
+
+Writes ``--chapters`` chapter files of ``--size`` KB each and reads them in a
+skewed pattern like the section endpoint sees (most reads go to a few hot
+chapters), once with caching disabled and once with a budget of
+``--budget`` MB. Reports reads per second and the cache counters; an
+out-of-band rewrite of a hot chapter checks that stale content is never
+served.
+
+Usage (from backend/):
+    python -m benchmarks.bench_chapter_cache
+    python -m benchmarks.bench_chapter_cache --chapters 200 --size 512 --budget 16
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from app.services.chapter_cache import ChapterCache
+from app.services.file_storage import FileStorageService
+
+HOT_CHAPTERS = 10
+HOT_SHARE = 0.9
+
+
+def read_pattern(chapters: int, reads: int) -> List[int]:
+    """Chapter indices to read: HOT_SHARE of reads go to HOT_CHAPTERS chapters."""
+    rng = random.Random(42)
+    hot = min(HOT_CHAPTERS, chapters)
+    return [
+        rng.randrange(hot) if rng.random() < HOT_SHARE else rng.randrange(chapters)
+        for _ in range(reads)
+    ]
+
+
+def run(storage: FileStorageService, paths: List[str], pattern: List[int]) -> float:
+    """Reads per second over the pattern."""
+    started = time.perf_counter()
+    for index in pattern:
+        storage.read_chapter(paths[index])
+    return len(pattern) / (time.perf_counter() - started)
+
+
+def main(chapters: int, size_kb: int, budget_mb: int, reads: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = FileStorageService(tmp, chapter_split_threshold=0, chapter_cache=ChapterCache(0))
+        body = ("| Field | Type | Description |\n" * (size_kb * 1024 // 33))
+        paths = [
+            writer.save_chapter("spec", "v1", number, f"Chapter {number}", f"# Chapter {number}\n{body}")
+            for number in range(1, chapters + 1)
+        ]
+        pattern = read_pattern(chapters, reads)
+        print(f"{chapters} chapters of {size_kb} KB, {reads} reads, {HOT_SHARE:.0%} to {HOT_CHAPTERS} chapters")
+
+        uncached = run(FileStorageService(tmp, chapter_cache=ChapterCache(0)), paths, pattern)
+        cache = ChapterCache(budget_mb * 1024 * 1024)
+        cached_storage = FileStorageService(tmp, chapter_cache=cache)
+        cached = run(cached_storage, paths, pattern)
+
+        print(f"  no cache        {uncached:10.0f} reads/s")
+        print(f"  {budget_mb:3d} MB cache    {cached:10.0f} reads/s  ({cached / uncached:.1f}x)")
+        print(f"  counters: {cache.stats()}")
+
+        # Out-of-band edit of a hot chapter (same size, rewritten in place)
+        hot_path = Path(tmp) / paths[0]
+        original = hot_path.read_text()
+        hot_path.write_text(original.replace("Field", "FIELD", 1))
+        assert "FIELD" in cached_storage.read_chapter(paths[0]), "Stale chapter served"
+        print("  out-of-band edit picked up")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chapters", type=int, default=100)
+    parser.add_argument("--size", type=int, default=256, help="Chapter size in KB")
+    parser.add_argument("--budget", type=int, default=64, help="Cache budget in MB")
+    parser.add_argument("--reads", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.chapters, args.size, args.budget, args.reads)
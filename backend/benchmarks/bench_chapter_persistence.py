@@ -0,0 +1,123 @@
+"""
+Benchmark chapter persistence: per-chapter flush + UPDATE vs bulk INSERT.
+
+The legacy path issues 2 round trips per chapter (INSERT via flush, then an
+UPDATE for the search vector). The bulk path used by DocumentProcessor inserts
+all rows, search vectors included, with multi-row INSERTs.
+
+Requires a migrated PostgreSQL database (DATABASE_URL). Every run happens in
+a transaction that is rolled back, so nothing is left behind. Only database
+time is measured; chapter files are not written.
+
+Usage (from backend/):
+    python -m benchmarks.bench_chapter_persistence
+    python -m benchmarks.bench_chapter_persistence --sizes 50 500 5000
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+from uuid import UUID, uuid4
+
+from sqlalchemy import func
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models import Chapter, Document, DocumentVersion
+from app.services.document_processor_v2 import DocumentProcessor
+
+# Roughly one page of protocol text per paragraph
+PARAGRAPH = (
+    "The trader workstation sends the order entry request with the token number, "
+    "buy/sell indicator, disclosed volume and price. The exchange validates the "
+    "request and responds with an order confirmation or an error code. "
+)
+
+
+def make_chapters(count: int, paragraphs: int = 20) -> List[Dict]:
+    """Synthetic chapter dicts shaped like DocumentProcessor._parse_file output."""
+    return [
+        {
+            "chapter_number": i + 1,
+            "title": f"Chapter {i + 1} Message Structures",
+            "content": f"# Chapter {i + 1}\n\n" + (PARAGRAPH * paragraphs),
+            "page_range": f"{i * 3 + 1}-{i * 3 + 3}",
+        }
+        for i in range(count)
+    ]
+
+
+async def legacy_persist(db, version_id: UUID, chapters: List[Dict]) -> None:
+    """Previous implementation: add + flush + UPDATE per chapter."""
+    for chapter_data in chapters:
+        chapter = Chapter(
+            version_id=version_id,
+            chapter_number=chapter_data["chapter_number"],
+            title=chapter_data["title"],
+            file_path=f"bench/chapter-{chapter_data['chapter_number']}.md",
+            page_range=chapter_data["page_range"],
+            word_count=len(chapter_data["content"].split()),
+            has_manual_content=False,
+            has_linked_docs=False,
+        )
+        db.add(chapter)
+        await db.flush()
+
+        search_text = f"{chapter_data['title']} {chapter_data['content']}"
+        await db.execute(
+            Chapter.__table__.update()
+            .where(Chapter.id == chapter.id)
+            .values(search_vector=func.to_tsvector("english", search_text))
+        )
+
+
+async def bulk_persist(db, version_id: UUID, chapters: List[Dict]) -> None:
+    """Current implementation: multi-row INSERT with server-side tsvector."""
+    processor = DocumentProcessor.__new__(DocumentProcessor)
+    rows = [
+        processor._chapter_row(
+            version_id, chapter_data, f"bench/chapter-{chapter_data['chapter_number']}.md"
+        )
+        for chapter_data in chapters
+    ]
+    await processor._bulk_insert_chapters(db, version_id, rows)
+
+
+async def time_run(persist, chapters: List[Dict]) -> float:
+    """Time one persistence run inside a rolled-back transaction."""
+    async with AsyncSessionLocal() as db:
+        slug = f"bench-{uuid4().hex[:12]}"
+        document = Document(slug=slug, title=slug, storage_path=slug)
+        db.add(document)
+        await db.flush()
+        version = DocumentVersion(document_id=document.id, version="bench", status="draft")
+        db.add(version)
+        await db.flush()
+
+        start = time.perf_counter()
+        await persist(db, version.id, chapters)
+        await db.flush()
+        elapsed = time.perf_counter() - start
+
+        await db.rollback()
+        return elapsed
+
+
+async def main(sizes: List[int], repeat: int) -> None:
+    engine.echo = False  # SQL logging would dominate the timings
+    print(f"{'chapters':>8} | {'legacy (s)':>10} | {'bulk (s)':>8} | {'speedup':>7}")
+    print("-" * 44)
+    for size in sizes:
+        chapters = make_chapters(size)
+        legacy = min([await time_run(legacy_persist, chapters) for _ in range(repeat)])
+        bulk = min([await time_run(bulk_persist, chapters) for _ in range(repeat)])
+        print(f"{size:>8} | {legacy:>10.3f} | {bulk:>8.3f} | {legacy / bulk:>6.1f}x")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best is reported)")
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.repeat))
@@ -0,0 +1,172 @@
+"""
+Memory benchmark for per-chapter markdown generation.
+
+Compares the previous list-at-every-stage flow (filtered list, merged list
+with copied table grids, markdown parts list, four whole-chapter callout
+passes) against the current lazy pipeline on a table-heavy chapter, using
+tracemalloc to measure peak traced memory while the chapter is generated.
+
+Usage (from backend/):
+    python -m benchmarks.bench_chapter_pipeline
+    python -m benchmarks.bench_chapter_pipeline --tables 600 --rows 60
+"""
+import argparse
+import copy
+import re
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.services.rich_markdown_generator import RichMarkdownGenerator
+
+
+def make_chapter(tables: int, rows: int) -> Dict[str, Any]:
+    """A chapter of message-format tables, each continued over three pages."""
+    elements: List[Dict[str, Any]] = [
+        {"label": "section_header", "level": 1, "text": "Chapter 4 Message Formats",
+         "prov": [{"page_no": 1}]},
+    ]
+    header = [
+        {"text": name, "col_span": 1, "start_col_offset_idx": i}
+        for i, name in enumerate(["Structure Member", "Data Type", "Length", "Offset"])
+    ]
+    page = 1
+    for t in range(tables):
+        elements.append({"label": "section_header", "level": 2,
+                         "text": f"4.{t} Order Entry Request", "prov": [{"page_no": page}]})
+        elements.append({"label": "text", "text": f"Note: structure {t} is sent by the trader.",
+                         "prov": [{"page_no": page}]})
+        for part in range(3):
+            grid = [header] + [
+                [{"text": f"Field{t}_{part}_{r}", "col_span": 1, "start_col_offset_idx": 0},
+                 {"text": "LONG", "col_span": 1, "start_col_offset_idx": 1},
+                 {"text": "4", "col_span": 1, "start_col_offset_idx": 2},
+                 {"text": str(r * 4), "col_span": 1, "start_col_offset_idx": 3}]
+                for r in range(rows)
+            ]
+            elements.append({"label": "table", "prov": [{"page_no": page}],
+                             "data": {"num_rows": len(grid), "grid": grid}})
+            elements.append({"label": "page_footer", "text": "Non-Confidential",
+                             "prov": [{"page_no": page}]})
+            elements.append({"label": "text", "text": str(page), "prov": [{"page_no": page}]})
+            page += 1
+    return {"chapter_number": 4, "title": elements[0]["text"], "elements": elements}
+
+
+class LegacyGenerator(RichMarkdownGenerator):
+    """Previous per-chapter flow, kept here for comparison."""
+
+    def _generate_chapter_markdown(self, chapter_info, index):
+        title = chapter_info["title"]
+        elements = chapter_info["elements"]
+        md_parts = [f"# {title}\n"]
+        filtered_elements = list(self._filter_page_footers(elements[1:]))
+        merged_elements = self._legacy_merge(filtered_elements)
+        for element in merged_elements:
+            md = self._element_to_markdown(element)
+            if md:
+                md_parts.append(md)
+        markdown_content = "\n\n".join(md_parts)
+        for kind in ("note", "important", "warning", "tip"):
+            markdown_content = re.sub(
+                rf'^({kind.capitalize()}:|{kind.upper()}:)\s*(.+)$',
+                rf'> [!{kind}]\n> \2',
+                markdown_content,
+                flags=re.MULTILINE,
+            )
+        self._extract_searchable_text(markdown_content)
+        return markdown_content
+
+    def _legacy_merge(self, elements):
+        merged = []
+        i = 0
+        while i < len(elements):
+            element = elements[i]
+            if element.get("label") == "table":
+                current_page = self._get_page_number(element)
+                current_headers = self._get_table_headers(element)
+                j = i + 1
+                continuation_tables = []
+                while j < len(elements):
+                    next_elem = elements[j]
+                    next_label = next_elem.get("label", "")
+                    if next_label == "section_header":
+                        break
+                    if next_label == "table":
+                        if (current_headers == self._get_table_headers(next_elem) and
+                                0 <= self._get_page_number(next_elem) - current_page <= 3):
+                            continuation_tables.append(next_elem)
+                            j += 1
+                        else:
+                            break
+                    elif next_label in ["text", "picture"]:
+                        j += 1
+                    else:
+                        break
+                if continuation_tables:
+                    merged.append(self._legacy_merge_tables(element, continuation_tables))
+                    i = j
+                else:
+                    merged.append(element)
+                    i += 1
+            else:
+                merged.append(element)
+                i += 1
+        return merged
+
+    def _legacy_merge_tables(self, first_table, continuation_tables):
+        merged = dict(first_table)
+        merged_data = dict(first_table.get("data", {}))
+        merged_grid = list(merged_data.get("grid", []))
+        for cont_table in continuation_tables:
+            cont_grid = cont_table.get("data", {}).get("grid", [])
+            if len(cont_grid) > 1:
+                merged_grid.extend(cont_grid[1:])
+        merged_data["grid"] = merged_grid
+        merged["data"] = merged_data
+        return merged
+
+
+def current_flow(chapter_info: Dict[str, Any]) -> str:
+    generator = RichMarkdownGenerator({})
+    return generator._generate_chapter_markdown(chapter_info, 0).markdown_content
+
+
+def legacy_flow(chapter_info: Dict[str, Any]) -> str:
+    return LegacyGenerator({})._generate_chapter_markdown(chapter_info, 0)
+
+
+def measure(func: Callable[[Dict[str, Any]], str], chapter: Dict[str, Any]) -> Tuple[str, float, int]:
+    """Run ``func`` on a private copy of the chapter (the current flow merges in place)."""
+    chapter = copy.deepcopy(chapter)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = func(chapter)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(tables: int, rows: int) -> None:
+    chapter = make_chapter(tables, rows)
+
+    legacy, legacy_time, legacy_peak = measure(legacy_flow, chapter)
+    current, current_time, current_peak = measure(current_flow, chapter)
+    assert legacy == current, "Pipeline output differs from the legacy flow"
+
+    mb = 1024 * 1024
+    print(f"{tables} tables x 3 pages x {rows} rows, {len(current) / mb:.1f} MB markdown")
+    print(f"  {'':<16}{'peak MB':>10}{'seconds':>10}")
+    print(f"  {'legacy lists':<16}{legacy_peak / mb:>10.1f}{legacy_time:>10.2f}")
+    print(f"  {'lazy pipeline':<16}{current_peak / mb:>10.1f}{current_time:>10.2f}")
+    print(f"  peak reduction: {100 * (1 - current_peak / legacy_peak):.0f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tables", type=int, default=400)
+    parser.add_argument("--rows", type=int, default=40)
+    args = parser.parse_args()
+    main(args.tables, args.rows)
@@ -0,0 +1,94 @@
+"""
+Benchmark serving chapters pre-compressed against compressing per request.
+
+Writes ``--chapters`` chapters of about ``--size`` KB with a compressed variant
+(CHAPTER_PRECOMPRESSION) and compares, per response body:
+
+- plain: read_chapter_encoded without Accept-Encoding (no compression)
+- on the fly: read the plain body and gzip it per request at level 9, as
+  Starlette's GZipMiddleware does by default
+- pre-compressed: read_chapter_encoded returning the stored variant
+
+Also reports the disk footprint of the chapters and of their variants.
+
+Usage (from backend/):
+    python -m benchmarks.bench_chapter_precompression
+    python -m benchmarks.bench_chapter_precompression --encoding zstd --size 1024
+"""
+import argparse
+import gzip
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from app.services.chapter_cache import ChapterCache
+from app.services.chapter_variants import VARIANT_SUFFIXES
+from app.services.file_storage import FileStorageService
+
+
+def make_chapter(size_kb: int, seed: int) -> str:
+    """Field-table markdown of roughly ``size_kb`` KB, like a message-structure chapter."""
+    rng = random.Random(seed)
+    rows = []
+    while sum(map(len, rows)) < size_kb * 1024:
+        rows.append(
+            f"| Field{rng.randrange(10 ** 6)} | {rng.choice(['CHAR', 'LONG', 'SHORT'])} "
+            f"| {rng.randrange(64)} | Identifier of the order {rng.randrange(999)} |\n"
+        )
+    return "| Field | Type | Length | Description |\n|---|---|---|---|\n" + "".join(rows)
+
+
+def rate(serve: Callable[[str], bytes], paths: List[str], rounds: int) -> float:
+    """Responses per second."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for path in paths:
+            serve(path)
+    return len(paths) * rounds / (time.perf_counter() - started)
+
+
+def main(chapters: int, size_kb: int, encoding: str, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = FileStorageService(tmp, chapter_cache=ChapterCache(0), precompression=encoding)
+        contents = [make_chapter(size_kb, number) for number in range(1, chapters + 1)]
+        started = time.perf_counter()
+        paths = [
+            storage.save_chapter("spec", "v1", number, f"Chapter {number}", content)
+            for number, content in enumerate(contents, 1)
+        ]
+        write_seconds = time.perf_counter() - started
+
+        plain_bytes = sum((Path(tmp) / path).stat().st_size for path in paths)
+        variant_bytes = sum(
+            (Path(tmp) / (path + VARIANT_SUFFIXES[encoding])).stat().st_size for path in paths
+        )
+        print(
+            f"{chapters} chapters of ~{size_kb} KB, {encoding} variants, chapter cache off; "
+            f"written in {write_seconds:.2f}s"
+        )
+        print(
+            f"  on disk: chapters {plain_bytes / 1e6:.1f} MB, variants {variant_bytes / 1e6:.1f} MB "
+            f"({plain_bytes / variant_bytes:.1f}:1)"
+        )
+
+        runs = {
+            "plain": lambda path: storage.read_chapter_encoded(path, None)[0],
+            "gzip on the fly": lambda path: gzip.compress(
+                storage.read_chapter_encoded(path)[0], compresslevel=9
+            ),
+            "pre-compressed": lambda path: storage.read_chapter_encoded(path, encoding)[0],
+        }
+        for name, serve in runs.items():
+            print(f"  {name:<16} {rate(serve, paths, rounds):8.0f} responses/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chapters", type=int, default=20)
+    parser.add_argument("--size", type=int, default=256, help="Chapter size in KB")
+    parser.add_argument("--encoding", choices=sorted(VARIANT_SUFFIXES), default="gzip")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main(args.chapters, args.size, args.encoding, args.rounds)
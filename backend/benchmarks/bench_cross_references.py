@@ -0,0 +1,94 @@
+"""
+Benchmark the chapter cross-reference pass of RichMarkdownGenerator.
+
+Compares the previous implementation (one re.sub with a freshly built
+pattern per other chapter, i.e. O(chapters^2) scans) against the current
+single-pass linker on a synthetic spec.
+
+Usage (from backend/):
+    python -m benchmarks.bench_cross_references
+    python -m benchmarks.bench_cross_references --chapters 60 --paragraphs 400
+"""
+import argparse
+import random
+import re
+import time
+from typing import Dict, List
+
+from app.services.rich_markdown_generator import ChapterMarkdown, RichMarkdownGenerator
+
+
+def make_chapters(count: int, paragraphs: int, seed: int = 7) -> List[ChapterMarkdown]:
+    """Synthetic chapters whose paragraphs mention other chapters."""
+    rnd = random.Random(seed)
+    chapters = []
+    for number in range(1, count + 1):
+        parts = [f"# Chapter {number} Message Formats"]
+        for i in range(paragraphs):
+            other = rnd.randint(1, count)
+            parts.append(
+                f"Paragraph {i}: the order entry structure is described in "
+                f"Chapter {other}; error codes are listed in Chapter {rnd.randint(1, count)}."
+            )
+        chapters.append(
+            ChapterMarkdown(
+                chapter_number=number,
+                title=f"Chapter {number} Message Formats",
+                markdown_content="\n\n".join(parts),
+                searchable_text="",
+                page_range=(number, number),
+                metadata={},
+                anchor_id=f"chapter-{number}-message-formats",
+            )
+        )
+    return chapters
+
+
+def legacy_cross_references(chapters: List[ChapterMarkdown]) -> List[str]:
+    """Previous implementation, kept here for comparison."""
+    chapter_map: Dict[int, str] = {
+        ch.chapter_number: ch.anchor_id for ch in chapters if ch.chapter_number > 0
+    }
+    results = []
+    for chapter in chapters:
+        content = chapter.markdown_content
+        for ch_num, anchor in chapter_map.items():
+            if ch_num != chapter.chapter_number:
+                pattern = rf'\bChapter\s+{ch_num}\b(?!\]\()'
+                content = re.sub(pattern, f"[Chapter {ch_num}](#{anchor})", content)
+        results.append(content)
+    return results
+
+
+def main(chapter_count: int, paragraphs: int, repeat: int) -> None:
+    chapters = make_chapters(chapter_count, paragraphs)
+    size_mb = sum(len(ch.markdown_content) for ch in chapters) / 1_000_000
+    generator = RichMarkdownGenerator({})
+
+    legacy_times, current_times = [], []
+    for _ in range(repeat):
+        re.purge()  # The legacy path relied on re's pattern cache
+        start = time.perf_counter()
+        legacy = legacy_cross_references(chapters)
+        legacy_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        current = [ch.markdown_content for ch in generator._add_cross_references(chapters)]
+        current_times.append(time.perf_counter() - start)
+
+    assert legacy == current, "Linker output differs from the legacy implementation"
+
+    legacy_best, current_best = min(legacy_times), min(current_times)
+    print(f"{chapter_count} chapters, {size_mb:.1f} MB markdown (best of {repeat})")
+    print(f"  legacy (re.sub per chapter pair): {legacy_best:.3f}s")
+    print(f"  single-pass linker:               {current_best:.3f}s")
+    print(f"  speedup:                          {legacy_best / current_best:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chapters", type=int, default=60)
+    parser.add_argument("--paragraphs", type=int, default=200, help="Paragraphs per chapter")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.chapters, args.paragraphs, args.repeat)
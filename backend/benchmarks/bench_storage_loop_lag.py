@@ -0,0 +1,122 @@
+"""
+Load test: event-loop lag while large chapters are read concurrently.
+
+Writes ``--chapters`` chapter files of ``--size`` MB and has ``--clients``
+coroutines read them in a loop, as concurrent ``get_section`` requests do,
+while a probe coroutine measures how late the event loop wakes it up
+(scheduled every millisecond). Chapters are read once by calling
+FileStorageService directly from the coroutines (the old handlers) and once
+through AsyncFileStorage. The chapter cache is disabled so every request
+reads the file.
+
+Usage (from backend/):
+    python -m benchmarks.bench_storage_loop_lag
+    python -m benchmarks.bench_storage_loop_lag --size 8 --clients 32 --seconds 5
+    STORAGE_IO_THREADS=8 python -m benchmarks.bench_storage_loop_lag
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from app.services.async_file_storage import (
+    AsyncFileStorage,
+    shutdown_storage_executor,
+    storage_pool_size,
+)
+from app.services.chapter_cache import ChapterCache
+from app.services.file_storage import FileStorageService
+
+PROBE_INTERVAL = 0.001
+LAG_BUDGET_MS = 5.0
+
+
+async def probe(lags: List[float], stop: asyncio.Event) -> None:
+    """Record how late each PROBE_INTERVAL sleep returns."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def load(
+    read: Callable[[str], Awaitable[str]],
+    paths: List[str],
+    clients: int,
+    seconds: float,
+) -> Tuple[List[float], int]:
+    """Run readers for ``seconds``; return the probe's lags and the reads done."""
+    stop = asyncio.Event()
+    lags: List[float] = []
+    reads = 0
+
+    async def client(offset: int) -> None:
+        nonlocal reads
+        index = offset
+        while not stop.is_set():
+            await read(paths[index % len(paths)])
+            reads += 1
+            index += 1
+            # Yield like a handler awaiting the DB would
+            await asyncio.sleep(0)
+
+    probe_task = asyncio.create_task(probe(lags, stop))
+    tasks = [asyncio.create_task(client(offset)) for offset in range(clients)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(probe_task, *tasks)
+    return lags, reads
+
+
+def report(name: str, lags: List[float], reads: int, seconds: float) -> float:
+    """Print lag percentiles; return the p99 lag in milliseconds."""
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[int(len(lags_ms) * 0.99)] if lags_ms else float("inf")
+    print(
+        f"  {name:<18} lag p50 {statistics.median(lags_ms):7.2f} ms  "
+        f"p99 {p99:7.2f} ms  max {lags_ms[-1]:8.2f} ms  "
+        f"({reads / seconds:6.1f} reads/s, {len(lags_ms)} probes)"
+    )
+    return p99
+
+
+async def main(chapters: int, size_mb: int, clients: int, seconds: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = FileStorageService(
+            tmp, chapter_split_threshold=0, chapter_cache=ChapterCache(0)
+        )
+        line = "| OrderEntry | 0x01 | Char | 16 | Order identifier assigned by the exchange |\n"
+        body = line * (size_mb * 1024 * 1024 // len(line))
+        paths = [
+            storage.save_chapter("spec", "v1", number, f"Chapter {number}", body)
+            for number in range(1, chapters + 1)
+        ]
+        print(
+            f"{chapters} chapters of {size_mb} MB, {clients} concurrent readers, "
+            f"{storage_pool_size()} storage threads, {seconds:.0f}s per run"
+        )
+
+        async def read_blocking(path: str) -> str:
+            return storage.read_chapter(path)
+
+        lags, reads = await load(read_blocking, paths, clients, seconds)
+        report("direct (blocking)", lags, reads, seconds)
+
+        lags, reads = await load(AsyncFileStorage(storage).read_chapter, paths, clients, seconds)
+        p99 = report("AsyncFileStorage", lags, reads, seconds)
+        shutdown_storage_executor()
+
+    verdict = "within" if p99 < LAG_BUDGET_MS else "OVER"
+    print(f"  p99 lag with AsyncFileStorage is {verdict} the {LAG_BUDGET_MS:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chapters", type=int, default=8)
+    parser.add_argument("--size", type=int, default=4, help="Chapter size in MB")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.chapters, args.size, args.clients, args.seconds))
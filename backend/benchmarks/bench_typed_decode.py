@@ -0,0 +1,82 @@
+"""
+Benchmark typed Docling decoding against the dict path.
+
+Decodes the same serialized synthetic specification with ``json.loads`` +
+RichMarkdownGenerator and with msgspec structs + TypedRichMarkdownGenerator,
+checks the chapters are identical and reports the best decode, generate and
+total time of several repeats for each path.
+
+Usage (from backend/):
+    python -m benchmarks.bench_typed_decode
+    python -m benchmarks.bench_typed_decode --chapters 64 --repeat 10
+"""
+import argparse
+import json
+import time
+from typing import Callable, List, Tuple
+
+from app.services.docling_structs import (
+    TYPED_DECODE_AVAILABLE,
+    TypedRichMarkdownGenerator,
+    decode_docling_json,
+)
+from app.services.rich_markdown_generator import ChapterMarkdown, RichMarkdownGenerator
+from benchmarks.synthetic import make_docling_document
+
+
+def dict_path(data: bytes) -> Tuple[List[ChapterMarkdown], float, float]:
+    start = time.perf_counter()
+    generator = RichMarkdownGenerator(json.loads(data))
+    decoded = time.perf_counter()
+    chapters = generator.generate_chapters()
+    return chapters, decoded - start, time.perf_counter() - decoded
+
+
+def typed_path(data: bytes) -> Tuple[List[ChapterMarkdown], float, float]:
+    start = time.perf_counter()
+    generator = TypedRichMarkdownGenerator(decode_docling_json(data))
+    decoded = time.perf_counter()
+    chapters = generator.generate_chapters()
+    return chapters, decoded - start, time.perf_counter() - decoded
+
+
+def best_of(
+    path: Callable[[bytes], Tuple[List[ChapterMarkdown], float, float]],
+    data: bytes,
+    repeat: int,
+) -> Tuple[List[ChapterMarkdown], float, float]:
+    """Best decode and generate times over ``repeat`` runs (decoded fresh each run)."""
+    runs = [path(data) for _ in range(repeat)]
+    return runs[0][0], min(r[1] for r in runs), min(r[2] for r in runs)
+
+
+def main(chapter_count: int, sections: int, repeat: int) -> None:
+    if not TYPED_DECODE_AVAILABLE:
+        raise SystemExit("msgspec is not installed")
+
+    data = json.dumps(
+        make_docling_document(chapters=chapter_count, sections=sections)
+    ).encode()
+    print(f"{chapter_count} chapters, {len(data) / 1e6:.1f} MB JSON, best of {repeat}")
+
+    baseline, dict_decode, dict_generate = best_of(dict_path, data, repeat)
+    chapters, typed_decode, typed_generate = best_of(typed_path, data, repeat)
+    assert [c.__dict__ for c in chapters] == [c.__dict__ for c in baseline], (
+        "Typed output differs from the dict path"
+    )
+
+    dict_total = dict_decode + dict_generate
+    typed_total = typed_decode + typed_generate
+    print(f"  {'':6} {'decode':>8} {'generate':>9} {'total':>8}")
+    print(f"  {'dict':6} {dict_decode:7.3f}s {dict_generate:8.3f}s {dict_total:7.3f}s")
+    print(f"  {'typed':6} {typed_decode:7.3f}s {typed_generate:8.3f}s {typed_total:7.3f}s"
+          f"  ({dict_total / typed_total:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chapters", type=int, default=32)
+    parser.add_argument("--sections", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.chapters, args.sections, args.repeat)
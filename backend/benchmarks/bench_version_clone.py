@@ -0,0 +1,78 @@
+"""
+Benchmark creating a draft version: full copy against clone.
+
+Writes a version of about ``--megabytes`` MB (chapters, notes, metadata),
+then creates a draft of it with ``copy_version_directory`` twice, copying
+and cloning. Reports the time and the extra disk space each draft takes
+(free-space delta of the file system), then edits a chapter in the clone
+to check that the source version is unaffected (break-on-write).
+
+Run it on the storage file system (``--dir``): reflinks need btrfs/XFS,
+elsewhere the clone falls back to hardlinks.
+
+Usage (from backend/):
+    python -m benchmarks.bench_version_clone
+    python -m benchmarks.bench_version_clone --megabytes 500 --dir storage
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.chapter_cache import ChapterCache
+from app.services.file_storage import FileStorageService
+
+CHAPTER_KB = 512
+
+
+def free_bytes(path: str) -> int:
+    """Free space of the file system holding ``path``."""
+    stat = os.statvfs(path)
+    return stat.f_bavail * stat.f_frsize
+
+
+def main(megabytes: int, directory: str) -> None:
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        storage = FileStorageService(
+            tmp, chapter_split_threshold=0, chapter_cache=ChapterCache(0), precompression="none"
+        )
+        body = "| Field | Type | Length | Description |\n" * (CHAPTER_KB * 1024 // 38)
+        chapters = max(1, megabytes * 1024 // CHAPTER_KB)
+        paths = [
+            storage.save_chapter("spec", "v1", number, f"Chapter {number}", body)
+            for number in range(1, chapters + 1)
+        ]
+        storage.save_user_document("spec", "v1", "notes", "review.md", "# Review\n")
+        storage.save_metadata("spec", "v1", {"version": "v1"})
+        os.sync()
+        print(f"Source version: {chapters} chapters, {chapters * CHAPTER_KB / 1024:.0f} MB")
+
+        for draft, clone in (("v2-copy", False), ("v2-clone", True)):
+            before = free_bytes(tmp)
+            started = time.perf_counter()
+            storage.copy_version_directory("spec", "v1", draft, clone=clone)
+            elapsed = time.perf_counter() - started
+            os.sync()
+            extra = before - free_bytes(tmp)
+            label = "clone" if clone else "copy"
+            print(f"  {label:<6} {elapsed * 1000:9.1f} ms   extra disk {extra / 1e6:8.1f} MB")
+
+        # Break-on-write: editing the clone must not change the source
+        draft_path = paths[0].replace("/v1/", "/v2-clone/")
+        storage.update_chapter(draft_path, "# Edited in draft\n")
+        storage.update_user_document("spec/versions/v2-clone/notes/review.md", "# Edited\n")
+        assert storage.read_chapter(paths[0]) == body, "Source chapter changed"
+        assert storage.read_user_document("spec/versions/v1/notes/review.md") == "# Review\n"
+        shared = os.stat(Path(tmp) / paths[1]).st_ino == os.stat(
+            Path(tmp) / paths[1].replace("/v1/", "/v2-clone/")
+        ).st_ino
+        print(f"  edits in the clone left the source intact (unedited files shared: {shared})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--megabytes", type=int, default=200)
+    parser.add_argument("--dir", default=None, help="Directory on the storage file system")
+    args = parser.parse_args()
+    main(args.megabytes, args.dir)
@@ -0,0 +1,84 @@
+"""
+Benchmark chapter reads from loose files against reads from a version pack.
+
+Writes a version of ``--chapters`` chapters of ``--size`` KB, then reads every
+chapter ``--rounds`` times through FileStorageService with the chapter cache
+disabled: once from the loose files and once after packing the version.
+Also counts the file-system calls per read by wrapping the ``os`` entry
+points, since on network-mounted storage each of them can be a round trip
+that local timings do not show (path validation's lstats are the same in
+both layouts and usually answered from the dentry cache).
+
+Usage (from backend/):
+    python -m benchmarks.bench_version_pack
+    python -m benchmarks.bench_version_pack --chapters 300 --size 16 --rounds 20
+"""
+import argparse
+import builtins
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from app.services.chapter_cache import ChapterCache
+from app.services.file_storage import FileStorageService
+
+
+@contextmanager
+def count_calls() -> Iterator[Dict[str, int]]:
+    """Count open/stat/lstat/fstat calls made inside the block."""
+    counts = {"open": 0, "stat": 0, "lstat": 0, "fstat": 0}
+    originals = {"open": builtins.open, "stat": os.stat, "lstat": os.lstat, "fstat": os.fstat}
+
+    def counted(name):
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return originals[name](*args, **kwargs)
+        return wrapper
+
+    builtins.open = counted("open")
+    os.stat, os.lstat, os.fstat = counted("stat"), counted("lstat"), counted("fstat")
+    try:
+        yield counts
+    finally:
+        builtins.open = originals["open"]
+        os.stat, os.lstat, os.fstat = originals["stat"], originals["lstat"], originals["fstat"]
+
+
+def run(storage: FileStorageService, paths: List[str], rounds: int) -> float:
+    """Chapter reads per second."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for path in paths:
+            storage.read_chapter(path)
+    return len(paths) * rounds / (time.perf_counter() - started)
+
+
+def main(chapters: int, size_kb: int, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = FileStorageService(tmp, chapter_split_threshold=0, chapter_cache=ChapterCache(0))
+        body = "| Field | Type | Length | Description |\n" * (size_kb * 1024 // 38)
+        paths = [
+            storage.save_chapter("spec", "v1", number, f"Chapter {number}", body)
+            for number in range(1, chapters + 1)
+        ]
+        print(f"{chapters} chapters of {size_kb} KB, {rounds} rounds, chapter cache off")
+
+        for label in ("loose files", "version pack"):
+            if label == "version pack":
+                storage.pack_version("spec", "v1")
+            rate = run(storage, paths, rounds)
+            with count_calls() as counts:
+                storage.read_chapter(paths[0])
+            calls = ", ".join(f"{name} {count}" for name, count in counts.items())
+            print(f"  {label:<13} {rate:9.0f} reads/s   per read: {calls}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chapters", type=int, default=200)
+    parser.add_argument("--size", type=int, default=16, help="Chapter size in KB")
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    main(args.chapters, args.size, args.rounds)
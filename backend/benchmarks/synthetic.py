@@ -0,0 +1,112 @@
+"""Synthetic Docling documents shaped like exchange protocol specifications."""
+import random
+from typing import Any, Dict, List, Optional
+
+
+def make_docling_document(
+    chapters: int = 12,
+    sections: int = 6,
+    paragraphs: int = 8,
+    tables: int = 3,
+    seed: int = 1,
+    running_title: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build a Docling JSON document.
+
+    Each chapter has level 1/2 section headers, paragraphs with callouts and
+    chapter cross-references, page furniture, tables continued over two
+    pages, a list group, a picture and a code block.
+
+    Args:
+        chapters: Number of "Chapter X" level 1 headings
+        sections: Sections per chapter
+        paragraphs: Paragraphs per section
+        tables: Continued tables in the first section of each chapter
+        seed: Random seed for cross-reference targets
+        running_title: Extra furniture line on every page that no rule set
+            matches (e.g. another exchange's document title)
+
+    Returns:
+        Docling JSON document as a dict
+    """
+    rnd = random.Random(seed)
+    texts: List[Dict[str, Any]] = []
+    table_items: List[Dict[str, Any]] = []
+    groups: List[Dict[str, Any]] = []
+    pictures: List[Dict[str, Any]] = []
+    body: List[Dict[str, str]] = []
+    page = 1
+
+    def text(label: str, value: str, level: int = None) -> Dict[str, str]:
+        ref = f"#/texts/{len(texts)}"
+        element = {"self_ref": ref, "label": label, "text": value, "orig": value,
+                   "prov": [{"page_no": page, "bbox": {"l": 72.0, "t": 700.0}}]}
+        if level is not None:
+            element["level"] = level
+        texts.append(element)
+        return {"$ref": ref}
+
+    header = [{"text": name, "col_span": 1, "start_col_offset_idx": i}
+              for i, name in enumerate(["Structure Member", "Data Type", "Length"])]
+
+    for c in range(1, chapters + 1):
+        body.append(text("section_header", f"Chapter {c} Message Formats {c}", 1))
+        for s in range(sections):
+            body.append(text("section_header", f"{c}.{s} Transaction Codes", 2 if s % 2 else 1))
+            for p in range(paragraphs):
+                other = rnd.randint(1, chapters)
+                value = (f"Paragraph {p} of {c}.{s}: the request layout is given in "
+                         f"Chapter {other}; error codes are listed in Chapter {rnd.randint(1, chapters)}.")
+                if p == 2:
+                    value = "Note: " + value
+                elif p == 3:
+                    value = "WARNING: " + value
+                body.append(text("text", value))
+                if p == 4:
+                    body.append(text("text", "Non-Confidential"))
+                    body.append(text("page_footer", "NSE - Confidential"))
+                    body.append(text("text", str(page)))
+                    body.append(text("text", "Capital Market Trading System NNF Protocol v6.1"))
+                    if running_title:
+                        body.append(text("text", running_title))
+                    page += 1
+
+            for _ in range(tables if s == 0 else 0):
+                for part in range(2):
+                    grid = [header] + [
+                        [{"text": f"Field{r}", "col_span": 1, "start_col_offset_idx": 0},
+                         {"text": "CHAR", "col_span": 1, "start_col_offset_idx": 1},
+                         {"text": str(r + 1), "col_span": 1, "start_col_offset_idx": 2}]
+                        for r in range(20)
+                    ]
+                    ref = f"#/tables/{len(table_items)}"
+                    table_items.append({"self_ref": ref, "label": "table", "prov": [{"page_no": page}],
+                                        "data": {"num_rows": len(grid), "grid": grid}})
+                    body.append({"$ref": ref})
+                    if part == 0:
+                        body.append(text("text", "continued"))
+                        page += 1
+
+            group_ref = f"#/groups/{len(groups)}"
+            children = [text("list_item", f"Value {i} is accepted") for i in range(3)]
+            groups.append({"self_ref": group_ref, "label": "list", "children": children})
+            body.append({"$ref": group_ref})
+
+            picture_ref = f"#/pictures/{len(pictures)}"
+            pictures.append({"self_ref": picture_ref, "label": "picture", "prov": [{"page_no": page}]})
+            body.append({"$ref": picture_ref})
+            body.append(text("code", "struct MS_OE_REQUEST { short TransactionCode; };"))
+
+    return {
+        "schema_name": "DoclingDocument",
+        "version": "1.0.0",
+        "name": "synthetic-spec",
+        "furniture": {"self_ref": "#/furniture", "children": []},
+        "body": {"self_ref": "#/body", "children": body, "label": "unspecified"},
+        "groups": groups,
+        "texts": texts,
+        "pictures": pictures,
+        "tables": table_items,
+        "pages": {"1": {"page_no": 1}},
+    }
@@ -0,0 +1,97 @@
+"""Shared test fixtures.
+
+Database tests need a disposable PostgreSQL database named by
+``TEST_DATABASE_URL`` (its tables are created and dropped by the tests);
+they are skipped when it is unset or unreachable.
+"""
+import json
+import os
+from collections.abc import AsyncIterator
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+import app.models  # noqa: F401  (registers the tables)
+from app.core.config import settings
+from app.core.database import Base
+from app.models import Document
+from app.services import document_processor_v2
+from app.services.document_processor_v2 import DocumentProcessor
+from app.services.file_storage import FileStorageService
+
+
+@pytest.fixture
+def inline_ingestion(tmp_path, monkeypatch):
+    """Generate chapters in-process (no worker pools), with uploads under tmp_path."""
+    upload_dir = tmp_path / "uploads"
+    upload_dir.mkdir()
+    monkeypatch.setattr(settings, "ingest_workers", 0)
+    monkeypatch.setattr(settings, "ingest_chapter_workers", 0)
+    monkeypatch.setattr(settings, "upload_dir", upload_dir)
+    return upload_dir
+
+
+@pytest.fixture
+async def db_engine() -> AsyncIterator[AsyncEngine]:
+    """Engine on a freshly created test schema."""
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"Test database unreachable: {e}")
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture
+def db_sessionmaker(db_engine) -> async_sessionmaker:
+    """Session factory bound to the test schema."""
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+def ingest(db_engine, db_sessionmaker, inline_ingestion, tmp_path, monkeypatch):
+    """
+    Ingest a Docling JSON document as a version through the real pipeline.
+
+    Returns an async function (title, version, document dict) -> Document;
+    chapter files go to ``tmp_path / "documents"``.
+    """
+    monkeypatch.setattr(document_processor_v2, "engine", db_engine)
+    storage = FileStorageService(str(tmp_path / "documents"))
+
+    async def run(title: str, version: str, document: dict) -> Document:
+        upload = inline_ingestion / f"{uuid4().hex}.json"
+        upload.write_text(json.dumps(document))
+        async with db_sessionmaker() as db:
+            slug = DocumentProcessor._slugify(title)
+            row = await db.scalar(select(Document).where(Document.slug == slug))
+            if row is None:
+                row = Document(slug=slug, title=title, storage_path=slug)
+                db.add(row)
+                await db.commit()
+            processor = DocumentProcessor(db, storage)
+        await processor.process_document_async(row.id, str(upload), version, "json")
+        async with db_sessionmaker() as db:
+            return await db.get(Document, row.id)
+
+    run.storage = storage
+    return run
@@ -0,0 +1,58 @@
+"""Request file I/O runs on the storage pool, off the event loop."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.async_file_storage import (
+    AsyncFileStorage,
+    get_storage_executor,
+    shutdown_storage_executor,
+)
+from app.services.chapter_cache import ChapterCache
+from app.services.file_storage import FileStorageError, FileStorageService
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "storage_io_threads", 2)
+    shutdown_storage_executor()
+    yield AsyncFileStorage(
+        FileStorageService(str(tmp_path), chapter_cache=ChapterCache(1 << 20))
+    )
+    shutdown_storage_executor()
+
+
+async def test_calls_run_on_the_storage_pool(storage):
+    thread = await storage.run(lambda: threading.current_thread().name)
+
+    assert thread.startswith("storage-io")
+    assert get_storage_executor()._max_workers == 2
+
+
+async def test_event_loop_keeps_running_during_blocking_io(storage):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await storage.run(time.sleep, 0.2)
+    task.cancel()
+
+    assert ticks >= 5
+
+
+async def test_round_trip_and_errors(storage):
+    path = storage.sync.save_chapter("nse-cm", "v1.0", 1, "Introduction", "Body\n")
+
+    await storage.update_chapter(path, "Edited body\n")
+
+    assert "Edited body" in await storage.read_chapter(path)
+    with pytest.raises(FileStorageError):
+        await storage.read_chapter("nse-cm/versions/v1.0/chapters/missing.md")
@@ -0,0 +1,109 @@
+"""Batch uploads: validation, dedup and the single transaction."""
+import hashlib
+import io
+import json
+
+import pytest
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.models import Document, DocumentVersion, IngestionJob
+from app.services.batch_upload import BatchFile, BatchUploadError, BatchUploadService
+from app.services.document_processor_v2 import DocumentProcessor, generator_config_hash
+from app.services.file_storage import FileStorageService
+
+BODY = json.dumps({"name": "spec", "texts": []}).encode("utf-8")
+
+
+def _file(title, version, data=BODY):
+    upload = UploadFile(io.BytesIO(data), filename=f"{title}.json", size=len(data))
+    return BatchFile(file=upload, title=title, version=version, file_type="json")
+
+
+@pytest.mark.parametrize(
+    "files, message",
+    [
+        ([], "no files"),
+        ([_file("NSE CM", "v1"), _file("nse cm", "v1")], "appears twice"),
+    ],
+)
+async def test_invalid_batches(files, message, tmp_path):
+    service = BatchUploadService(None, FileStorageService(str(tmp_path)))
+
+    with pytest.raises(BatchUploadError, match=message):
+        await service.upload(files)
+
+
+async def test_batch_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "batch_upload_max_files", 1)
+    service = BatchUploadService(None, FileStorageService(str(tmp_path)))
+
+    with pytest.raises(BatchUploadError, match="limit is 1"):
+        await service.upload([_file("A", "v1"), _file("B", "v1")])
+
+
+@pytest.fixture
+async def processed_version(db_sessionmaker):
+    """NSE CM v1 processed from BODY, with v0 active."""
+    async with db_sessionmaker() as db:
+        document = Document(
+            slug="nse-cm", title="NSE CM", storage_path="nse-cm", active_version="v0"
+        )
+        db.add(document)
+        await db.flush()
+        db.add(DocumentVersion(
+            document_id=document.id,
+            version="v1",
+            status="active",
+            content_hash=hashlib.sha256(BODY).hexdigest(),
+            generator_hash=generator_config_hash("json"),
+        ))
+        await db.commit()
+        return document.id
+
+
+async def test_batch_queues_jobs_and_activates_duplicates(
+    db_sessionmaker, processed_version, inline_ingestion, tmp_path
+):
+    storage = FileStorageService(str(tmp_path / "documents"))
+    async with db_sessionmaker() as db:
+        response = await BatchUploadService(db, storage).upload(
+            [_file("NSE CM", "v1"), _file("BSE Gateway", "v1")], max_parallel=3
+        )
+
+    deduplicated, queued = response.items
+    assert deduplicated.deduplicated and deduplicated.job_id is None
+    assert queued.job_id is not None and not queued.deduplicated
+    assert storage.get_active_version("nse-cm") == "v1"
+    async with db_sessionmaker() as db:
+        assert (await db.get(Document, processed_version)).active_version == "v1"
+        job = await db.get(IngestionJob, queued.job_id)
+        assert job.batch_id == response.batch_id
+    assert len(list(inline_ingestion.iterdir())) == 1
+
+
+async def test_failed_batch_activates_nothing(
+    db_sessionmaker, processed_version, inline_ingestion, tmp_path, monkeypatch
+):
+    storage = FileStorageService(str(tmp_path / "documents"))
+    find_existing_version = DocumentProcessor.find_existing_version
+
+    async def fail_for_second_document(self, document_id, *args):
+        if document_id != processed_version:
+            raise RuntimeError("database went away")
+        return await find_existing_version(self, document_id, *args)
+
+    monkeypatch.setattr(
+        DocumentProcessor, "find_existing_version", fail_for_second_document
+    )
+
+    async with db_sessionmaker() as db:
+        with pytest.raises(RuntimeError):
+            await BatchUploadService(db, storage).upload(
+                [_file("NSE CM", "v1"), _file("BSE Gateway", "v1")]
+            )
+
+    assert not (tmp_path / "documents" / "nse-cm" / "active_version.txt").exists()
+    async with db_sessionmaker() as db:
+        assert (await db.get(Document, processed_version)).active_version == "v0"
+    assert list(inline_ingestion.iterdir()) == []
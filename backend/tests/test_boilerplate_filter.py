@@ -0,0 +1,100 @@
+"""Boilerplate rules and repeated-line detection."""
+import pytest
+
+from app.services.boilerplate_filter import (
+    DOCLING_FURNITURE,
+    MIN_DETECTION_PAGES,
+    REPEATED_LINE,
+    BoilerplateFilter,
+    BoilerplateFilterError,
+    detect_repeated_lines,
+)
+
+
+def _pages(count, *lines_per_page):
+    """(label, text, page) for the given lines on every page, plus one unique line."""
+    for page in range(1, count + 1):
+        for text in lines_per_page:
+            yield ("text", text, page)
+        yield ("text", f"Paragraph unique to page {page}", page)
+
+
+@pytest.mark.parametrize(
+    "text, rule",
+    [
+        ("Non-Confidential", "non_confidential"),
+        ("CONFIDENTIAL", "confidential"),
+        ("42", "page_number"),
+        ("Page 7", "page_label"),
+        ("Capital Market Trading System NNF Protocol v6.3", "nse_cm_protocol_title"),
+        ("3.2 Order Entry", None),
+        ("Confidential information must not be shared", None),
+    ],
+)
+def test_rules_match_whole_lines(text, rule):
+    assert BoilerplateFilter("nse").match(text) == rule
+
+
+def test_unknown_rule_set():
+    with pytest.raises(BoilerplateFilterError):
+        BoilerplateFilter("lse")
+
+
+def test_filter_drops_and_counts():
+    boilerplate = BoilerplateFilter("nse")
+    elements = [
+        {"label": "page_header", "text": "Anything"},
+        {"label": "text", "text": "  Page 3 "},
+        {"label": "text", "text": "   "},
+        {"label": "text", "text": "Order entry request"},
+        {"label": "table"},
+    ]
+
+    kept = list(boilerplate.filter(elements))
+
+    assert kept == elements[3:]
+    assert boilerplate.stats() == {DOCLING_FURNITURE: 1, "page_label": 1}
+
+
+def test_detects_line_on_most_pages():
+    lines = list(_pages(20, "BSE Exchange Gateway Guide"))
+    lines = [
+        (label, text.upper() if page % 2 else text, page)
+        for label, text, page in lines
+    ]
+
+    repeated = detect_repeated_lines(lines, 0.5)
+
+    # Both case variants are reported, and nothing else
+    assert repeated == {"BSE Exchange Gateway Guide", "BSE EXCHANGE GATEWAY GUIDE"}
+
+    boilerplate = BoilerplateFilter("nse")
+    boilerplate.detect_repeated(lines, 0.5)
+    assert boilerplate.match("BSE Exchange Gateway Guide") == REPEATED_LINE
+    assert boilerplate.match("Paragraph unique to page 3") is None
+
+
+def test_line_below_page_fraction_is_content():
+    lines = list(_pages(20))
+    lines += [("text", "Footnote on some pages", page) for page in range(1, 6)]
+
+    assert detect_repeated_lines(lines, 0.5) == frozenset()
+
+
+def test_short_documents_are_not_analysed():
+    lines = _pages(MIN_DETECTION_PAGES - 1, "Running title")
+
+    assert detect_repeated_lines(lines, 0.5) == frozenset()
+
+
+def test_line_repeated_within_pages_is_content():
+    # A table label repeated on every row is not page furniture
+    lines = _pages(20, *["Reserved"] * 3)
+
+    assert detect_repeated_lines(lines, 0.5) == frozenset()
+
+
+def test_zero_fraction_disables_detection():
+    boilerplate = BoilerplateFilter("nse")
+
+    assert boilerplate.detect_repeated(_pages(20, "Running title"), 0) == frozenset()
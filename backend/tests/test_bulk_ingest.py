@@ -0,0 +1,116 @@
+"""Bulk ingest file discovery, resume state and scheduling."""
+import asyncio
+
+import pytest
+
+from app.services.bulk_ingest import (
+    BulkIngestError,
+    BulkIngestService,
+    IngestFileResult,
+    IngestState,
+    _version_sort_key,
+    discover_files,
+)
+from app.services.file_storage import FileStorageService
+
+
+def _write(path, text="{}"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def test_discover_title_directories(tmp_path):
+    _write(tmp_path / "NSE CM" / "v6.3.json")
+    _write(tmp_path / "NSE CM" / "v6.4.json.gz")
+    _write(tmp_path / "NSE CM" / "notes.txt")
+    _write(tmp_path / ".trash" / "v1.json")
+
+    files = discover_files(tmp_path)
+
+    assert [(f.title, f.version) for f in files] == [
+        ("NSE CM", "v6.3"),
+        ("NSE CM", "v6.4"),
+    ]
+
+
+def test_discover_with_fixed_version(tmp_path):
+    _write(tmp_path / "nse" / "NSE CM.json")
+    _write(tmp_path / "BSE Gateway.json")
+
+    files = discover_files(tmp_path, version="2026.1")
+
+    assert sorted((f.title, f.version) for f in files) == [
+        ("BSE Gateway", "2026.1"),
+        ("NSE CM", "2026.1"),
+    ]
+
+
+def test_discover_rejects_untitled_files(tmp_path):
+    _write(tmp_path / "v1.json")
+
+    with pytest.raises(BulkIngestError):
+        discover_files(tmp_path)
+
+
+def test_versions_sort_naturally():
+    versions = ["v2.10", "v2.9", "v10.0", "v2.9a"]
+    ordered = sorted(versions, key=_version_sort_key)
+
+    assert ordered == ["v2.9", "v2.9a", "v2.10", "v10.0"]
+
+
+async def test_state_skips_unchanged_files(tmp_path):
+    source = _write(tmp_path / "docs" / "NSE CM" / "v1.json")
+    (ingest_file,) = discover_files(tmp_path / "docs")
+    state_path = tmp_path / "state.json"
+    result = IngestFileResult(
+        ingest_file.path, ingest_file.title, ingest_file.version, "completed", 2
+    )
+
+    await IngestState(state_path).mark_done(ingest_file, "0" * 64, "doc-id", result)
+    assert IngestState(state_path).is_done(ingest_file)
+
+    _write(source, '{"changed": true}')
+    (changed,) = discover_files(tmp_path / "docs")
+    assert not IngestState(state_path).is_done(changed)
+
+
+def test_unreadable_state_file(tmp_path):
+    state_path = _write(tmp_path / "state.json", "[]")
+
+    with pytest.raises(BulkIngestError):
+        IngestState(state_path)
+
+
+async def test_versions_of_a_document_run_in_order(tmp_path, monkeypatch):
+    for version in ("v2.10", "v2.9", "v1.0"):
+        _write(tmp_path / "docs" / "NSE CM" / f"{version}.json")
+    _write(tmp_path / "docs" / "BSE Gateway" / "v1.json")
+    service = BulkIngestService(
+        IngestState(tmp_path / "state.json"),
+        FileStorageService(str(tmp_path / "storage")),
+    )
+    in_flight = {}
+    order = []
+
+    async def get_or_create_documents(files):
+        return {"nse-cm": "NSE CM", "bse-gateway": "BSE Gateway"}
+
+    async def ingest_one(ingest_file, document):
+        assert in_flight.get(document, 0) == 0, "versions of a document overlapped"
+        in_flight[document] = 1
+        await asyncio.sleep(0.01)
+        in_flight[document] = 0
+        order.append((ingest_file.title, ingest_file.version))
+        return IngestFileResult(
+            ingest_file.path, ingest_file.title, ingest_file.version, "completed", 2
+        )
+
+    monkeypatch.setattr(service, "_get_or_create_documents", get_or_create_documents)
+    monkeypatch.setattr(service, "ingest_one", ingest_one)
+
+    report = await service.ingest(discover_files(tmp_path / "docs"), concurrency=4)
+
+    assert report.count("completed") == 4
+    assert [v for title, v in order if title == "NSE CM"] == ["v1.0", "v2.9", "v2.10"]
@@ -0,0 +1,39 @@
+"""Bulk regeneration reports per-version failures instead of aborting."""
+from uuid import uuid4
+
+from sqlalchemy.exc import OperationalError
+
+from app.services.bulk_regeneration import BulkRegenerationService
+from app.services.document_processor_v2 import (
+    DocumentProcessingError,
+    DocumentProcessor,
+)
+from app.services.file_storage import FileStorageService
+
+
+async def test_failures_are_reported_per_version(tmp_path, monkeypatch):
+    service = BulkRegenerationService(FileStorageService(str(tmp_path)))
+    versions = [(uuid4(), "v1"), (uuid4(), "v2"), (uuid4(), "v3")]
+    errors = {
+        "v1": DocumentProcessingError("No element cache"),
+        "v2": OperationalError("UPDATE chapters", {}, Exception("connection reset")),
+    }
+
+    async def cached_versions(document_id):
+        return versions, 1
+
+    async def regenerate_version(processor, document_id, version, progress=None):
+        if version in errors:
+            raise errors[version]
+        return 12
+
+    monkeypatch.setattr(service, "_cached_versions", cached_versions)
+    monkeypatch.setattr(DocumentProcessor, "regenerate_version", regenerate_version)
+
+    report = await service.regenerate_all(concurrency=2)
+
+    assert [r.status for r in report.results] == ["failed", "failed", "completed"]
+    assert "connection reset" in report.results[1].error_message
+    assert (report.total, report.completed, report.failed) == (3, 1, 2)
+    assert report.skipped == 1
+    assert report.chapters == 12
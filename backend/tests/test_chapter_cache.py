@@ -0,0 +1,85 @@
+"""Chapter reads are cached but never serve stale content."""
+import os
+
+import pytest
+
+from app.services.chapter_cache import ChapterCache
+from app.services.file_storage import FileStorageService
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileStorageService(
+        str(tmp_path), chapter_split_threshold=0, chapter_cache=ChapterCache(1 << 20)
+    )
+
+
+@pytest.fixture
+def chapter(storage):
+    return storage.save_chapter("nse-cm", "v1.0", 1, "Introduction", "Original body\n")
+
+
+def test_repeated_reads_hit_the_cache(storage, chapter):
+    cache = storage._chapter_cache
+
+    assert "Original body" in storage.read_chapter(chapter)
+    assert "Original body" in storage.read_chapter(chapter)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_update_invalidates(storage, chapter):
+    storage.read_chapter(chapter)
+
+    storage.update_chapter(chapter, "Edited body\n")
+
+    assert "Edited body" in storage.read_chapter(chapter)
+
+
+def test_out_of_band_edit_invalidates(storage, chapter, tmp_path):
+    storage.read_chapter(chapter)
+    path = tmp_path / chapter
+    path.write_text(path.read_text().replace("Original body", "Patched body, longer"))
+
+    assert "Patched body, longer" in storage.read_chapter(chapter)
+
+
+def test_same_size_replace_with_restored_mtime_invalidates(storage, chapter, tmp_path):
+    # A replaced file is a new inode even when size and mtime are unchanged
+    storage.read_chapter(chapter)
+    path = tmp_path / chapter
+    stat = path.stat()
+    replacement = path.with_suffix(".tmp")
+    replacement.write_text(path.read_text().replace("Original", "Replaced"))
+    os.replace(replacement, path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert "Replaced body" in storage.read_chapter(chapter)
+
+
+def test_lru_stays_within_budget():
+    cache = ChapterCache(max_bytes=10)
+    cache.put("a", (1, 4, 1), "aaaa", 4)
+    cache.put("b", (1, 4, 2), "bbbb", 4)
+    assert cache.get("a", (1, 4, 1)) == "aaaa"  # "b" is now least recently used
+
+    cache.put("c", (1, 4, 3), "cccc", 4)
+
+    assert cache.get("b", (1, 4, 2)) is None
+    assert cache.get("a", (1, 4, 1)) == "aaaa"
+    assert cache.stats()["bytes"] == 8
+    assert cache.evictions == 1
+
+
+def test_content_larger_than_budget_is_not_cached():
+    cache = ChapterCache(max_bytes=3)
+    cache.put("a", (1, 4, 1), "aaaa", 4)
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_stale_identity_drops_the_entry():
+    cache = ChapterCache(max_bytes=10)
+    cache.put("a", (1, 4, 1), "aaaa", 4)
+
+    assert cache.get("a", (2, 4, 1)) is None
+    assert cache.stats()["entries"] == 0
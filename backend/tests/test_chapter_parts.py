@@ -0,0 +1,80 @@
+"""Oversized chapters are stored as parts with a manifest."""
+import pytest
+
+from app.services.chapter_parts import INTRO_ANCHOR, parts_dir, split_chapter
+from app.services.file_storage import ChapterPartNotFoundError, FileStorageService
+
+CHAPTER = (
+    "Intro paragraph.\n\n"
+    "## Order Entry\n\nRequest fields.\n\n"
+    "```\n## not a heading\n```\n\n"
+    "## Order Entry\n\nResponse fields.\n\n"
+    "### Error codes\n\nTable.\n"
+)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileStorageService(str(tmp_path), chapter_split_threshold=64)
+
+
+def test_split_at_level_two_headings():
+    parts = split_chapter(CHAPTER)
+
+    assert [p.anchor for p in parts] == [INTRO_ANCHOR, "order-entry", "order-entry-2"]
+    assert "## not a heading" in parts[1].content
+    assert "### Error codes" in parts[2].content
+    assert "".join(p.content for p in parts) == CHAPTER
+
+
+def test_large_chapter_written_with_manifest(storage):
+    chapter = storage.save_chapter("nse-cm", "v1.0", 5, "Messages", CHAPTER)
+
+    manifest = storage.read_chapter_manifest(chapter)
+
+    assert [p["anchor"] for p in manifest["parts"]] == [
+        INTRO_ANCHOR, "order-entry", "order-entry-2"
+    ]
+    entry, content = storage.read_chapter_part(chapter, "order-entry-2")
+    assert entry["index"] == 2
+    assert content.startswith("## Order Entry\n\nResponse fields.")
+
+
+def test_small_chapter_is_split_in_memory(storage, tmp_path):
+    chapter = storage.save_chapter("nse-cm", "v1.0", 1, "Intro", "Hi.\n\n## A\n\nB\n")
+
+    assert storage.read_chapter_manifest(chapter) is None
+    assert not parts_dir(tmp_path / chapter).exists()
+    assert storage.read_chapter_part(chapter, "a")[1] == "## A\n\nB\n"
+    with pytest.raises(ChapterPartNotFoundError):
+        storage.read_chapter_part(chapter, "missing")
+
+
+def test_update_rewrites_parts(storage):
+    chapter = storage.save_chapter("nse-cm", "v1.0", 5, "Messages", CHAPTER)
+
+    storage.update_chapter(chapter, CHAPTER.replace("Response fields", "Reply fields"))
+
+    _, content = storage.read_chapter_part(chapter, "order-entry-2")
+    assert "Reply fields" in content
+
+
+def test_out_of_band_edit_is_served_whole_without_writing(storage, tmp_path):
+    chapter = storage.save_chapter("nse-cm", "v1.0", 5, "Messages", CHAPTER)
+    path = tmp_path / chapter
+    path.write_text(path.read_text() + "\n## Appendix\n\nAdded by hand.\n")
+    part_files = sorted(parts_dir(path).iterdir())
+
+    assert storage.read_chapter_manifest(chapter) is None
+    assert "Added by hand." in storage.read_chapter_part(chapter, "appendix")[1]
+    assert sorted(parts_dir(path).iterdir()) == part_files
+
+
+def test_linked_and_copied_chapters_get_parts(storage):
+    chapter = storage.save_chapter("nse-cm", "v1.0", 5, "Messages", CHAPTER)
+
+    linked = storage.link_chapter(chapter, "nse-cm", "v1.1", 5, "Messages")
+    storage.copy_version_directory("nse-cm", "v1.0", "v2.0", clone=False)
+
+    assert storage.read_chapter_manifest(linked) is not None
+    assert storage.read_chapter_manifest(chapter.replace("v1.0", "v2.0")) is not None
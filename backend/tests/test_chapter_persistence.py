@@ -0,0 +1,41 @@
+"""Chapter rows are written with bulk inserts (needs TEST_DATABASE_URL)."""
+from sqlalchemy import func, select
+
+from app.models import Chapter, DocumentVersion
+from app.services import document_processor_v2
+from benchmarks.synthetic import make_docling_document
+
+
+async def _chapters(db_sessionmaker, document):
+    async with db_sessionmaker() as db:
+        result = await db.execute(
+            select(Chapter)
+            .join(DocumentVersion, DocumentVersion.id == Chapter.version_id)
+            .where(DocumentVersion.document_id == document.id)
+            .order_by(Chapter.chapter_number)
+        )
+        return list(result.scalars())
+
+
+async def test_rows_inserted_across_statements(ingest, db_sessionmaker, monkeypatch):
+    monkeypatch.setattr(document_processor_v2, "CHAPTER_INSERT_BATCH_SIZE", 2)
+
+    document = await ingest("NSE CM", "v1", make_docling_document(chapters=5))
+
+    chapters = await _chapters(db_sessionmaker, document)
+    assert [ch.chapter_number for ch in chapters] == [1, 2, 3, 4, 5]
+    assert all(ch.search_vector for ch in chapters)
+    assert all(ch.content_hash and ch.word_count for ch in chapters)
+    for chapter in chapters:
+        assert ingest.storage.read_chapter(chapter.file_path)
+    assert document.active_version == "v1"
+
+
+async def test_reingest_replaces_rows(ingest, db_sessionmaker):
+    await ingest("NSE CM", "v1", make_docling_document(chapters=5))
+    document = await ingest("NSE CM", "v1", make_docling_document(chapters=3))
+
+    chapters = await _chapters(db_sessionmaker, document)
+    assert [ch.chapter_number for ch in chapters] == [1, 2, 3]
+    async with db_sessionmaker() as db:
+        assert await db.scalar(select(func.count(Chapter.id))) == 3
@@ -0,0 +1,72 @@
+"""Chapter markdown is generated through the lazy element pipeline."""
+import copy
+
+from app.services.rich_markdown_generator import RichMarkdownGenerator
+from benchmarks.bench_chapter_pipeline import LegacyGenerator, make_chapter
+
+
+def _text(text, page=1, label="text"):
+    return {"label": label, "text": text, "prov": [{"page_no": page}]}
+
+
+def _table(page, rows, header=("A", "B")):
+    grid = [[{"text": name, "col_span": 1, "start_col_offset_idx": i}
+             for i, name in enumerate(header)]]
+    grid += [[{"text": f"{row}{col}", "col_span": 1, "start_col_offset_idx": i}
+              for i, col in enumerate("xy")] for row in rows]
+    return {"label": "table", "prov": [{"page_no": page}],
+            "data": {"num_rows": len(grid), "grid": grid}}
+
+
+def _generate(*elements):
+    chapter = {
+        "chapter_number": 1,
+        "title": "Chapter 1 Formats",
+        "elements": [_text("Chapter 1 Formats", label="section_header"), *elements],
+    }
+    return RichMarkdownGenerator({})._generate_chapter_markdown(chapter, 0)
+
+
+def test_continued_table_is_merged():
+    chapter = _generate(
+        _table(1, "12"),
+        _text("Non-Confidential", label="page_footer"),
+        _text("continued"),
+        _table(2, "34"),
+    )
+
+    assert chapter.markdown_content.endswith(
+        "| A | B |\n| --- | --- |\n| 1x | 1y |\n| 2x | 2y |\n| 3x | 3y |\n| 4x | 4y |"
+    )
+    assert "continued" not in chapter.markdown_content
+    assert chapter.page_range == (1, 2)
+
+
+def test_text_after_unmerged_table_is_kept():
+    chapter = _generate(
+        _table(1, "1"), _text("After table."), _table(1, "2", header=("C", "D"))
+    )
+
+    positions = [
+        chapter.markdown_content.index(block)
+        for block in ("| 1x |", "After table.", "| C |")
+    ]
+    assert positions == sorted(positions)
+
+
+def test_callout_does_not_absorb_next_block():
+    chapter = _generate(_text("Note: read this."), _text("Next paragraph."))
+
+    assert "> [!note]\n> read this.\n\nNext paragraph." in chapter.markdown_content
+
+
+def test_matches_previous_flow():
+    chapter = make_chapter(tables=6, rows=5)
+
+    current = RichMarkdownGenerator({})._generate_chapter_markdown(
+        copy.deepcopy(chapter), 0
+    )
+
+    assert current.markdown_content == LegacyGenerator({})._generate_chapter_markdown(
+        copy.deepcopy(chapter), 0
+    )
@@ -0,0 +1,95 @@
+"""Pre-compressed chapter variants."""
+import gzip
+
+import pytest
+
+from app.services.chapter_cache import ChapterCache
+from app.services.chapter_variants import accepted_encodings, read_variant, variant_path
+from app.services.file_storage import FileStorageService
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileStorageService(
+        str(tmp_path),
+        chapter_split_threshold=0,
+        chapter_cache=ChapterCache(0),
+        precompression="gzip",
+    )
+
+
+@pytest.fixture
+def chapter(storage):
+    content = "Order entry\n" * 50
+    return storage.save_chapter("nse-cm", "v1.0", 1, "Introduction", content)
+
+
+def test_variant_written_with_chapter(storage, chapter, tmp_path):
+    assert variant_path(tmp_path / chapter, "gzip").exists()
+    assert read_variant(tmp_path / chapter, "gzip") is not None
+
+
+def test_variant_served_to_accepting_clients(storage, chapter):
+    body, encoding = storage.read_chapter_encoded(chapter, "br, gzip;q=0.8")
+
+    assert encoding == "gzip"
+    assert gzip.decompress(body).decode("utf-8") == storage.read_chapter(chapter)
+
+
+def test_plain_body_for_other_clients(storage, chapter):
+    body, encoding = storage.read_chapter_encoded(chapter, "br, gzip;q=0")
+
+    assert encoding is None
+    assert body.decode("utf-8") == storage.read_chapter(chapter)
+
+
+def test_update_replaces_variant(storage, chapter):
+    storage.update_chapter(chapter, "Edited body\n")
+
+    body, encoding = storage.read_chapter_encoded(chapter, "gzip")
+
+    assert encoding == "gzip"
+    assert "Edited body" in gzip.decompress(body).decode("utf-8")
+
+
+def test_stale_variant_is_not_served_or_rewritten(storage, chapter, tmp_path):
+    path = tmp_path / chapter
+    stale = variant_path(path, "gzip").read_bytes()
+    path.write_text(path.read_text().replace("Order entry", "Trade confirmation", 1))
+
+    body, encoding = storage.read_chapter_encoded(chapter, "gzip")
+
+    assert encoding is None
+    assert body.decode("utf-8").startswith("Trade confirmation")
+    assert variant_path(path, "gzip").read_bytes() == stale
+
+
+def test_linked_chapter_gets_a_variant(storage, chapter, tmp_path):
+    linked = storage.link_chapter(chapter, "nse-cm", "v1.1", 1, "Introduction")
+
+    body, encoding = storage.read_chapter_encoded(linked, "gzip")
+
+    assert encoding == "gzip"
+    assert gzip.decompress(body).decode("utf-8") == storage.read_chapter(linked)
+
+
+def test_copied_version_gets_current_variants(storage, chapter, tmp_path):
+    storage.copy_version_directory("nse-cm", "v1.0", "v1.1", clone=False)
+    copied = chapter.replace("v1.0", "v1.1")
+
+    assert read_variant(tmp_path / copied, "gzip") is not None
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, []),
+        ("gzip, deflate", ["gzip", "deflate"]),
+        ("GZIP;q=0.5, br;q=0", ["gzip"]),
+        ("*", ["*", "gzip", "zstd"]),
+        ("*, zstd;q=0", ["*", "gzip"]),
+        ("gzip;q=oops", []),
+    ],
+)
+def test_accepted_encodings(header, expected):
+    assert accepted_encodings(header) == expected
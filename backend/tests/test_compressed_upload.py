@@ -0,0 +1,52 @@
+"""Compressed uploads stay compressed on disk and parse like plain JSON uploads."""
+import gzip
+import io
+import json
+
+import pytest
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.services.document_processor_v2 import (
+    DocumentProcessingError,
+    DocumentProcessor,
+)
+from app.services.file_storage import FileStorageService
+from benchmarks.synthetic import make_docling_document
+
+
+@pytest.fixture
+def processor(inline_ingestion, tmp_path):
+    return DocumentProcessor(None, FileStorageService(str(tmp_path / "documents")))
+
+
+@pytest.fixture
+def document_bytes():
+    document = make_docling_document(chapters=3, sections=2, paragraphs=3)
+    return json.dumps(document).encode("utf-8")
+
+
+async def _upload(processor, data, filename):
+    upload = UploadFile(io.BytesIO(data), filename=filename, size=len(data))
+    stored = await processor._save_temp_file(upload, "nse-cm", "v1.0", "json")
+    return stored, await processor._parse_file(stored.path, "json")
+
+
+async def test_gzip_upload_matches_plain(processor, document_bytes):
+    plain_upload, plain = await _upload(processor, document_bytes, "spec.json")
+    gzip_upload, inflated = await _upload(
+        processor, gzip.compress(document_bytes), "spec.JSON.GZ"
+    )
+
+    assert plain_upload.path.name.endswith(".json")
+    assert gzip_upload.path.name.endswith(".json.gz")
+    assert len(plain) == 3
+    assert inflated == plain
+
+
+async def test_inflation_is_capped(processor, document_bytes, monkeypatch):
+    limit = len(document_bytes) // 2
+    monkeypatch.setattr(settings, "max_decompressed_upload_size", limit)
+
+    with pytest.raises(DocumentProcessingError, match="byte limit"):
+        await _upload(processor, gzip.compress(document_bytes), "spec.json.gz")
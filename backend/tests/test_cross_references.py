@@ -0,0 +1,52 @@
+"""Chapter cross-references are linked in a single pass."""
+from app.services.rich_markdown_generator import ChapterMarkdown, RichMarkdownGenerator
+from benchmarks.bench_cross_references import legacy_cross_references, make_chapters
+
+
+def _chapter(number: int, content: str) -> ChapterMarkdown:
+    return ChapterMarkdown(
+        chapter_number=number,
+        title=f"Chapter {number}",
+        markdown_content=content,
+        searchable_text="",
+        page_range=(number, number),
+        metadata={},
+        anchor_id=f"chapter-{number}",
+    )
+
+
+def _link(*chapters: ChapterMarkdown) -> list:
+    linked = RichMarkdownGenerator({})._add_cross_references(list(chapters))
+    return [ch.markdown_content for ch in linked]
+
+
+def test_mentions_are_linked():
+    content = _link(
+        _chapter(1, "See Chapter 2 and Chapter 12."),
+        _chapter(2, "Back to Chapter 1."),
+        _chapter(12, "x"),
+    )
+
+    assert content[0] == "See [Chapter 2](#chapter-2) and [Chapter 12](#chapter-12)."
+    assert content[1] == "Back to [Chapter 1](#chapter-1)."
+
+
+def test_self_unknown_and_linked_mentions_are_kept():
+    content = _link(
+        _chapter(1, "Chapter 1, Chapter 9, Chapter 05 and [Chapter 2](#chapter-2)."),
+        _chapter(2, "x"),
+    )
+
+    assert content[0] == "Chapter 1, Chapter 9, Chapter 05 and [Chapter 2](#chapter-2)."
+
+
+def test_frontmatter_is_not_a_link_target():
+    content = _link(_chapter(0, "Preface"), _chapter(1, "Chapter 0 comes first."))
+
+    assert content[1] == "Chapter 0 comes first."
+
+
+def test_matches_previous_implementation():
+    chapters = make_chapters(15, 40)
+
+    assert _link(*chapters) == legacy_cross_references(chapters)
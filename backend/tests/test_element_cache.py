@@ -0,0 +1,67 @@
+"""Regeneration from the element cache matches generation from the JSON."""
+import json
+
+import msgpack
+import pytest
+
+from app.services.element_cache import ElementCacheError, read_element_cache
+from app.services.ingestion_executor import (
+    generate_chapters_from_file,
+    regenerate_chapters_from_cache,
+)
+from benchmarks.synthetic import make_docling_document
+
+
+@pytest.fixture
+def docling_file(tmp_path):
+    document = make_docling_document(
+        chapters=4, sections=2, paragraphs=3, running_title="BSE Gateway Guide"
+    )
+    path = tmp_path / "document.json"
+    path.write_text(json.dumps(document))
+    return path
+
+
+def _chapters(result):
+    return [
+        (c.chapter_number, c.title, c.markdown_content, c.page_range)
+        for c in result.chapters
+    ]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_regeneration_matches_generation(docling_file, tmp_path, streaming):
+    cache_path = tmp_path / "elements.msgpack"
+
+    generated = generate_chapters_from_file(
+        str(docling_file), streaming, cache_path=str(cache_path), repeat_fraction=0.5
+    )
+    regenerated = regenerate_chapters_from_cache(str(cache_path), repeat_fraction=0.5)
+
+    assert len(generated.chapters) == 4
+    assert _chapters(regenerated) == _chapters(generated)
+    assert regenerated.boilerplate_hits == generated.boilerplate_hits
+
+
+def test_cache_keeps_only_rendered_fields(docling_file, tmp_path):
+    cache_path = tmp_path / "elements.msgpack"
+    generate_chapters_from_file(str(docling_file), False, cache_path=str(cache_path))
+
+    name, elements, refs = read_element_cache(cache_path)
+
+    assert name == "synthetic-spec"
+    assert all("orig" not in element for element in elements)
+    assert refs and all(ref.startswith("#/texts/") for ref in refs)
+
+
+def test_missing_cache(tmp_path):
+    with pytest.raises(ElementCacheError, match="not found"):
+        regenerate_chapters_from_cache(str(tmp_path / "missing.msgpack"))
+
+
+def test_other_format_is_rejected(tmp_path):
+    cache_path = tmp_path / "elements.msgpack"
+    cache_path.write_bytes(msgpack.packb({"format": 0, "name": None}))
+
+    with pytest.raises(ElementCacheError, match="Unsupported"):
+        read_element_cache(cache_path)
@@ -0,0 +1,60 @@
+"""Re-ingestion reuses unchanged chapters (needs TEST_DATABASE_URL)."""
+import os
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models import Chapter, DocumentVersion
+from benchmarks.synthetic import make_docling_document
+
+
+def _revise_chapter(document: dict, chapter: int) -> dict:
+    """Change one paragraph of a chapter."""
+    for item in document["texts"]:
+        if item["text"].startswith(f"Paragraph 0 of {chapter}.0:"):
+            item["text"] = item["orig"] = item["text"] + " Revised."
+            return document
+    raise AssertionError(f"No paragraph in chapter {chapter}")
+
+
+async def _chapters(db_sessionmaker, document, version):
+    async with db_sessionmaker() as db:
+        result = await db.execute(
+            select(Chapter)
+            .join(DocumentVersion, DocumentVersion.id == Chapter.version_id)
+            .where(
+                DocumentVersion.document_id == document.id,
+                DocumentVersion.version == version,
+            )
+            .order_by(Chapter.chapter_number)
+        )
+        return list(result.scalars())
+
+
+def _stat(storage, chapter):
+    return os.stat(storage._base_path / chapter.file_path)
+
+
+@pytest.mark.parametrize("incremental", [True, False])
+async def test_unchanged_chapters_are_linked(
+    ingest, db_sessionmaker, monkeypatch, incremental
+):
+    monkeypatch.setattr(settings, "incremental_ingest", incremental)
+    await ingest("NSE CM", "v1", make_docling_document(chapters=3))
+    document = await ingest(
+        "NSE CM", "v2", _revise_chapter(make_docling_document(chapters=3), 3)
+    )
+
+    old = await _chapters(db_sessionmaker, document, "v1")
+    new = await _chapters(db_sessionmaker, document, "v2")
+    shared = [
+        _stat(ingest.storage, a).st_ino == _stat(ingest.storage, b).st_ino
+        for a, b in zip(old, new)
+    ]
+    assert shared == [incremental, incremental, False]
+    assert [ch.content_hash for ch in new[:2]] == [ch.content_hash for ch in old[:2]]
+    assert new[2].content_hash != old[2].content_hash
+    assert all(ch.search_vector for ch in new)
+    assert "Revised." in ingest.storage.read_chapter(new[2].file_path)
+    assert "Revised." not in ingest.storage.read_chapter(old[2].file_path)
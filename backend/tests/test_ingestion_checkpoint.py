@@ -0,0 +1,84 @@
+"""Generated-chapter checkpoints let a retried job skip parse and generate."""
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services import document_processor_v2
+from app.services.document_processor_v2 import DocumentProcessor
+from app.services.file_storage import FileStorageService
+from app.services.ingestion_checkpoint import (
+    IngestionCheckpoint,
+    element_cache_checkpoint_path,
+    generated_checkpoint_path,
+    load_generated_chapters,
+    remove_upload_artifacts,
+)
+from app.services.ingestion_progress import IngestionProgress
+from benchmarks.synthetic import make_docling_document
+
+
+class PersistentCheckpoint(IngestionCheckpoint):
+    enabled = True
+
+
+@pytest.fixture
+def upload(inline_ingestion):
+    path = inline_ingestion / "nse-cm-v1.0-0123456789ab.json"
+    path.write_text(json.dumps(make_docling_document(chapters=3, sections=2)))
+    return path
+
+
+@pytest.fixture
+def processor(tmp_path):
+    return DocumentProcessor(None, FileStorageService(str(tmp_path / "documents")))
+
+
+async def _parse(processor, upload):
+    return await processor._parse_file_resumable(
+        upload,
+        "json",
+        IngestionProgress(),
+        element_cache_checkpoint_path(upload),
+        PersistentCheckpoint(),
+    )
+
+
+async def test_retry_reuses_generated_chapters(processor, upload, monkeypatch):
+    chapters = await _parse(processor, upload)
+    assert generated_checkpoint_path(upload).exists()
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("generation ran again")
+
+    monkeypatch.setattr(document_processor_v2, "run_generation", fail)
+
+    assert await _parse(processor, upload) == chapters
+
+
+async def test_checkpoint_of_another_generator_is_ignored(
+    processor, upload, monkeypatch
+):
+    await _parse(processor, upload)
+    monkeypatch.setattr(settings, "boilerplate_rule_set", "bse")
+
+    chapters = await _parse(processor, upload)
+
+    generator_hash = document_processor_v2.generator_config_hash("json")
+    saved = load_generated_chapters(generated_checkpoint_path(upload), generator_hash)
+    assert saved == (chapters, processor._boilerplate_hits)
+
+
+def test_unreadable_checkpoint_is_ignored(tmp_path):
+    path = tmp_path / "upload.json.chapters.msgpack"
+    path.write_bytes(b"\xc1 not msgpack")
+
+    assert load_generated_chapters(path, "hash") is None
+
+
+async def test_remove_upload_artifacts(processor, upload):
+    await _parse(processor, upload)
+
+    assert remove_upload_artifacts(upload) == 3
+    assert list(upload.parent.iterdir()) == []
+    assert remove_upload_artifacts(upload) == 0
@@ -0,0 +1,46 @@
+"""Generation runs off the event loop, in the ingestion process pool."""
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services import ingestion_executor
+from app.services.ingestion_executor import (
+    IngestionExecutorError,
+    run_in_ingestion_executor,
+    shutdown_ingestion_executor,
+)
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+def _die() -> None:
+    os._exit(1)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_workers", 1)
+    yield
+    shutdown_ingestion_executor()
+
+
+async def test_runs_in_worker_process(pool):
+    assert await run_in_ingestion_executor(_pid) != os.getpid()
+
+
+async def test_runs_in_thread_without_workers(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_workers", 0)
+
+    assert await run_in_ingestion_executor(_pid) == os.getpid()
+    assert ingestion_executor._executor is None
+
+
+async def test_dead_worker_replaces_pool(pool):
+    with pytest.raises(IngestionExecutorError):
+        await run_in_ingestion_executor(_die)
+
+    assert ingestion_executor._executor is None
+    assert await run_in_ingestion_executor(_pid) != os.getpid()
@@ -0,0 +1,52 @@
+"""Every ingestion stage is announced, including generation inside the worker."""
+import json
+import time
+
+from app.services.document_processor_v2 import DocumentProcessor
+from app.services.file_storage import FileStorageService
+from app.services.ingestion_executor import _mark_parsed, run_generation
+from app.services.ingestion_progress import TimingProgress
+from benchmarks.synthetic import make_docling_document
+
+
+class RecordingProgress(TimingProgress):
+    def __init__(self):
+        super().__init__()
+        self.stages = []
+
+    async def stage(self, name):
+        await super().stage(name)
+        self.stages.append(name)
+
+
+def _slow_generation(seconds, parsed_marker=None):
+    _mark_parsed(parsed_marker)
+    time.sleep(seconds)
+    return "result"
+
+
+async def test_generate_announced_while_worker_runs(inline_ingestion):
+    announced_at = []
+
+    async def on_parsed():
+        announced_at.append(time.perf_counter())
+
+    started = time.perf_counter()
+    result = await run_generation(_slow_generation, 1.5, on_parsed=on_parsed)
+
+    assert result == "result"
+    assert len(announced_at) == 1
+    assert announced_at[0] - started < 1.5
+    assert list(inline_ingestion.iterdir()) == []
+
+
+async def test_parse_file_reports_both_stages(inline_ingestion, tmp_path):
+    path = inline_ingestion / "spec.json"
+    path.write_text(json.dumps(make_docling_document(chapters=2, sections=2)))
+    processor = DocumentProcessor(None, FileStorageService(str(tmp_path / "documents")))
+    progress = RecordingProgress()
+
+    await processor._parse_file(path, "json", progress)
+
+    assert progress.stages == ["parse", "generate"]
+    assert set(progress.timings) == {"parse", "generate"}
@@ -0,0 +1,133 @@
+"""Ingestion job claims and lease expiry (needs TEST_DATABASE_URL)."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, update
+
+from app.core.config import settings
+from app.models import Document, IngestionBatch, IngestionJob
+from app.services import ingestion_queue
+from app.services.ingestion_checkpoint import generated_checkpoint_path
+from app.services.ingestion_queue import IngestionWorker
+
+
+@pytest.fixture
+async def sessions(db_sessionmaker, monkeypatch):
+    monkeypatch.setattr(ingestion_queue, "AsyncSessionLocal", db_sessionmaker)
+    return db_sessionmaker
+
+
+async def _add_jobs(sessions, count, max_parallel=None):
+    async with sessions() as db:
+        document = Document(slug="nse-cm", title="NSE CM", storage_path="nse-cm")
+        db.add(document)
+        batch = None
+        if max_parallel is not None:
+            batch = IngestionBatch(max_parallel=max_parallel)
+            db.add(batch)
+        await db.flush()
+        jobs = [
+            IngestionJob(
+                document_id=document.id,
+                batch_id=batch.id if batch else None,
+                version=f"v{i}",
+                file_type="json",
+                temp_path=f"/tmp/upload-{i}.json",
+                created_at=datetime.utcnow() + timedelta(seconds=i),
+            )
+            for i in range(count)
+        ]
+        db.add_all(jobs)
+        await db.commit()
+        return [job.id for job in jobs]
+
+
+async def _job(sessions, job_id):
+    async with sessions() as db:
+        return await db.get(IngestionJob, job_id)
+
+
+async def test_claims_oldest_job_once(sessions):
+    first, second = await _add_jobs(sessions, 2)
+    worker, other = IngestionWorker(), IngestionWorker()
+
+    assert await worker._claim_next() == first
+    assert await other._claim_next() == second
+    assert await other._claim_next() is None
+
+    job = await _job(sessions, first)
+    assert job.status == "running"
+    assert job.claimed_by == worker.worker_id
+    assert job.heartbeat_at is not None
+    assert job.attempts == 1
+
+
+async def test_batch_limits_running_jobs(sessions):
+    first, _, _ = await _add_jobs(sessions, 3, max_parallel=1)
+    worker = IngestionWorker()
+
+    assert await worker._claim_next() == first
+    assert await worker._claim_next() is None
+
+
+async def test_expired_lease_is_requeued(sessions):
+    stale, live = await _add_jobs(sessions, 2)
+    crashed, alive = IngestionWorker(), IngestionWorker()
+    await crashed._claim_next()
+    await alive._claim_next()
+    async with sessions() as db:
+        await db.execute(
+            update(IngestionJob)
+            .where(IngestionJob.id == stale)
+            .values(heartbeat_at=func.now() - timedelta(
+                seconds=3 * settings.ingest_job_lease_seconds
+            ))
+        )
+        await db.commit()
+
+    await alive._requeue_expired()
+
+    job = await _job(sessions, stale)
+    assert (job.status, job.claimed_by, job.heartbeat_at) == ("queued", None, None)
+    assert (await _job(sessions, live)).status == "running"
+
+    # The job is claimed again, and the old worker can no longer finish it
+    assert await alive._claim_next() == stale
+    await crashed._finish(stale, "completed")
+    job = await _job(sessions, stale)
+    assert (job.status, job.claimed_by, job.attempts) == ("running", alive.worker_id, 2)
+
+
+async def test_stop_releases_claimed_jobs(sessions):
+    (job_id,) = await _add_jobs(sessions, 1)
+    worker = IngestionWorker()
+    await worker._claim_next()
+
+    await worker._release_claimed()
+
+    assert (await _job(sessions, job_id)).status == "queued"
+
+
+async def test_sweep_deletes_files_of_old_failed_jobs(sessions, tmp_path):
+    old, recent = await _add_jobs(sessions, 2)
+    uploads = {}
+    async with sessions() as db:
+        for job_id, age in ((old, 100), (recent, 1)):
+            job = await db.get(IngestionJob, job_id)
+            upload = tmp_path / f"upload-{age}.json"
+            upload.write_text("{}")
+            generated_checkpoint_path(upload).write_bytes(b"")
+            job.temp_path = str(upload)
+            job.status = "failed"
+            job.finished_at = datetime.utcnow() - timedelta(
+                hours=age * settings.ingest_failed_retention_hours / 50
+            )
+            uploads[job_id] = upload
+        await db.commit()
+
+    await IngestionWorker()._sweep_failed()
+
+    assert not uploads[old].exists()
+    assert not generated_checkpoint_path(uploads[old]).exists()
+    assert uploads[recent].exists()
+    assert (await _job(sessions, old)).status == "failed"
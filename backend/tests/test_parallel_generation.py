@@ -0,0 +1,62 @@
+"""Chapters rendered in parallel match sequential rendering."""
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services import ingestion_executor
+from app.services.boilerplate_filter import REPEATED_LINE
+from app.services.ingestion_executor import (
+    chapter_worker_count,
+    generate_chapters_from_file,
+)
+from benchmarks.synthetic import make_docling_document
+
+
+@pytest.fixture
+def docling_file(tmp_path):
+    document = make_docling_document(
+        chapters=5, sections=2, paragraphs=3, running_title="BSE Gateway Guide"
+    )
+    path = tmp_path / "document.json"
+    path.write_text(json.dumps(document))
+    return path
+
+
+def _chapters(result):
+    return [(c.chapter_number, c.title, c.markdown_content) for c in result.chapters]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_parallel_matches_sequential(docling_file, streaming):
+    sequential = generate_chapters_from_file(str(docling_file), streaming)
+    parallel = generate_chapters_from_file(
+        str(docling_file), streaming, chapter_workers=2
+    )
+
+    assert len(sequential.chapters) == 5
+    assert _chapters(parallel) == _chapters(sequential)
+
+
+def test_passed_settings_override_the_workers(docling_file, monkeypatch):
+    monkeypatch.setattr(settings, "boilerplate_repeat_fraction", 0.5)
+
+    detected = generate_chapters_from_file(str(docling_file), False)
+    disabled = generate_chapters_from_file(str(docling_file), False, repeat_fraction=0)
+
+    assert detected.boilerplate_hits.get(REPEATED_LINE)
+    assert REPEATED_LINE not in disabled.boilerplate_hits
+
+
+@pytest.mark.parametrize(
+    "configured, generation_workers, cpus, expected",
+    [(8, 2, 8, 4), (3, 2, 8, 3), (8, 0, 6, 6), (4, 4, 2, 0)],
+)
+def test_chapter_workers_capped_by_cpus(
+    monkeypatch, configured, generation_workers, cpus, expected
+):
+    monkeypatch.setattr(settings, "ingest_chapter_workers", configured)
+    monkeypatch.setattr(settings, "ingest_workers", generation_workers)
+    monkeypatch.setattr(ingestion_executor.os, "cpu_count", lambda: cpus)
+
+    assert chapter_worker_count() == expected
@@ -0,0 +1,55 @@
+"""Streaming ingest must generate the same chapters as the in-memory path."""
+import json
+
+import pytest
+
+from app.services.docling_stream import DoclingStreamError
+from app.services.ingestion_executor import generate_chapters_from_file
+from benchmarks.synthetic import make_docling_document
+
+
+@pytest.fixture
+def docling_file(tmp_path):
+    document = make_docling_document(chapters=4, sections=3, paragraphs=4)
+    path = tmp_path / "document.json"
+    path.write_text(json.dumps(document))
+    return path
+
+
+def _chapters(result):
+    return [
+        (c.chapter_number, c.title, c.markdown_content, c.page_range)
+        for c in result.chapters
+    ]
+
+
+def test_streaming_matches_in_memory(docling_file, tmp_path):
+    in_memory = generate_chapters_from_file(
+        str(docling_file), streaming=False, typed_decode=False
+    )
+    streamed = generate_chapters_from_file(
+        str(docling_file), streaming=True, spill_dir=str(tmp_path)
+    )
+
+    assert len(in_memory.chapters) == 4
+    assert _chapters(streamed) == _chapters(in_memory)
+    assert streamed.boilerplate_hits == in_memory.boilerplate_hits
+
+
+def test_streaming_leaves_no_spill_files(docling_file, tmp_path):
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+
+    generate_chapters_from_file(
+        str(docling_file), streaming=True, spill_dir=str(spill_dir)
+    )
+
+    assert list(spill_dir.iterdir()) == []
+
+
+def test_streaming_rejects_invalid_json(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('{"texts": [{"self_ref": "#/texts/0", ')
+
+    with pytest.raises(DoclingStreamError):
+        generate_chapters_from_file(str(path), streaming=True, spill_dir=str(tmp_path))
@@ -0,0 +1,69 @@
+"""Typed (msgspec) decoding renders the same chapters as the dict path."""
+import json
+
+import pytest
+
+from app.services import ingestion_executor
+from app.services.docling_structs import DoclingDecodeError, decode_docling_json
+from app.services.ingestion_executor import (
+    generate_chapters_from_file,
+    regenerate_chapters_from_cache,
+)
+from benchmarks.synthetic import make_docling_document
+
+pytest.importorskip("msgspec")
+
+
+@pytest.fixture
+def docling_file(tmp_path):
+    document = make_docling_document(
+        chapters=4, sections=2, paragraphs=5, running_title="BSE Gateway Guide"
+    )
+    path = tmp_path / "document.json"
+    path.write_text(json.dumps(document))
+    return path
+
+
+def _chapters(result):
+    return [
+        (c.chapter_number, c.title, c.markdown_content, c.page_range, c.anchor_id)
+        for c in result.chapters
+    ]
+
+
+def _generate(path, typed_decode, **kwargs):
+    return generate_chapters_from_file(
+        str(path), False, typed_decode=typed_decode, repeat_fraction=0.5, **kwargs
+    )
+
+
+def test_typed_matches_dict(docling_file):
+    typed = _generate(docling_file, True)
+    untyped = _generate(docling_file, False)
+
+    assert len(typed.chapters) == 4
+    assert _chapters(typed) == _chapters(untyped)
+    assert typed.boilerplate_hits == untyped.boilerplate_hits
+
+
+def test_typed_element_cache_matches_dict(docling_file, tmp_path):
+    typed_cache = tmp_path / "typed.msgpack"
+    dict_cache = tmp_path / "dict.msgpack"
+    _generate(docling_file, True, cache_path=str(typed_cache))
+    _generate(docling_file, False, cache_path=str(dict_cache))
+
+    assert _chapters(
+        regenerate_chapters_from_cache(str(typed_cache), repeat_fraction=0.5)
+    ) == _chapters(regenerate_chapters_from_cache(str(dict_cache), repeat_fraction=0.5))
+
+
+def test_falls_back_without_msgspec(docling_file, monkeypatch):
+    expected = _chapters(_generate(docling_file, False))
+    monkeypatch.setattr(ingestion_executor, "TYPED_DECODE_AVAILABLE", False)
+
+    assert _chapters(_generate(docling_file, True)) == expected
+
+
+def test_invalid_shape_is_rejected():
+    with pytest.raises(DoclingDecodeError, match="texts"):
+        decode_docling_json(b'{"texts": [{"self_ref": "#/texts/0", "text": 3}]}')
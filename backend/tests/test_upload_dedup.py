@@ -0,0 +1,63 @@
+"""Content-hash dedup of uploads (needs TEST_DATABASE_URL)."""
+import pytest
+
+from app.models import Document, DocumentVersion
+from app.services.document_processor_v2 import DocumentProcessor, generator_config_hash
+from app.services.file_storage import FileStorageService
+
+CONTENT_HASH = "a" * 64
+
+
+@pytest.fixture
+async def processor(db_sessionmaker, tmp_path):
+    async with db_sessionmaker() as db:
+        document = Document(slug="nse-cm", title="NSE CM", storage_path="nse-cm")
+        db.add(document)
+        await db.flush()
+        db.add(DocumentVersion(
+            document_id=document.id,
+            version="v1.0",
+            status="draft",
+            content_hash=CONTENT_HASH,
+            generator_hash=generator_config_hash("json"),
+        ))
+        await db.commit()
+        yield DocumentProcessor(db, FileStorageService(str(tmp_path))), document
+
+
+async def test_same_file_same_version_is_deduplicated(processor):
+    processor, document = processor
+
+    existing = await processor.find_existing_version(
+        document.id, "v1.0", CONTENT_HASH, "json"
+    )
+
+    assert existing is not None and existing.version == "v1.0"
+
+
+@pytest.mark.parametrize(
+    "version, content_hash, file_type",
+    [
+        ("v1.1", CONTENT_HASH, "json"),  # same file, new version label
+        ("v1.0", "b" * 64, "json"),  # changed file
+        ("v1.0", CONTENT_HASH, "pdf"),  # other generator
+    ],
+)
+async def test_other_uploads_are_processed(processor, version, content_hash, file_type):
+    processor, document = processor
+
+    assert await processor.find_existing_version(
+        document.id, version, content_hash, file_type
+    ) is None
+
+
+async def test_activate_version(processor, db_sessionmaker):
+    processor, document = processor
+
+    slug = await processor.activate_version(document.id, "v1.0")
+    await processor._db.commit()
+
+    assert slug == "nse-cm"
+
+    async with db_sessionmaker() as db:
+        assert (await db.get(Document, document.id)).active_version == "v1.0"
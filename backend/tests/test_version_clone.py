@@ -0,0 +1,66 @@
+"""Version directories are cloned copy-on-write for drafts."""
+import errno
+import os
+
+import pytest
+
+from app.services import version_clone
+from app.services.file_storage import FileStorageError, FileStorageService
+from app.services.version_clone import clone_tree
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileStorageService(str(tmp_path), chapter_split_threshold=0)
+
+
+@pytest.fixture
+def chapter(storage):
+    return storage.save_chapter("nse-cm", "v1.0", 1, "Introduction", "Original body\n")
+
+
+@pytest.fixture
+def no_reflink(monkeypatch):
+    # Most test file systems cannot reflink; make the fallback deterministic
+    monkeypatch.setattr(version_clone, "reflink", lambda source, target: False)
+
+
+@pytest.mark.parametrize("clone", [True, False])
+def test_writing_the_draft_leaves_the_source(
+    storage, chapter, tmp_path, no_reflink, clone
+):
+    storage.copy_version_directory("nse-cm", "v1.0", "draft", clone=clone)
+    draft = chapter.replace("/v1.0/", "/draft/")
+    shared = os.path.samefile(tmp_path / chapter, tmp_path / draft)
+
+    storage.update_chapter(draft, "Draft body\n")
+
+    assert shared == clone
+    assert not os.path.samefile(tmp_path / chapter, tmp_path / draft)
+    assert "Original body" in storage.read_chapter(chapter)
+    assert "Draft body" in storage.read_chapter(draft)
+
+
+def test_existing_target_is_rejected(storage, chapter):
+    storage.copy_version_directory("nse-cm", "v1.0", "draft")
+
+    with pytest.raises(FileStorageError, match="already exists"):
+        storage.copy_version_directory("nse-cm", "v1.0", "draft")
+
+
+def test_falls_back_to_copies(tmp_path, no_reflink, monkeypatch):
+    source = tmp_path / "source"
+    (source / "chapters").mkdir(parents=True)
+    (source / "chapters" / "01.md").write_text("one")
+    (source / "metadata.json").write_text("{}")
+    (source / ".metadata.json.1234.tmp").write_text("partial write")
+
+    def cross_device(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(version_clone.os, "link", cross_device)
+    counts = clone_tree(source, tmp_path / "target")
+
+    assert counts == {"reflink": 0, "hardlink": 0, "copy": 2}
+    assert (tmp_path / "target" / "chapters" / "01.md").read_text() == "one"
+    assert not (tmp_path / "target" / ".metadata.json.1234.tmp").exists()
@@ -0,0 +1,75 @@
+"""Chapters are served from the version pack while their files are unchanged."""
+import pytest
+
+from app.services.chapter_cache import ChapterCache
+from app.services.file_storage import FileStorageService
+from app.services.version_pack import get_pack, pack_path
+
+
+@pytest.fixture
+def storage(tmp_path):
+    # No chapter cache: every read goes to the pack or the loose file
+    storage = FileStorageService(
+        str(tmp_path), chapter_split_threshold=0, chapter_cache=ChapterCache(0)
+    )
+    storage.packed_reads = []
+    read_packed = storage._read_packed
+
+    def spy(path, identity):
+        data = read_packed(path, identity)
+        storage.packed_reads.append(data is not None)
+        return data
+
+    storage._read_packed = spy
+    return storage
+
+
+@pytest.fixture
+def chapters(storage):
+    return [
+        storage.save_chapter("nse-cm", "v1.0", n, f"Chapter {n}", f"Body {n}\n")
+        for n in (1, 2)
+    ]
+
+
+@pytest.fixture
+def version_path(tmp_path):
+    return tmp_path / "nse-cm" / "versions" / "v1.0"
+
+
+def test_reads_are_served_from_the_pack(storage, chapters, version_path):
+    assert storage.pack_version("nse-cm", "v1.0") == 2
+
+    assert [storage.read_chapter(path) for path in chapters] == ["Body 1\n", "Body 2\n"]
+    assert storage.packed_reads == [True, True]
+    member = chapters[0].split("v1.0/", 1)[1]
+    assert bytes(get_pack(version_path).read(member)) == (
+        version_path / member
+    ).read_bytes()
+
+
+def test_pack_is_bypassed_after_edit(storage, chapters, tmp_path):
+    storage.pack_version("nse-cm", "v1.0")
+    path = tmp_path / chapters[0]
+    path.write_text(path.read_text().replace("Body 1", "Patched after packing"))
+
+    assert "Patched after packing" in storage.read_chapter(chapters[0])
+    assert "Body 2" in storage.read_chapter(chapters[1])
+    assert storage.packed_reads == [False, True]
+
+
+def test_update_drops_the_pack(storage, chapters, version_path):
+    storage.pack_version("nse-cm", "v1.0")
+
+    storage.update_chapter(chapters[0], "Edited\n")
+
+    assert not pack_path(version_path).exists()
+    assert "Edited" in storage.read_chapter(chapters[0])
+
+
+def test_unreadable_pack_falls_back_to_files(storage, chapters, version_path):
+    storage.pack_version("nse-cm", "v1.0")
+    pack_path(version_path).write_bytes(b"not a pack")
+
+    assert get_pack(version_path) is None
+    assert storage.read_chapter(chapters[1]) == "Body 2\n"
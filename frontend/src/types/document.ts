@@ -15,7 +15,7 @@ export interface Document {
   updated_at: string;
 }
 
-export type DocumentStatus = 'processing' | 'completed' | 'failed';
+export type DocumentStatus = 'pending' | 'processing' | 'completed' | 'failed';
 
 export interface DocumentCreate {
   title: string;
@@ -59,8 +59,16 @@ export interface TableOfContents {
   entries: TOCEntry[];
 }
 
+export type IngestionStage = 'parse' | 'generate' | 'write' | 'index' | 'activate';
+
 export interface ProcessingStatus {
   document_id: string;
   status: DocumentStatus;
   progress: number | null;
+  message: string | null;
+  error_message: string | null;
+  job_id: string | null;
+  stage: IngestionStage | null;
+  queue_position: number | null;
+  stage_timings: Partial<Record<IngestionStage, number>>;
 }